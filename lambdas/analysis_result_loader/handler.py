@@ -1,12 +1,44 @@
 import os
 import json
+import hashlib
+import time
 import uuid
-import psycopg2
 from datetime import datetime
-from dotenv import load_dotenv
+from lambdas.common.log import get_logger
+from lambdas.common.metrics import Metrics
+from lambdas.common.coldstart import (
+    EAGER_INIT,
+    lazy_import,
+    load_local_env,
+    is_warmup_event,
+    warm_up,
+    warmup_response,
+)
+
+# psycopg2는 첫 사용 시 로딩 (파싱 실패/워밍업 등 DB를 쓰지 않는 경로의 콜드 스타트 단축)
+psycopg2 = lazy_import('psycopg2')
+
+logger = get_logger("analysis_result_loader")
+# 호출 단위 DB 단계별 소요 시간/처리 건수 (응답 metadata와 CloudWatch EMF로 출력)
+metrics = Metrics("analysis_result_loader")
 
 # 코드랑 같은 디렉터리에 .env
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env'))
+load_local_env(__file__)
+
+# 연결 유지/제한 시간 설정
+DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', '5'))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '10000'))
+# 마지막 사용 후 이 시간(초)이 지나면 재사용 전에 SELECT 1로 연결 상태 확인
+DB_HEALTHCHECK_INTERVAL = int(os.getenv('DB_HEALTHCHECK_INTERVAL', '30'))
+
+# SQS 배치 기록 방식: single_transaction(배치당 트랜잭션, 집합 기반 문장으로 배치당 고정 횟수 왕복)
+# 또는 per_record(메시지별 트랜잭션, 메시지마다 여러 번 왕복)
+LOADER_BATCH_MODE = os.getenv('LOADER_BATCH_MODE', 'single_transaction')
+
+# warm 컨테이너에서 재사용하는 모듈 레벨 연결
+_connection = None
+_connection_last_used = 0.0
+
 
 def get_db_connection():
     """PostgreSQL 데이터베이스 연결을 반환합니다."""
@@ -16,13 +48,84 @@ def get_db_connection():
             port=os.getenv('DB_PORT'),
             database=os.getenv('DB_NAME'),
             user=os.getenv('DB_USERNAME'),
-            password=os.getenv('DB_PASSWORD')
+            password=os.getenv('DB_PASSWORD'),
+            connect_timeout=DB_CONNECT_TIMEOUT,
+            # 유휴 연결이 NAT/프록시에서 끊기지 않도록 TCP keepalive 사용
+            keepalives=1,
+            keepalives_idle=30,
+            keepalives_interval=10,
+            keepalives_count=3,
+            options=f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}',
         )
         return connection
     except Exception as e:
-        print(f"Database connection error: {str(e)}")
+        logger.error(f"Database connection error: {str(e)}")
         raise e
 
+
+def _is_connection_healthy(connection):
+    """연결이 살아 있는지 확인합니다. 최근에 사용한 연결은 확인 쿼리를 생략합니다."""
+    if connection.closed:
+        return False
+    if time.monotonic() - _connection_last_used < DB_HEALTHCHECK_INTERVAL:
+        return True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        connection.rollback()
+        return True
+    except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+        logger.warning(f"Stale database connection detected: {str(e)}")
+        return False
+
+
+def get_connection():
+    """warm 컨테이너에서 재사용하는 연결을 반환하고, 끊어진 연결은 다시 맺습니다."""
+    global _connection
+
+    if _connection is not None:
+        # 이전 호출에서 남은 트랜잭션 정리
+        if (
+            not _connection.closed
+            and _connection.status != psycopg2.extensions.STATUS_READY
+        ):
+            try:
+                _connection.rollback()
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                pass
+        if _is_connection_healthy(_connection):
+            return _connection
+        discard_connection()
+
+    _connection = get_db_connection()
+    logger.info("Opened new database connection")
+    return _connection
+
+
+def execute_values(cursor, sql, argslist, **kwargs):
+    """psycopg2.extras.execute_values를 첫 사용 시 import하여 호출합니다."""
+    from psycopg2.extras import execute_values as _execute_values
+
+    return _execute_values(cursor, sql, argslist, **kwargs)
+
+
+def mark_connection_used():
+    """연결 사용 시각을 기록합니다 (다음 상태 확인 생략 여부 판단용)."""
+    global _connection_last_used
+    _connection_last_used = time.monotonic()
+
+
+def discard_connection():
+    """끊어졌거나 상태가 불확실한 연결을 닫고 다음 호출에서 다시 맺도록 합니다."""
+    global _connection
+    if _connection is not None:
+        try:
+            _connection.close()
+        except Exception:
+            pass
+    _connection = None
+
+
 def update_contract_analysis(connection, analysis_data, contract_id, analysis_id):
     """contract_analyses 테이블의 분석 결과를 업데이트합니다."""
     cursor = connection.cursor()
@@ -68,14 +171,14 @@ def update_contract_analysis(connection, analysis_data, contract_id, analysis_id
         
         # 업데이트된 행이 있는지 확인
         if cursor.rowcount == 0:
-            print(f"Warning: No rows updated for analysis_id: {analysis_id}")
+            logger.warning(f"No rows updated for analysis_id: {analysis_id}")
         else:
-            print(f"Updated contract analysis with ID: {analysis_id}")
+            logger.info(f"Updated contract analysis with ID: {analysis_id}")
         
         return analysis_id
         
     except Exception as e:
-        print(f"Error updating contract analysis: {str(e)}")
+        logger.error(f"Error updating contract analysis: {str(e)}")
         raise e
     finally:
         cursor.close()
@@ -99,61 +202,329 @@ def update_contract_title(connection, contract_id, title):
         
         # 업데이트된 행이 있는지 확인
         if cursor.rowcount == 0:
-            print(f"Warning: No rows updated for contract_id: {contract_id}")
+            logger.warning(f"No rows updated for contract_id: {contract_id}")
         else:
-            print(f"Updated contract title with ID: {contract_id}, title: {title}")
+            logger.info(
+                f"Updated contract title with ID: {contract_id}, "
+                f"title: {title}"
+            )
         
         return contract_id
         
     except Exception as e:
-        print(f"Error updating contract title: {str(e)}")
+        logger.error(f"Error updating contract title: {str(e)}")
         raise e
     finally:
         cursor.close()
 
-def insert_toxic_clauses(connection, analysis_id, toxic_clauses):
-    """toxic_clauses 테이블에 독소조항들을 삽입합니다."""
+
+def analysis_update_values(analysis_data, analysis_id, current_time):
+    """contract_analyses UPDATE에 사용할 값 튜플을 만듭니다."""
+    # data 구조에서 필요한 정보 추출
+    data = analysis_data.get('data', {})
+    ddobak_commentary = data.get('ddobakCommentary', {})
+
+    # 처리 상태 결정 - Spring Boot enum 값에 맞게 대문자 사용
+    if analysis_data.get('success', False):
+        process_status, status = 'COMPLETED', 'success'
+    else:
+        process_status, status = 'FAILED', 'error'
+
+    return (
+        analysis_id,
+        data.get('summary', ''),
+        status,
+        ddobak_commentary.get('overallComment', ''),
+        ddobak_commentary.get('warningComment', ''),
+        ddobak_commentary.get('advice', ''),
+        process_status,
+        current_time,
+    )
+
+
+def bulk_update_contract_titles(connection, titles_by_contract):
+    """contracts.title을 UPDATE ... FROM (VALUES ...) 한 번으로 갱신합니다."""
+    if not titles_by_contract:
+        return
+
+    current_time = datetime.utcnow()
+    cursor = connection.cursor()
+
+    try:
+        # VALUES 리터럴은 text로 해석되므로 uuid 컬럼과 비교할 id는 템플릿에서 명시적으로 캐스팅
+        update_query = """
+            UPDATE contracts AS c
+            SET title = v.title,
+                updated_at = v.updated_at
+            FROM (VALUES %s) AS v(id, title, updated_at)
+            WHERE c.id = v.id
+        """
+        rows = [
+            (contract_id, title, current_time)
+            for contract_id, title in titles_by_contract.items()
+        ]
+        execute_values(
+            cursor,
+            update_query,
+            rows,
+            template='(%s::uuid, %s, %s::timestamp)',
+            page_size=len(rows),
+        )
+        logger.info(
+            f"Updated {cursor.rowcount} of {len(rows)} contract titles"
+        )
+    finally:
+        cursor.close()
+
+
+def bulk_update_contract_analyses(connection, analyses_by_id):
+    """contract_analyses를 UPDATE ... FROM (VALUES ...) 한 번으로 갱신합니다."""
+    if not analyses_by_id:
+        return
+
+    current_time = datetime.utcnow()
+    cursor = connection.cursor()
+
+    try:
+        # VALUES 리터럴은 text로 해석되므로 uuid 컬럼과 비교할 id는 템플릿에서 명시적으로 캐스팅
+        update_query = """
+            UPDATE contract_analyses AS a
+            SET summary = v.summary,
+                status = v.status,
+                ddobak_overall_comment = v.ddobak_overall_comment,
+                ddobak_warning_comment = v.ddobak_warning_comment,
+                ddobak_advice = v.ddobak_advice,
+                process_status = v.process_status,
+                updated_at = v.updated_at
+            FROM (VALUES %s) AS v(id, summary, status,
+                                  ddobak_overall_comment,
+                                  ddobak_warning_comment, ddobak_advice,
+                                  process_status, updated_at)
+            WHERE a.id = v.id
+        """
+        rows = [
+            analysis_update_values(analysis_data, analysis_id, current_time)
+            for analysis_id, analysis_data in analyses_by_id.items()
+        ]
+        execute_values(
+            cursor,
+            update_query,
+            rows,
+            template='(%s::uuid, %s, %s, %s, %s, %s, %s, %s::timestamp)',
+            page_size=len(rows),
+        )
+        logger.info(
+            f"Updated {cursor.rowcount} of {len(rows)} contract analyses"
+        )
+    finally:
+        cursor.close()
+
+
+# 재전송된 메시지에서도 같은 ID가 나오도록 analysis_id + 조항 순번으로 만드는 UUIDv5 네임스페이스
+TOXIC_CLAUSE_NAMESPACE = uuid.UUID('5b0c8f3e-6d2a-4f1e-9c47-2a7d1e0b9f63')
+
+
+def toxic_clause_id(analysis_id, idx):
+    """분석 ID와 조항 순번으로 결정적인 독소조항 ID를 만듭니다."""
+    return str(uuid.uuid5(TOXIC_CLAUSE_NAMESPACE, f"{analysis_id}:{idx}"))
+
+
+def build_toxic_clause_rows(analysis_id, toxic_clauses):
+    """독소조항 목록을 toxic_clauses INSERT용 튜플 목록으로 변환합니다.
+
+    sourceContractTagIdx는 페이지별 Upstage 요소 id이므로 sourcePageIdx와 함께 저장합니다
+    (페이지 정보가 없는 결과는 source_page_idx NULL, 요소 id가 없으면 0).
+    """
+    rows = []
+    for idx, toxic in enumerate(toxic_clauses):
+        tag_idx = toxic.get('sourceContractTagIdx')
+        rows.append(
+            (
+                toxic_clause_id(analysis_id, idx),
+                analysis_id,
+                toxic.get('title', ''),
+                toxic.get('clause', ''),
+                toxic.get('reason', ''),
+                toxic.get('reasonReference', ''),
+                tag_idx if tag_idx is not None else 0,
+                toxic.get('sourcePageIdx'),
+                toxic.get('warnLevel', 1),
+            )
+        )
+    return rows
+
+
+def analysis_fingerprint(analysis_values, clause_rows):
+    """분석 필드와 독소조항 행으로 내용 해시를 만듭니다 (updated_at 등 시각 값 제외)."""
+    payload = {
+        'analysis': [
+            str(value) if value is not None else ''
+            for value in analysis_values
+        ],
+        'clauses': sorted(
+            [str(value) if value is not None else '' for value in row]
+            for row in clause_rows
+        ),
+    }
+    return hashlib.sha256(
+        json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    ).hexdigest()
+
+
+def message_fingerprint(analysis_result, analysis_id):
+    """SQS 메시지의 분석 결과로 저장될 내용의 해시를 계산합니다."""
+    # (id, summary, status, 코멘트 3종, process_status, updated_at) 중 내용 필드만 사용
+    analysis_values = analysis_update_values(
+        analysis_result, analysis_id, None
+    )[1:7]
+    toxic_clauses = analysis_result.get('data', {}).get('toxics', []) or []
+    clause_rows = [
+        (row[0],) + row[2:]
+        for row in build_toxic_clause_rows(analysis_id, toxic_clauses)
+    ]
+    return analysis_fingerprint(analysis_values, clause_rows)
+
+
+def fetch_stored_fingerprints(connection, analysis_ids):
+    """저장된 분석/독소조항을 한 번의 조회로 읽어 analysis_id별 내용 해시를 반환합니다."""
+    if not analysis_ids:
+        return {}
+
+    cursor = connection.cursor()
+
+    try:
+        select_query = """
+            SELECT a.id, a.summary, a.status, a.ddobak_overall_comment,
+                   a.ddobak_warning_comment, a.ddobak_advice,
+                   a.process_status,
+                   t.id, t.title, t.clause, t.reason, t.reason_reference,
+                   t.source_contract_tag_idx, t.source_page_idx,
+                   t.warn_level
+            FROM contract_analyses a
+            LEFT JOIN toxic_clauses t ON t.analysis_id = a.id
+            WHERE a.id IN %s
+        """
+        cursor.execute(select_query, (tuple(analysis_ids),))
+
+        stored = {}
+        for row in cursor.fetchall():
+            entry = stored.setdefault(
+                str(row[0]), {'analysis': row[1:7], 'clauses': []}
+            )
+            if row[7] is not None:
+                entry['clauses'].append((str(row[7]),) + tuple(row[8:]))
+
+        return {
+            analysis_id: analysis_fingerprint(
+                entry['analysis'], entry['clauses']
+            )
+            for analysis_id, entry in stored.items()
+        }
+    finally:
+        cursor.close()
+
+
+def filter_unchanged_analyses(connection, messages):
+    """이미 같은 내용으로 저장된 분석(중복 전달된 메시지)을 걸러냅니다.
+
+    messages: [(analysis_result, analysis_id), ...] - 변경이 필요한 항목의 인덱스 집합을 반환
+    """
+    stored = fetch_stored_fingerprints(
+        connection, {analysis_id for _, analysis_id in messages}
+    )
+    changed = set()
+    for idx, (analysis_result, analysis_id) in enumerate(messages):
+        if stored.get(str(analysis_id)) == message_fingerprint(
+            analysis_result, analysis_id
+        ):
+            logger.info(
+                "Skipping unchanged analysis (duplicate delivery): "
+                f"{analysis_id}"
+            )
+        else:
+            changed.add(idx)
+    return changed
+
+
+def replace_toxic_clauses(connection, clauses_by_analysis):
+    """여러 분석의 독소조항을 결정적 ID 기준으로 upsert하고, 더 이상 없는 조항만 삭제합니다.
+
+    DELETE 1회 + 다중 행 INSERT ... ON CONFLICT 1회로 처리하며,
+    내용이 같은 행은 갱신하지 않아 재전송 시 쓰기/인덱스 변경을 줄입니다.
+    clauses_by_analysis: {analysis_id: [toxic, ...]}
+    """
+    if not clauses_by_analysis:
+        return 0
+
     cursor = connection.cursor()
     
     try:
-        # 먼저 기존 독소조항들을 삭제
-        delete_query = "DELETE FROM toxic_clauses WHERE analysis_id = %s"
-        cursor.execute(delete_query, (analysis_id,))
+        rows = []
+        for analysis_id, toxic_clauses in clauses_by_analysis.items():
+            rows.extend(build_toxic_clause_rows(analysis_id, toxic_clauses))
         
-        if not toxic_clauses:
-            print("No toxic clauses to insert")
-            return
+        # 새 결과에 없는 기존 독소조항만 삭제 (조항 수가 줄어든 경우 등)
+        analysis_ids = tuple(clauses_by_analysis.keys())
+        if rows:
+            delete_query = (
+                "DELETE FROM toxic_clauses "
+                "WHERE analysis_id IN %s AND id NOT IN %s"
+            )
+            cursor.execute(
+                delete_query, (analysis_ids, tuple(row[0] for row in rows))
+            )
+        else:
+            delete_query = "DELETE FROM toxic_clauses WHERE analysis_id IN %s"
+            cursor.execute(delete_query, (analysis_ids,))
+
+        if not rows:
+            logger.info("No toxic clauses to insert")
+            return 0
         
-        # 새로운 독소조항들을 삽입
-        insert_query = """
+        # 다중 행 VALUES로 한 번에 upsert (내용이 바뀐 행만 UPDATE)
+        upsert_query = """
             INSERT INTO toxic_clauses 
             (id, analysis_id, title, clause, reason, reason_reference, 
-             source_contract_tag_idx, warn_level)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+             source_contract_tag_idx, source_page_idx, warn_level)
+            VALUES %s
+            ON CONFLICT (id) DO UPDATE
+            SET title = EXCLUDED.title,
+                clause = EXCLUDED.clause,
+                reason = EXCLUDED.reason,
+                reason_reference = EXCLUDED.reason_reference,
+                source_contract_tag_idx = EXCLUDED.source_contract_tag_idx,
+                source_page_idx = EXCLUDED.source_page_idx,
+                warn_level = EXCLUDED.warn_level
+            WHERE (toxic_clauses.title, toxic_clauses.clause,
+                   toxic_clauses.reason, toxic_clauses.reason_reference,
+                   toxic_clauses.source_contract_tag_idx,
+                   toxic_clauses.source_page_idx,
+                   toxic_clauses.warn_level)
+                IS DISTINCT FROM
+                  (EXCLUDED.title, EXCLUDED.clause, EXCLUDED.reason,
+                   EXCLUDED.reason_reference, EXCLUDED.source_contract_tag_idx,
+                   EXCLUDED.source_page_idx, EXCLUDED.warn_level)
         """
+        execute_values(cursor, upsert_query, rows, page_size=len(rows))
         
-        for toxic in toxic_clauses:
-            toxic_id = str(uuid.uuid4())
-            title = toxic.get('title', '')
-            clause = toxic.get('clause', '')
-            reason = toxic.get('reason', '')
-            reason_reference = toxic.get('reasonReference', '')
-            source_idx = toxic.get('sourceContractTagIdx', 0)
-            warn_level = toxic.get('warnLevel', 1)
-            
-            cursor.execute(insert_query, (
-                toxic_id, analysis_id, title, clause, reason, reason_reference,
-                source_idx, warn_level
-            ))
-            
-            print(f"Inserted toxic clause with ID: {toxic_id}")
+        logger.info(
+            f"Upserted {len(rows)} toxic clauses for "
+            f"{len(clauses_by_analysis)} analyses"
+        )
+        return len(rows)
         
     except Exception as e:
-        print(f"Error inserting toxic clauses: {str(e)}")
+        logger.error(f"Error inserting toxic clauses: {str(e)}")
         raise e
     finally:
         cursor.close()
 
+
+def insert_toxic_clauses(connection, analysis_id, toxic_clauses):
+    """toxic_clauses 테이블에 독소조항들을 삽입합니다."""
+    replace_toxic_clauses(connection, {analysis_id: toxic_clauses or []})
+
+
 def process_sqs_message(message_body):
     """SQS 메시지를 처리함 (Lambda Destinations 형식만 지원).
 
@@ -205,26 +576,196 @@ def process_sqs_message(message_body):
         return analysis_result, contract_id, analysis_id
 
     except Exception as e:
-        print(f"Error processing SQS message: {str(e)}")
+        logger.error(f"Error processing SQS message: {str(e)}")
         raise e
 
+
+def write_analysis_record(
+    connection, analysis_result, contract_id, analysis_id
+):
+    """메시지 하나의 분석 결과를 contracts/contract_analyses/toxic_clauses에 기록합니다.
+
+    이미 같은 내용이 저장되어 있으면(중복 전달) 조회 한 번만 하고 기록하지 않습니다.
+    """
+    if not filter_unchanged_analyses(
+        connection, [(analysis_result, analysis_id)]
+    ):
+        return False
+
+    # contracts 테이블의 title 업데이트
+    title = analysis_result.get('data', {}).get('title', '계약서')
+    update_contract_title(connection, contract_id, title)
+
+    # contract_analyses 테이블 업데이트
+    analysis_id = update_contract_analysis(
+        connection, analysis_result, contract_id, analysis_id
+    )
+
+    # toxic_clauses 테이블에 삽입
+    toxic_clauses = analysis_result.get('data', {}).get('toxics', [])
+    insert_toxic_clauses(connection, analysis_id, toxic_clauses)
+    return True
+
+
+def process_batch_single_transaction(connection, records):
+    """SQS 배치 전체를 하나의 트랜잭션으로 기록합니다.
+
+    먼저 집합 기반 UPDATE/INSERT로 배치 전체를 기록하고, 실패하면 같은 트랜잭션 안에서
+    레코드별 SAVEPOINT로 다시 기록하여 문제가 있는 메시지만 제외합니다.
+    커밋은 배치당 한 번입니다. (처리 성공 수, 실패한 messageId 목록)을 반환합니다.
+    """
+    failed_ids = []
+    parsed = []
+    for record in records:
+        try:
+            parsed.append((record, *process_sqs_message(record['body'])))
+        except Exception as e:
+            failed_ids.append(record.get('messageId'))
+            logger.error(f"Failed to parse message: {str(e)}")
+
+    if not parsed:
+        return 0, failed_ids
+
+    connection.autocommit = False
+    cursor = connection.cursor()
+
+    try:
+        # 이미 같은 내용으로 저장된 분석(중복 전달)은 조회 한 번으로 걸러냄
+        # 조회 실패(잘못된 ID 형식 등)가 배치 전체를 막지 않도록 SAVEPOINT 안에서 수행
+        cursor.execute("SAVEPOINT fingerprint_read")
+        try:
+            with metrics.timer("db_fingerprint_read"):
+                changed = filter_unchanged_analyses(
+                    connection,
+                    [
+                        (analysis_result, analysis_id)
+                        for _, analysis_result, _, analysis_id in parsed
+                    ],
+                )
+            cursor.execute("RELEASE SAVEPOINT fingerprint_read")
+        except Exception as e:
+            logger.warning(
+                "Failed to read stored analyses, writing all messages: "
+                f"{str(e)}"
+            )
+            cursor.execute("ROLLBACK TO SAVEPOINT fingerprint_read")
+            changed = set(range(len(parsed)))
+        pending = [item for idx, item in enumerate(parsed) if idx in changed]
+
+        # 같은 계약/분석에 대한 메시지가 여러 개면 마지막 메시지 기준
+        titles_by_contract = {}
+        analyses_by_id = {}
+        clauses_by_analysis = {}
+        for _, analysis_result, contract_id, analysis_id in pending:
+            titles_by_contract[contract_id] = analysis_result.get(
+                'data', {}
+            ).get('title', '계약서')
+            analyses_by_id[analysis_id] = analysis_result
+            clauses_by_analysis[analysis_id] = (
+                analysis_result.get('data', {}).get('toxics', []) or []
+            )
+
+        cursor.execute("SAVEPOINT batch_write")
+        try:
+            if not pending:
+                logger.info(
+                    "All messages in batch are duplicate deliveries, "
+                    "nothing to write"
+                )
+            with metrics.timer("db_batch_write"):
+                bulk_update_contract_titles(connection, titles_by_contract)
+                bulk_update_contract_analyses(connection, analyses_by_id)
+                replace_toxic_clauses(connection, clauses_by_analysis)
+            cursor.execute("RELEASE SAVEPOINT batch_write")
+            processed = len(parsed)
+        except Exception as e:
+            # 집합 기반 기록이 실패하면 배치 전체가 느린 레코드별 기록으로 떨어지므로 오류로 기록
+            logger.error(
+                f"Set-based batch write failed, retrying per record: {str(e)}"
+            )
+            metrics.incr("batch_write_fallbacks")
+            cursor.execute("ROLLBACK TO SAVEPOINT batch_write")
+            processed = len(parsed) - len(pending)
+            for record, analysis_result, contract_id, analysis_id in pending:
+                cursor.execute("SAVEPOINT record_write")
+                try:
+                    with metrics.timer("db_write"):
+                        write_analysis_record(
+                            connection,
+                            analysis_result,
+                            contract_id,
+                            analysis_id,
+                        )
+                    cursor.execute("RELEASE SAVEPOINT record_write")
+                    processed += 1
+                except Exception as record_error:
+                    cursor.execute("ROLLBACK TO SAVEPOINT record_write")
+                    failed_ids.append(record.get('messageId'))
+                    logger.error(
+                        f"Failed to process message: {str(record_error)}"
+                    )
+
+        with metrics.timer("db_commit"):
+            connection.commit()
+        logger.info(
+            f"Committed batch in single transaction: {processed} records"
+        )
+        return processed, failed_ids
+
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+# 워밍업 이벤트({"warmup": true}) 또는 LAMBDA_EAGER_INIT 시 DB 연결을 미리 맺음
+WARMUP_STEPS = [
+    ('db_connection', lambda: (get_connection(), mark_connection_used())),
+]
+
+
 def lambda_handler(event, context):
     """SQS 트리거로 실행되는 메인 핸들러"""
-    print(f"Received event: {json.dumps(event, ensure_ascii=False, indent=2)}")
+    if is_warmup_event(event):
+        return warmup_response(WARMUP_STEPS)
+
+    logger.payload(
+        "Received event", event, records=len(event.get('Records', []))
+    )
+    metrics.reset()
     
     connection = None
     processed_messages = 0
     failed_messages = 0
+    # ReportBatchItemFailures: 실패한 메시지만 재전송되도록 messageId를 모음
+    batch_item_failures = []
     
     try:
-        # PostgreSQL 연결
-        connection = get_db_connection()
+        # PostgreSQL 연결 (warm 컨테이너에서는 기존 연결 재사용)
+        with metrics.timer("db_connect"):
+            connection = get_connection()
         
+        records = event.get('Records', [])
+
+        # 배치 전체를 한 트랜잭션으로 기록하는 모드
+        if LOADER_BATCH_MODE == 'single_transaction':
+            processed_messages, failed_ids = process_batch_single_transaction(
+                connection, records
+            )
+            failed_messages = len(failed_ids)
+            batch_item_failures = [
+                {'itemIdentifier': message_id} for message_id in failed_ids
+            ]
+            records = []
+
         # SQS 레코드들 처리
-        for record in event.get('Records', []):
+        for record in records:
             try:
                 message_body = record['body']
-                print(f"Processing message: {message_body}")
+                logger.payload(
+                    "Processing message", message_body, level="DEBUG"
+                )
                 
                 # SQS 메시지에서 분석 결과 추출
                 analysis_result, contract_id, analysis_id = process_sqs_message(message_body)
@@ -232,51 +773,84 @@ def lambda_handler(event, context):
                 # 트랜잭션 시작
                 connection.autocommit = False
                 
-                # contracts 테이블의 title 업데이트
-                title = analysis_result.get('data', {}).get('title', '계약서')
-                update_contract_title(connection, contract_id, title)
-                
-                # contract_analyses 테이블 업데이트
-                analysis_id = update_contract_analysis(connection, analysis_result, contract_id, analysis_id)
-                
-                # toxic_clauses 테이블에 삽입
-                toxic_clauses = analysis_result.get('data', {}).get('toxics', [])
-                insert_toxic_clauses(connection, analysis_id, toxic_clauses)
+                with metrics.timer("db_write"):
+                    write_analysis_record(
+                        connection, analysis_result, contract_id, analysis_id
+                    )
                 
                 # 트랜잭션 커밋
-                connection.commit()
+                with metrics.timer("db_commit"):
+                    connection.commit()
                 processed_messages += 1
                 
-                print(f"Successfully processed message for contract_id: {contract_id}")
+                logger.info(
+                    "Successfully processed message for contract_id: "
+                    f"{contract_id}"
+                )
                 
             except Exception as e:
                 # 트랜잭션 롤백
-                if connection:
+                if (
+                    isinstance(
+                        e, (psycopg2.OperationalError, psycopg2.InterfaceError)
+                    )
+                    and connection.closed
+                ):
+                    # 연결이 끊어진 경우 이후 레코드를 위해 다시 연결
+                    discard_connection()
+                    connection = get_connection()
+                elif connection:
                     connection.rollback()
                 failed_messages += 1
-                print(f"Failed to process message: {str(e)}")
+                batch_item_failures.append(
+                    {'itemIdentifier': record.get('messageId')}
+                )
+                logger.error(f"Failed to process message: {str(e)}")
                 # 개별 메시지 실패는 전체 처리를 중단하지 않음
                 continue
         
+        metrics.incr('processed', processed_messages)
+        metrics.incr('failed', failed_messages)
         return {
             'statusCode': 200,
             'body': json.dumps({
                 'message': f'Processing completed. Success: {processed_messages}, Failed: {failed_messages}',
                 'processed': processed_messages,
                 'failed': failed_messages
-            })
+            }),
+            'batchItemFailures': batch_item_failures,
+            'metadata': {'metrics': metrics.summary()},
         }
         
     except Exception as e:
-        print(f"Lambda handler error: {str(e)}")
+        logger.error(f"Lambda handler error: {str(e)}")
+        # DB 연결 실패 등으로 배치 전체를 처리하지 못한 경우, 아직 성공하지 않은 메시지를 모두 재전송
+        failed_ids = {
+            failure['itemIdentifier'] for failure in batch_item_failures
+        }
+        records = event.get('Records', [])
+        for record in records[processed_messages + failed_messages:]:
+            if record.get('messageId') not in failed_ids:
+                batch_item_failures.append(
+                    {'itemIdentifier': record.get('messageId')}
+                )
+        metrics.incr('processed', processed_messages)
+        metrics.incr('failed', len(batch_item_failures))
         return {
             'statusCode': 500,
             'body': json.dumps({
                 'error': str(e),
                 'message': 'Failed to process SQS messages'
-            })
+            }),
+            'batchItemFailures': batch_item_failures,
+            'metadata': {'metrics': metrics.summary()},
         }
         
     finally:
-        if connection:
-            connection.close()
+        if connection and not connection.closed:
+            mark_connection_used()
+        metrics.emit()
+
+
+if EAGER_INIT:
+    logger.info("Eager init", warmup=warm_up(WARMUP_STEPS))
@@ -0,0 +1,24 @@
+import re
+import hashlib
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def make_analysis_cache_key(
+    contract_text, model_id, prompt_version, knowledge_base_id=None
+):
+    """정규화된 계약서 텍스트, 모델 ID, 프롬프트 버전으로 분석 결과 캐시 키를 만듭니다.
+
+    프롬프트나 모델이 바뀌면 키도 바뀌므로 이전 버전의 분석 결과는 자연히 무효화됩니다.
+    """
+    normalized_text = WHITESPACE_PATTERN.sub(" ", contract_text).strip()
+    digest = hashlib.sha256()
+    for part in (
+        model_id,
+        prompt_version,
+        knowledge_base_id or "",
+        normalized_text,
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
@@ -1,118 +1,386 @@
 import json
-import boto3
+import time
 import os
-from json_repair import repair_json
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from .prompts import get_prompt_template
+from .stream_parser import ToxicsStreamParser
+from .retrieval import (
+    build_retrieval_queries,
+    merge_retrieval_results,
+    build_knowledge_context,
+)
+from .retrieval_cache import make_retrieval_cache_key
+from .analysis_cache import make_analysis_cache_key
+from .normalize import normalize_contract_pages
+from .output import compute_max_tokens, finalize_toxic, finalize_toxics
+from .map_reduce import (
+    split_into_chunks,
+    merge_toxics,
+    build_reduce_prompt,
+    format_page,
+)
+from .screening import (
+    build_screen_prompt,
+    parse_suspicious,
+    expand_selection,
+    select_pages,
+)
+from .rate_limit import RateLimiter, ThrottledError
+from lambdas.common.log import get_logger
+from lambdas.common.cache import S3JsonStore, TTLCache
+from lambdas.common.metrics import Metrics
+from lambdas.common.coldstart import (
+    EAGER_INIT,
+    lazy_client,
+    load_local_env,
+    is_warmup_event,
+    warm_up,
+    warmup_response,
+)
+
+logger = get_logger("bedrock_lambda")
+# 호출 단위 단계별 소요 시간/토큰 사용량 (응답 metadata와 CloudWatch EMF로 출력)
+metrics = Metrics("bedrock_lambda")
+# 모델 ID/지식 기반별 동시 호출 제한과 스로틀링 백오프 재시도 (Lambda 남은 실행 시간 안에서만 재시도)
+rate_limiter = RateLimiter(metrics)
 
 # 지식 기반 ID 환경 변수 설정
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env'))
+load_local_env(__file__)
 KNOWLEDGE_BASE_ID = os.getenv("KNOWLEDGE_BASE_ID")
 
+# 분석 모델 ID (프롬프트 버전과 함께 응답 metadata로 노출)
+MODEL_ID = os.getenv(
+    "BEDROCK_MODEL_ID", "anthropic.claude-3-5-sonnet-20240620-v1:0"
+)
+
 # bedrock-runtime 클라이언트 초기화
-bedrock_runtime = boto3.client(service_name="bedrock-runtime", region_name="ap-northeast-2")
+# (클라이언트는 첫 사용 시 생성하여 콜드 스타트 시간을 줄임)
+# 스로틀링/일시적 오류 재시도는 rate_limiter가 맡으므로 botocore 재시도는 끔
+# (max_attempts=1, rate_limit.is_throttling_error/is_transient_error 참고)
+bedrock_runtime = lazy_client(
+    "bedrock-runtime", region_name="ap-northeast-2", max_attempts=1
+)
 # bedrock-agent-runtime 클라이언트 초기화 (Knowledge Base용)
-bedrock_agent_runtime = boto3.client(service_name="bedrock-agent-runtime", region_name="ap-northeast-2")
+bedrock_agent_runtime = lazy_client(
+    "bedrock-agent-runtime", region_name="ap-northeast-2", max_attempts=1
+)
+
+# 응답 스트리밍 모드 기본값 (이벤트의 "stream" 값으로 요청별 지정 가능)
+BEDROCK_STREAMING = os.getenv("BEDROCK_STREAMING", "false").lower() == "true"
+# 스트리밍 중 완성된 독소조항을 전송할 부분 결과 큐 (미설정 시 전송하지 않음)
+PARTIAL_RESULTS_QUEUE_URL = os.getenv("PARTIAL_RESULTS_QUEUE_URL")
+sqs = lazy_client("sqs", region_name="ap-northeast-2")
+
+# map-reduce 분석 설정: 임계 길이를 넘는 계약서는 청크로 나누어 동시에 분석
+MAP_REDUCE_THRESHOLD_CHARS = int(
+    os.getenv("MAP_REDUCE_THRESHOLD_CHARS", "40000")
+)
+MAP_REDUCE_CHUNK_CHARS = int(os.getenv("MAP_REDUCE_CHUNK_CHARS", "15000"))
+MAP_REDUCE_MAX_WORKERS = int(os.getenv("MAP_REDUCE_MAX_WORKERS", "4"))
+
+# OCR HTML 입력을 압축 텍스트로 정규화할지 여부 (이벤트의 "normalizeInput"으로 요청별 지정 가능)
+NORMALIZE_CONTRACT_TEXT = (
+    os.getenv("NORMALIZE_CONTRACT_TEXT", "true").lower() == "true"
+)
+
+# compact 출력 모드: 모델은 조항 원문 대신 요소 번호로 응답하고 원문은 정규화 결과에서 복원
+# (정규화 입력에서만 사용 가능, 이벤트의 "compactOutput"으로 요청별 지정 가능)
+COMPACT_OUTPUT = os.getenv("COMPACT_OUTPUT", "false").lower() == "true"
+# 프롬프트 캐시: 요청마다 동일한 고정 지시문 뒤에 캐시 체크포인트를 두어 입력 처리 시간/비용 절감
+# (Bedrock에서 프롬프트 캐시를 지원하는 모델 ID에만 적용, 모델 ID의 일부로 비교)
+# 모델별 opt-in: 기본 분석 모델(Claude 3.5 Sonnet v1)은 Bedrock 프롬프트 캐시를 지원하지 않아
+# 목록에 없으며, 기본 설정에서는 캐시가 적용되지 않음 (metadata의 prompt_cache.enabled로 확인).
+# 캐시를 쓰려면 BEDROCK_MODEL_ID를 목록의 모델로 바꾸거나, 새로 지원되는 모델을
+# PROMPT_CACHE_MODELS에 추가
+PROMPT_CACHE = os.getenv("PROMPT_CACHE", "true").lower() == "true"
+PROMPT_CACHE_MODELS = [
+    name.strip()
+    for name in os.getenv(
+        "PROMPT_CACHE_MODELS",
+        "claude-3-5-haiku,claude-3-7-sonnet,claude-sonnet-4,claude-opus-4",
+    ).split(",")
+    if name.strip()
+]
+
+# map-reduce 최종 해설(제목/요약/해설만 생성) 응답의 max_tokens
+REDUCE_MAX_TOKENS = int(os.getenv("REDUCE_MAX_TOKENS", "1500"))
+
+# 단계별 모델 라우팅: 저비용 모델이 먼저 요소를 선별하고 의심 요소만 분석 모델로 정밀 분석
+# (정규화 입력에서만 사용 가능, 이벤트의 "modelRouting"으로 요청별 지정 가능)
+MODEL_ROUTING = os.getenv("MODEL_ROUTING", "false").lower() == "true"
+SCREEN_MODEL_ID = os.getenv(
+    "SCREEN_MODEL_ID", "anthropic.claude-3-haiku-20240307-v1:0"
+)
+SCREEN_MAX_TOKENS = int(os.getenv("SCREEN_MAX_TOKENS", "1000"))
+SCREEN_CHUNK_CHARS = int(os.getenv("SCREEN_CHUNK_CHARS", "30000"))
+# 이보다 짧은 계약서는 선별 없이 바로 정밀 분석
+ROUTING_MIN_CHARS = int(os.getenv("ROUTING_MIN_CHARS", "8000"))
+# 선별된 요소 앞뒤로 함께 보낼 요소 수, 항상 포함할 문서 앞부분 요소 수
+SCREEN_CONTEXT_RADIUS = int(os.getenv("SCREEN_CONTEXT_RADIUS", "1"))
+ROUTING_HEADER_ELEMENTS = int(os.getenv("ROUTING_HEADER_ELEMENTS", "3"))
+# 선별 결과가 전체 텍스트의 이 비율을 넘으면 전체를 정밀 분석 (라우팅 이득이 없음)
+ROUTING_MAX_SELECTED_RATIO = float(
+    os.getenv("ROUTING_MAX_SELECTED_RATIO", "0.7")
+)
+
+# 지식 기반 검색 설정: 조항 단위 쿼리 수/길이, 병렬 검색 수, 컨텍스트 토큰 예산
+RETRIEVAL_MAX_QUERIES = int(os.getenv("RETRIEVAL_MAX_QUERIES", "8"))
+RETRIEVAL_MAX_QUERY_CHARS = int(os.getenv("RETRIEVAL_MAX_QUERY_CHARS", "500"))
+RETRIEVAL_MAX_WORKERS = int(os.getenv("RETRIEVAL_MAX_WORKERS", "4"))
+RETRIEVAL_CONTEXT_TOKEN_BUDGET = int(
+    os.getenv("RETRIEVAL_CONTEXT_TOKEN_BUDGET", "3000")
+)
+
+# 지식 기반 검색 결과 캐시 (RETRIEVAL_CACHE_BUCKET 설정 시 S3 공유 계층 사용)
+RETRIEVAL_CACHE_BUCKET = os.getenv("RETRIEVAL_CACHE_BUCKET")
+retrieval_cache = TTLCache(
+    "retrieval",
+    ttl_seconds=int(os.getenv("RETRIEVAL_CACHE_TTL_SECONDS", "86400")),
+    max_entries=int(os.getenv("RETRIEVAL_CACHE_MAX_ENTRIES", "256")),
+    persistent_tier=(
+        S3JsonStore(
+            lazy_client("s3"),
+            RETRIEVAL_CACHE_BUCKET,
+            os.getenv("RETRIEVAL_CACHE_PREFIX", "retrieval-cache/"),
+        )
+        if RETRIEVAL_CACHE_BUCKET
+        else None
+    ),
+)
+
+# 동일 계약서 전체 분석 결과 캐시 (ANALYSIS_CACHE_BUCKET 설정 시 S3 공유 계층 사용)
+ANALYSIS_CACHE_BUCKET = os.getenv("ANALYSIS_CACHE_BUCKET")
+analysis_cache = TTLCache(
+    "analysis",
+    ttl_seconds=int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "604800")),
+    max_entries=int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "64")),
+    persistent_tier=(
+        S3JsonStore(
+            lazy_client("s3"),
+            ANALYSIS_CACHE_BUCKET,
+            os.getenv("ANALYSIS_CACHE_PREFIX", "analysis-cache/"),
+        )
+        if ANALYSIS_CACHE_BUCKET
+        else None
+    ),
+)
 
 
 def retrieve_knowledge_base(query, model_id):
-    """지식 기반에서 관련 문서를 검색하는 함수"""
+    """지식 기반에서 단일 쿼리로 관련 문서를 검색하는 함수 (오류 시 None 반환)"""
+    # 동일한 쿼리의 검색 결과가 캐시에 있으면 네트워크 호출 생략
+    cached_results = retrieval_cache.get(
+        make_retrieval_cache_key(KNOWLEDGE_BASE_ID, query)
+    )
+    if cached_results is not None:
+        metrics.incr("retrieve_cache_hits")
+        logger.info(
+            f"[RETRIEVE] 검색 캐시 적중 - 결과 {len(cached_results)}개"
+        )
+        return cached_results
+
     try:
-        print(f"[RETRIEVE] 지식 기반 검색 시작 - Model: {model_id}")
-        print(f"[RETRIEVE] 검색 쿼리: {query[:200]}...")
+        logger.info(f"[RETRIEVE] 지식 기반 검색 시작 - Model: {model_id}")
+        logger.info(f"[RETRIEVE] 검색 쿼리: {query[:200]}...")
         
-        response = bedrock_agent_runtime.retrieve(
-            knowledgeBaseId=KNOWLEDGE_BASE_ID,
-            retrievalQuery={
-                "text": query
-            },
-            retrievalConfiguration={
-                "vectorSearchConfiguration": {
-                    "numberOfResults": 5  # 검색 결과 개수 조정 가능
+        with metrics.timer("kb_retrieve"):
+            response = rate_limiter.call(
+                f"retrieve:{KNOWLEDGE_BASE_ID}",
+                bedrock_agent_runtime.retrieve,
+                knowledgeBaseId=KNOWLEDGE_BASE_ID,
+                retrievalQuery={"text": query},
+                retrievalConfiguration={
+                    "vectorSearchConfiguration": {
+                        "numberOfResults": 5  # 검색 결과 개수 조정 가능
+                    }
                 }
-            }
-        )
+            )
         
-        # 전체 검색 응답 로깅
-        print(f"[RETRIEVE] Bedrock 검색 응답 전문: {json.dumps(response, ensure_ascii=False, indent=2)}")
+        # 검색 응답 전문은 샘플링하여 축약 기록
+        logger.payload("[RETRIEVE] Bedrock 검색 응답 전문", response, level="DEBUG")
         
         # 검색 결과 처리
         retrieval_results = response.get("retrievalResults", [])
-        
-        if not retrieval_results:
-            print("[RETRIEVE] 검색 결과가 없습니다.")
-            return None
-            
-        print(f"[RETRIEVE] 검색 결과 개수: {len(retrieval_results)}")
-        
-        # 검색 결과를 텍스트로 변환
-        knowledge_context = ""
-        for idx, result in enumerate(retrieval_results):
-            content = result.get("content", {}).get("text", "")
-            location = result.get("location", {})
-            
-            knowledge_context += f"\n--- 참고 문서 {idx + 1} ---\n"
-            knowledge_context += f"출처: {location.get('s3Location', {}).get('uri', 'Unknown')}\n"
-            knowledge_context += f"내용: {content}\n"
-        
-        print(f"[RETRIEVE] 지식 기반 검색 성공 - 참고 문서 {len(retrieval_results)}개 발견")
-        return {
-            "success": True,
-            "results": retrieval_results,
-            "context": knowledge_context,
-            "count": len(retrieval_results)
-        }
+        logger.info(f"[RETRIEVE] 검색 결과 개수: {len(retrieval_results)}")
+        retrieval_cache.put(
+            make_retrieval_cache_key(KNOWLEDGE_BASE_ID, query),
+            retrieval_results,
+        )
+        return retrieval_results
         
     except Exception as e:
-        print(f"[RETRIEVE] 지식 기반 검색 오류: {str(e)}")
-        print(f"[RETRIEVE] 오류 유형: {type(e).__name__}")
+        metrics.incr("retrieve_errors")
+        logger.error(f"[RETRIEVE] 지식 기반 검색 오류: {str(e)}")
+        logger.error(f"[RETRIEVE] 오류 유형: {type(e).__name__}")
         return None
 
 
-def invoke_with_context(prompt, knowledge_context, model_id, source_type):
-    """컨텍스트를 포함하여 모델에 요청하는 함수"""
-    try:
-        print(f"[INVOKE] 모델 요청 시작 - 소스: {source_type}, Model: {model_id}")
-        
-        # 지식 기반 검색 결과가 있으면 프롬프트에 포함
-        if knowledge_context:
-            enhanced_prompt = f"""다음은 관련 법률 및 판례 정보입니다. 이 정보를 참고하여 계약서를 분석해주세요:
+def retrieve_relevant_context(contract_text, model_id):
+    """계약서를 조항 단위 쿼리로 나누어 병렬 검색하고, 병합된 결과를 토큰 예산 안의 컨텍스트로 만드는 함수"""
+    queries = build_retrieval_queries(
+        contract_text, RETRIEVAL_MAX_QUERIES, RETRIEVAL_MAX_QUERY_CHARS
+    )
+    if not queries:
+        logger.info("[RETRIEVE] 검색 쿼리를 만들 수 있는 조항이 없습니다.")
+        return None
+
+    logger.info(f"[RETRIEVE] 조항 단위 검색 쿼리 {len(queries)}개 생성")
+
+    with ThreadPoolExecutor(
+        max_workers=min(RETRIEVAL_MAX_WORKERS, len(queries))
+    ) as executor:
+        result_lists = list(
+            executor.map(
+                lambda query: retrieve_knowledge_base(query, model_id), queries
+            )
+        )
+
+    succeeded = [results for results in result_lists if results is not None]
+    if not succeeded:
+        return None
+
+    retrieval_results = merge_retrieval_results(succeeded)
+    if not retrieval_results:
+        logger.info("[RETRIEVE] 검색 결과가 없습니다.")
+        return None
+
+    # 검색 결과를 토큰 예산 안에서 텍스트로 변환
+    knowledge_context, used_results = build_knowledge_context(
+        retrieval_results, RETRIEVAL_CONTEXT_TOKEN_BUDGET
+    )
+
+    logger.info(
+        f"[RETRIEVE] 지식 기반 검색 성공 - 참고 문서 "
+        f"{len(retrieval_results)}개 중 {len(used_results)}개 사용"
+    )
+    return {
+        "success": True,
+        "results": used_results,
+        "context": knowledge_context,
+        "count": len(used_results),
+        "query_count": len(queries),
+    }
+
+
+def supports_prompt_cache(model_id):
+    """모델이 Bedrock 프롬프트 캐시를 지원하고 캐시가 켜져 있는지 확인합니다."""
+    return PROMPT_CACHE and any(
+        name in model_id for name in PROMPT_CACHE_MODELS
+    )
+
+
+def build_invoke_body(
+    prompt,
+    knowledge_context,
+    max_tokens=4000,
+    instructions=None,
+    cache_prompt=False,
+):
+    """지식 기반 컨텍스트를 포함한 모델 요청 본문을 생성하는 함수
+
+    instructions(고정 지시문)는 맨 앞 블록으로 분리하고 cache_prompt이면 캐시 체크포인트를 둡니다.
+    요청마다 달라지는 지식 기반 컨텍스트와 계약서는 그 뒤에 붙여 캐시된 앞부분을 재사용합니다.
+    """
+    content = []
+    if instructions:
+        instructions_block = {"type": "text", "text": instructions}
+        if cache_prompt:
+            instructions_block["cache_control"] = {"type": "ephemeral"}
+        content.append(instructions_block)
+
+    # 지식 기반 검색 결과가 있으면 프롬프트에 포함
+    if knowledge_context:
+        content.append(
+            {
+                "type": "text",
+                "text": f"""다음은 관련 법률 및 판례 정보입니다. 이 정보를 참고하여 계약서를 분석해주세요:
 
 {knowledge_context}
 
 ---
+""",
+            }
+        )
+        logger.info("[INVOKE] 지식 기반 컨텍스트 포함하여 요청")
+    else:
+        logger.info("[INVOKE] 일반 지식으로 요청")
+    content.append({"type": "text", "text": prompt})
 
-{prompt}"""
-            print(f"[INVOKE] 지식 기반 컨텍스트 포함하여 요청")
-        else:
-            enhanced_prompt = prompt
-            print(f"[INVOKE] 일반 지식으로 요청")
+    return {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": max_tokens,
+        "messages": [{"role": "user", "content": content}],
+    }
+
+
+def record_model_call(tier, usage, elapsed_ms, stop_reason, max_tokens):
+    """모델 호출 한 건의 토큰/지연 시간을 전체 및 단계(tier: screen/analysis/reduce)별로 기록합니다.
+
+    응답이 max_tokens에서 잘렸으면 함께 기록합니다 (잘린 JSON은 json-repair로 최대한 복구).
+    """
+    metrics.incr("model_calls")
+    metrics.incr(f"{tier}_calls")
+    metrics.add_usage(usage)
+    metrics.add_usage(usage, prefix=f"{tier}_")
+    metrics.record_time(f"{tier}_invoke", elapsed_ms)
+    if stop_reason == "max_tokens":
+        metrics.incr("max_tokens_stops")
+        logger.warning(
+            f"[INVOKE] 응답이 max_tokens({max_tokens})에서 잘렸습니다"
+        )
+
+
+def invoke_with_context(
+    prompt,
+    knowledge_context,
+    model_id,
+    source_type,
+    max_tokens=4000,
+    tier="analysis",
+    instructions=None,
+):
+    """컨텍스트를 포함하여 모델에 요청하는 함수"""
+    try:
+        logger.info(
+            f"[INVOKE] 모델 요청 시작 - 소스: {source_type}, Model: {model_id}"
+        )
         
         # 일반 InvokeModel API 사용
-        body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 4000,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": enhanced_prompt
-                }
-            ]
-        }
-        
-        response = bedrock_runtime.invoke_model(
-            modelId=model_id,
-            body=json.dumps(body, ensure_ascii=False)
+        body = build_invoke_body(
+            prompt,
+            knowledge_context,
+            max_tokens,
+            instructions,
+            supports_prompt_cache(model_id),
         )
         
-        # 응답 파싱
-        response_body = json.loads(response['body'].read())
+        def invoke():
+            started = time.perf_counter()
+            with metrics.timer("invoke_model"):
+                response = bedrock_runtime.invoke_model(
+                    modelId=model_id, body=json.dumps(body, ensure_ascii=False)
+                )
+
+                # 응답 파싱
+                response_body = json.loads(response['body'].read())
+            return response_body, (time.perf_counter() - started) * 1000
+
+        # 모델별 동시 호출 제한 안에서 호출하고 스로틀링되면 백오프 후 재시도
+        response_body, elapsed_ms = rate_limiter.call(model_id, invoke)
+        record_model_call(
+            tier,
+            response_body.get("usage"),
+            elapsed_ms,
+            response_body.get("stop_reason"),
+            max_tokens,
+        )
         
-        # 전체 응답 로깅
-        print(f"[INVOKE] Bedrock 응답 전문: {json.dumps(response_body, ensure_ascii=False, indent=2)}")
+        # 응답 전문은 샘플링하여 축약 기록
+        logger.payload("[INVOKE] Bedrock 응답 전문", response_body)
         
         answer = response_body["content"][0]["text"]
         
-        print(f"[INVOKE] 성공적으로 응답을 생성했습니다 - 소스: {source_type}")
+        logger.info(f"[INVOKE] 성공적으로 응답을 생성했습니다 - 소스: {source_type}")
         return {
             "success": True,
             "source": source_type,
@@ -121,73 +389,246 @@ def invoke_with_context(prompt, knowledge_context, model_id, source_type):
         }
         
     except Exception as e:
-        print(f"[INVOKE] 모델 요청 오류: {str(e)}")
-        print(f"[INVOKE] 오류 유형: {type(e).__name__}")
+        logger.error(f"[INVOKE] 모델 요청 오류: {str(e)}")
+        logger.error(f"[INVOKE] 오류 유형: {type(e).__name__}")
         raise e
 
 
-def extract_toxic_clauses(contract_id, analysis_id, contract_text):
-    """독소조항 추출 함수 - 지식 기반 검색 후 컨텍스트 포함하여 요청"""
-    # prompt.txt 파일 읽기
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    prompt_file_path = os.path.join(current_dir, "prompt.txt")
+def invoke_with_context_stream(
+    prompt,
+    knowledge_context,
+    model_id,
+    source_type,
+    on_toxic=None,
+    max_tokens=4000,
+    tier="analysis",
+    instructions=None,
+):
+    """응답 스트리밍으로 모델에 요청하고, 완성된 독소조항을 도착하는 즉시 on_toxic으로 전달하는 함수"""
+    try:
+        logger.info(
+            f"[INVOKE] 스트리밍 모델 요청 시작 - 소스: {source_type}, Model: {model_id}"
+        )
+
+        body = build_invoke_body(
+            prompt,
+            knowledge_context,
+            max_tokens,
+            instructions,
+            supports_prompt_cache(model_id),
+        )
+
+        parser = ToxicsStreamParser()
+        answer_parts = []
+        usage = {}
+        stop_reason = None
 
-    with open(prompt_file_path, "r", encoding="utf-8") as f:
-        prompt_template = f.read()
+        started = time.perf_counter()
+        # 스트림 시작 요청만 재시도 (독소조항 부분 결과가 전송된 뒤에는 다시 요청하지 않음)
+        # 모델은 본문을 읽는 동안 계속 생성하므로 스트림을 끝까지 읽을 때까지 호출 슬롯을 유지
+        with rate_limiter.hold(
+            model_id,
+            bedrock_runtime.invoke_model_with_response_stream,
+            modelId=model_id,
+            body=json.dumps(body, ensure_ascii=False),
+        ) as response:
+            for event in response["body"]:
+                chunk = event.get("chunk")
+                if not chunk:
+                    continue
+                payload = json.loads(chunk["bytes"])
+                event_type = payload.get("type")
+
+                if not answer_parts and event_type == "content_block_delta":
+                    metrics.record_time(
+                        "stream_first_token",
+                        (time.perf_counter() - started) * 1000,
+                    )
+
+                if event_type == "message_start":
+                    usage.update(payload.get("message", {}).get("usage", {}))
+                elif event_type == "content_block_delta":
+                    text = payload.get("delta", {}).get("text", "")
+                    answer_parts.append(text)
+                    for toxic in parser.feed(text):
+                        logger.info(
+                            f"[INVOKE] 독소조항 수신 - {parser.count}번째: "
+                            f"{toxic.get('title', '')}"
+                        )
+                        if on_toxic:
+                            on_toxic(parser.count - 1, toxic)
+                elif event_type == "message_delta":
+                    stop_reason = payload.get("delta", {}).get("stop_reason")
+                    usage.update(payload.get("usage", {}))
+
+        answer = "".join(answer_parts)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        metrics.record_time("invoke_model_stream", elapsed_ms)
+        record_model_call(tier, usage, elapsed_ms, stop_reason, max_tokens)
+
+        logger.info(
+            f"[INVOKE] 스트리밍 응답 완료 - 소스: {source_type}, "
+            f"독소조항: {parser.count}개, 종료 사유: {stop_reason}"
+        )
+        return {
+            "success": True,
+            "source": source_type,
+            "response": {"stop_reason": stop_reason, "usage": usage},
+            "answer": answer,
+        }
 
-    # contract_text를 템플릿에 삽입
-    prompt = prompt_template.replace("{{contract_document}}", contract_text)
+    except Exception as e:
+        logger.error(f"[INVOKE] 스트리밍 모델 요청 오류: {str(e)}")
+        logger.error(f"[INVOKE] 오류 유형: {type(e).__name__}")
+        raise e
 
-    model_id = "anthropic.claude-3-5-sonnet-20240620-v1:0"
 
-    print(f"[MAIN] 계약서 분석 시작 - Contract ID: {contract_id}, Analysis ID: {analysis_id}")
+def publish_partial_toxic(contract_id, analysis_id, toxic_idx, toxic):
+    """완성된 독소조항 하나를 부분 결과 큐로 전송하는 함수 (실패해도 분석은 계속 진행)"""
+    # 조항을 특정할 수 없어 최종 결과에서도 제외될 독소조항은 전송하지 않음
+    if not PARTIAL_RESULTS_QUEUE_URL or toxic is None:
+        return
+    try:
+        sqs.send_message(
+            QueueUrl=PARTIAL_RESULTS_QUEUE_URL,
+            MessageBody=json.dumps(
+                {
+                    "contractId": contract_id,
+                    "analysisId": analysis_id,
+                    "toxicIdx": toxic_idx,
+                    "toxic": toxic,
+                },
+                ensure_ascii=False,
+            ),
+        )
+    except Exception as e:
+        logger.error(f"[PARTIAL] 부분 결과 전송 실패: {str(e)}")
+
+
+def parse_model_json(answer):
+    """모델 응답에서 JSON 블록을 추출하고 json-repair로 복구하여 파싱하는 함수"""
+    # JSON 블록에서 JSON 추출
+    if "```json" in answer:
+        json_start = answer.find("```json") + 7
+        json_end = answer.find("```", json_start)
+        json_str = answer[json_start:json_end].strip()
+    else:
+        # JSON이 바로 시작하는 경우
+        json_str = answer.strip()
+
+    # json-repair를 사용하여 JSON 복구 및 파싱 (첫 사용 시 import)
+    from json_repair import repair_json
+
+    with metrics.timer("json_repair"):
+        repaired_json = repair_json(json_str)
+        return json.loads(repaired_json)
+
+
+def extract_toxic_clauses(
+    contract_id,
+    analysis_id,
+    contract_text,
+    language=None,
+    stream=False,
+    tag_map=None,
+    compact=False,
+):
+    """독소조항 추출 함수 - 지식 기반 검색 후 컨텍스트 포함하여 요청
+
+    정규화 입력이면 tag_map(정규화 요소 목록)을 넘겨 sourceContractTagIdx를 OCR 원본 요소 id로 되돌리고,
+    compact이면 compact 출력 모드로 요청하여 조항 원문을 tag_map에서 복원합니다.
+    """
+    # import 시 미리 분할해 둔 템플릿에 contract_text를 삽입
+    prompt_template = get_prompt_template(language, compact)
+    # 고정 지시문은 프롬프트 캐시 대상이므로 계약서와 분리
+    instructions, prompt = prompt_template.render_parts(contract_text)
+    # 출력 토큰이 지연 시간을 좌우하므로 계약서 길이에 맞춰 상한을 정함
+    max_tokens = compute_max_tokens(contract_text, compact)
+
+    model_id = MODEL_ID
+
+    logger.info(
+        f"[MAIN] 계약서 분석 시작 - Contract ID: {contract_id}, "
+        f"Analysis ID: {analysis_id}"
+    )
     
     # 1단계: 지식 기반에서 관련 문서 검색
-    knowledge_result = retrieve_knowledge_base(prompt, model_id)
+    with metrics.timer("retrieval"):
+        knowledge_result = retrieve_relevant_context(contract_text, model_id)
     
     if knowledge_result is not None:
         # 지식 기반 검색 성공 - 컨텍스트 포함하여 요청
-        print(f"[MAIN] 지식 기반 검색 성공 - 참고 문서 {knowledge_result['count']}개")
-        invoke_result = invoke_with_context(prompt, knowledge_result["context"], model_id, "knowledge_base")
+        logger.info(
+            f"[MAIN] 지식 기반 검색 성공 - 참고 문서 {knowledge_result['count']}개"
+        )
+        knowledge_context = knowledge_result["context"]
         source_type = "knowledge_base"
         citations_count = knowledge_result["count"]
     else:
         # 지식 기반 검색 실패 - 일반 지식으로 요청
-        print(f"[MAIN] 지식 기반 검색 실패 - 일반 지식으로 요청")
-        invoke_result = invoke_with_context(prompt, None, model_id, "general_request")
+        logger.warning("[MAIN] 지식 기반 검색 실패 - 일반 지식으로 요청")
+        knowledge_context = None
         source_type = "general_request"
         citations_count = 0
 
+    if stream:
+        # 스트리밍 모드: 완성된 독소조항을 전체 응답이 끝나기 전에 부분 결과로 전송
+        # (부분 결과도 최종 결과와 같은 기준의 sourceContractTagIdx로 변환)
+        invoke_result = invoke_with_context_stream(
+            prompt,
+            knowledge_context,
+            model_id,
+            source_type,
+            on_toxic=lambda idx, toxic: publish_partial_toxic(
+                contract_id,
+                analysis_id,
+                idx,
+                (
+                    finalize_toxic(toxic, tag_map, compact)
+                    if tag_map is not None
+                    else toxic
+                ),
+            ),
+            max_tokens=max_tokens,
+            instructions=instructions,
+        )
+    else:
+        invoke_result = invoke_with_context(
+            prompt,
+            knowledge_context,
+            model_id,
+            source_type,
+            max_tokens,
+            instructions=instructions,
+        )
+
     answer = invoke_result["answer"]
 
     try:
-        # JSON 블록에서 JSON 추출
-        if "```json" in answer:
-            json_start = answer.find("```json") + 7
-            json_end = answer.find("```", json_start)
-            json_str = answer[json_start:json_end].strip()
-        else:
-            # JSON이 바로 시작하는 경우
-            json_str = answer.strip()
+        parsed_result = parse_model_json(answer)
 
-        # json-repair를 사용하여 JSON 복구 및 파싱
-        repaired_json = repair_json(json_str)
-        parsed_result = json.loads(repaired_json)
+        # 정규화 요소 번호를 OCR 원본 기준으로 되돌리고, compact 응답은 조항 원문도 복원
+        # (originContent는 lambda_handler에서 한 번만 채움)
+        if tag_map is not None:
+            finalize_toxics(parsed_result, tag_map, compact)
 
         # 필수 필드 보완
-        if not parsed_result.get("originContent"):
-            parsed_result["originContent"] = contract_text
-
         if not parsed_result.get("title"):
             parsed_result["title"] = "계약서"
 
-        print(f"[MAIN] JSON 파싱 성공 - 소스: {source_type}, 참고 문서: {citations_count}개")
+        logger.info(
+            f"[MAIN] JSON 파싱 성공 - 소스: {source_type}, "
+            f"참고 문서: {citations_count}개"
+        )
         
         return {
             "status": "success",
             "model_used": model_id,
+            "prompt_version": prompt_template.version,
             "source_type": source_type,
             "citations_count": citations_count,
+            "max_tokens": max_tokens,
+            "compact_output": compact,
             "data": {
                 "contractId": contract_id,
                 "analysisResult": parsed_result
@@ -195,11 +636,12 @@ def extract_toxic_clauses(contract_id, analysis_id, contract_text):
         }
 
     except Exception as e:
-        print(f"[MAIN] JSON 파싱 실패: {str(e)}")
+        logger.error(f"[MAIN] JSON 파싱 실패: {str(e)}")
         # JSON 파싱 실패 시 원본 응답 반환
         return {
             "status": "partial_success",
             "model_used": model_id,
+            "prompt_version": prompt_template.version,
             "source_type": source_type,
             "citations_count": citations_count,
             "raw_response": answer,
@@ -221,19 +663,408 @@ def extract_toxic_clauses(contract_id, analysis_id, contract_text):
         }
 
 
+def extract_toxic_clauses_map_reduce(
+    contract_id, analysis_id, pages, language=None, tag_map=None, compact=False
+):
+    """긴 계약서용 map-reduce 분석 - 청크별로 동시에 분석한 뒤 병합하고 최종 해설을 작성"""
+    chunks = split_into_chunks(pages, MAP_REDUCE_CHUNK_CHARS)
+
+    logger.info(
+        f"[MAP] map-reduce 분석 시작 - 청크 {len(chunks)}개, "
+        f"동시 실행 {MAP_REDUCE_MAX_WORKERS}개"
+    )
+
+    def analyze_chunk(chunk):
+        try:
+            return extract_toxic_clauses(
+                contract_id,
+                analysis_id,
+                chunk["text"],
+                language,
+                tag_map=tag_map,
+                compact=compact,
+            )
+        except ThrottledError as e:
+            # 스로틀링이 끝내 풀리지 않은 청크는 제외하고 나머지 청크로 분석을 완료
+            logger.warning(
+                f"[MAP] 청크 {chunk['index'] + 1} 스로틀링으로 분석 실패 - "
+                f"병합에서 제외: {str(e)}"
+            )
+            metrics.incr("failed_chunks")
+            return None
+
+    # map: 청크별 독소조항 분석 (제한된 워커 풀)
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(MAP_REDUCE_MAX_WORKERS, len(chunks)))
+    ) as executor:
+        chunk_results = list(executor.map(analyze_chunk, chunks))
+
+    chunk_analyses = []
+    for chunk, result in zip(chunks, chunk_results):
+        if result is None:
+            continue
+        if result["status"] == "success":
+            chunk_analyses.append((chunk, result["data"]["analysisResult"]))
+        else:
+            logger.warning(
+                f"[MAP] 청크 {chunk['index'] + 1} 파싱 실패 - 병합에서 제외"
+            )
+
+    if not chunk_analyses:
+        # 모든 청크가 스로틀링으로 빠졌으면 Lambda 재시도 대상이 되도록 ThrottledError
+        if all(result is None for result in chunk_results):
+            raise ThrottledError("모든 청크가 스로틀링으로 분석되지 못했습니다.")
+        raise ValueError("모든 청크의 분석 결과 파싱에 실패했습니다.")
+
+    # reduce: 독소조항 병합/중복 제거 후 전체 요약과 해설 작성
+    toxics = merge_toxics(chunk_analyses)
+    logger.info(f"[REDUCE] 독소조항 병합 완료 - {len(toxics)}개")
+
+    try:
+        reduce_result = invoke_with_context(
+            build_reduce_prompt(chunk_analyses, toxics),
+            None,
+            MODEL_ID,
+            "map_reduce",
+            REDUCE_MAX_TOKENS,
+            tier="reduce",
+        )
+        commentary = parse_model_json(reduce_result["answer"])
+    except Exception as e:
+        # 최종 해설 요청/파싱 실패 시 첫 청크의 요약/해설을 사용
+        logger.error(f"[REDUCE] 최종 해설 생성 실패: {str(e)}")
+        commentary = chunk_analyses[0][1]
+
+    analysis_result = {
+        "title": commentary.get("title") or "계약서",
+        "summary": commentary.get("summary", ""),
+        "ddobakCommentary": commentary.get("ddobakCommentary", {}),
+        "toxicCount": len(toxics),
+        "toxics": toxics,
+    }
+
+    chunk_results = [result for result in chunk_results if result is not None]
+    source_types = {result["source_type"] for result in chunk_results}
+    return {
+        "status": "success",
+        "model_used": MODEL_ID,
+        "prompt_version": chunk_results[0]["prompt_version"],
+        "source_type": (
+            "knowledge_base"
+            if "knowledge_base" in source_types
+            else "general_request"
+        ),
+        "citations_count": sum(
+            result["citations_count"] for result in chunk_results
+        ),
+        "chunk_count": len(chunks),
+        "analyzed_chunk_count": len(chunk_analyses),
+        "compact_output": compact,
+        "data": {"contractId": contract_id, "analysisResult": analysis_result},
+    }
+
+
+def screen_contract(chunk_text, element_count):
+    """저비용 모델로 청크 하나를 선별하여 (의심 요소 번호 집합, 선별 응답)을 반환합니다."""
+    screen_result = invoke_with_context(
+        build_screen_prompt(chunk_text),
+        None,
+        SCREEN_MODEL_ID,
+        "screen",
+        SCREEN_MAX_TOKENS,
+        tier="screen",
+    )
+    parsed = parse_model_json(screen_result["answer"])
+    # 해석할 수 없는 응답은 오류로 처리하여 route_contract가 전체 정밀 분석으로 대체
+    if not isinstance(parsed, dict) or "suspicious" not in parsed:
+        raise ValueError("선별 응답에서 suspicious 목록을 찾을 수 없습니다")
+    return parse_suspicious(parsed, element_count), parsed
+
+
+def route_contract(analysis_pages, elements):
+    """선별 단계를 실행하고 정밀 분석에 보낼 페이지 목록과 라우팅 정보를 반환합니다.
+
+    선별이 실패하거나, 의심 요소가 없거나, 선별 결과가 너무 크면 전체 페이지를 그대로 반환합니다.
+    """
+    chars_full = sum(len(page) for page in analysis_pages)
+    routing_info = {
+        "applied": False,
+        "screen_model": SCREEN_MODEL_ID,
+        "analysis_model": MODEL_ID,
+        "elements_total": len(elements),
+        "chars_full": chars_full,
+    }
+    if chars_full < ROUTING_MIN_CHARS or not elements:
+        routing_info["skipped_reason"] = "short_contract"
+        return analysis_pages, routing_info
+
+    chunks = split_into_chunks(analysis_pages, SCREEN_CHUNK_CHARS)
+    logger.info(
+        f"[ROUTE] 1차 선별 시작 - 청크 {len(chunks)}개, 모델: {SCREEN_MODEL_ID}"
+    )
+    try:
+        with metrics.timer("screening"):
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(MAP_REDUCE_MAX_WORKERS, len(chunks)))
+            ) as executor:
+                screen_results = list(
+                    executor.map(
+                        lambda chunk: screen_contract(
+                            chunk["text"], len(elements)
+                        ),
+                        chunks,
+                    )
+                )
+    except Exception as e:
+        logger.warning(
+            f"[ROUTE] 1차 선별 실패 - 전체 정밀 분석으로 진행: {str(e)}"
+        )
+        routing_info["skipped_reason"] = "screen_error"
+        return analysis_pages, routing_info
+
+    suspicious = set().union(*(result[0] for result in screen_results))
+    selected = expand_selection(
+        suspicious,
+        len(elements),
+        SCREEN_CONTEXT_RADIUS,
+        ROUTING_HEADER_ELEMENTS,
+    )
+    routed_pages = select_pages(analysis_pages, selected)
+    chars_selected = sum(len(page) for page in routed_pages)
+
+    routing_info.update(
+        {
+            "elements_suspicious": len(suspicious),
+            "elements_selected": len(selected),
+            "chars_selected": chars_selected,
+        }
+    )
+    # 청크 하나로 선별한 경우 전체 문서 기준 제목/요약을 그대로 사용
+    if len(screen_results) == 1:
+        routing_info["title"] = screen_results[0][1].get("title")
+        routing_info["summary"] = screen_results[0][1].get("summary")
+
+    # 선별 모델이 놓친 조항을 정밀 분석에서 잃지 않도록 의심 요소가 없으면 전체를 분석
+    if not suspicious:
+        logger.info("[ROUTE] 의심 요소가 없어 전체 정밀 분석으로 진행")
+        routing_info["skipped_reason"] = "no_suspicious_elements"
+        return analysis_pages, routing_info
+
+    if chars_selected > chars_full * ROUTING_MAX_SELECTED_RATIO:
+        logger.info(
+            f"[ROUTE] 선별 비율이 높아 전체 정밀 분석으로 진행 - {chars_selected}/{chars_full}자"
+        )
+        routing_info["skipped_reason"] = "selection_too_large"
+        return analysis_pages, routing_info
+
+    logger.info(
+        f"[ROUTE] 1차 선별 완료 - 의심 요소 {len(suspicious)}개, "
+        f"정밀 분석 {len(selected)}/{len(elements)}개 요소",
+        chars_selected=chars_selected,
+        chars_full=chars_full,
+    )
+    routing_info["applied"] = True
+    return routed_pages, routing_info
+
+
+def tier_stats(summary):
+    """metrics 요약에서 모델 단계(screen/analysis/reduce)별 호출 수/토큰/소요 시간을 모읍니다."""
+    tiers = {}
+    for tier in ("screen", "analysis", "reduce"):
+        calls = summary["counters"].get(f"{tier}_calls", 0)
+        if not calls:
+            continue
+        timing = summary["timings"].get(f"{tier}_invoke", {})
+        tiers[tier] = {
+            "calls": calls,
+            "input_tokens": summary["counters"].get(f"{tier}_input_tokens", 0),
+            "output_tokens": summary["counters"].get(
+                f"{tier}_output_tokens", 0
+            ),
+            "cache_read_input_tokens": summary["counters"].get(
+                f"{tier}_cache_read_input_tokens", 0
+            ),
+            "cache_creation_input_tokens": summary["counters"].get(
+                f"{tier}_cache_creation_input_tokens", 0
+            ),
+            "total_ms": timing.get("total_ms", 0),
+            "max_ms": timing.get("max_ms", 0),
+        }
+    return tiers
+
+
+def prompt_cache_stats(summary):
+    """분석 모델의 프롬프트 캐시 사용 여부와 캐시 읽기/쓰기 토큰 수를 모읍니다."""
+    return {
+        "enabled": supports_prompt_cache(MODEL_ID),
+        "cache_read_input_tokens": summary["counters"].get(
+            "cache_read_input_tokens", 0
+        ),
+        "cache_creation_input_tokens": summary["counters"].get(
+            "cache_creation_input_tokens", 0
+        ),
+    }
+
+
+def _import_json_repair():
+    import json_repair  # noqa: F401
+
+
+# 워밍업 이벤트({"warmup": true}) 또는 LAMBDA_EAGER_INIT 시 미리 준비할 항목
+WARMUP_STEPS = [
+    ("bedrock_runtime_client", lambda: bedrock_runtime.meta),
+    ("bedrock_agent_runtime_client", lambda: bedrock_agent_runtime.meta),
+    ("json_repair", _import_json_repair),
+]
+
+
 def lambda_handler(event, context):
     """Lambda 핸들러 함수"""
+    if is_warmup_event(event):
+        return warmup_response(WARMUP_STEPS)
+
+    metrics.reset()
+    rate_limiter.set_deadline(context)
     try:
         contract_id = event["contractId"]
         analysis_id = event["analysisId"]
         contract_text = event["contractTexts"]
+        language = event.get("language")
+        stream = event.get("stream", BEDROCK_STREAMING)
 
-        full_text = "\n---\n".join(f"Page {idx + 1}:\n{text}" for idx, text in enumerate(contract_text))
+        normalize_input = event.get("normalizeInput", NORMALIZE_CONTRACT_TEXT)
+        # compact 출력과 모델 라우팅은 정규화 요소 목록(elements)이 필요
+        compact_output = normalize_input and event.get(
+            "compactOutput", COMPACT_OUTPUT
+        )
+        model_routing = normalize_input and event.get(
+            "modelRouting", MODEL_ROUTING
+        )
+
+        full_text = "\n---\n".join(
+            format_page(idx, text) for idx, text in enumerate(contract_text)
+        )
 
-        print(f"[LAMBDA] Lambda 실행 시작 - Contract ID: {contract_id}, Analysis ID: {analysis_id}")
+        # OCR HTML을 요소 번호가 붙은 압축 텍스트로 변환하여 입력 토큰 절감
+        if normalize_input:
+            with metrics.timer("normalize"):
+                analysis_pages, elements, normalization_stats = (
+                    normalize_contract_pages(contract_text)
+                )
+            logger.info("[LAMBDA] 입력 정규화", **normalization_stats)
+        else:
+            analysis_pages, elements, normalization_stats = (
+                contract_text,
+                None,
+                None,
+            )
+        analysis_text = "\n---\n".join(
+            format_page(idx, text) for idx, text in enumerate(analysis_pages)
+        )
+
+        logger.info(
+            f"[LAMBDA] Lambda 실행 시작 - Contract ID: {contract_id}, "
+            f"Analysis ID: {analysis_id}"
+        )
+
+        # 호출 단위 캐시 적중/실패 집계
+        retrieval_cache.reset_stats()
         
+        # 긴 계약서는 청크 단위 map-reduce로 분석 (이벤트의 "mapReduce" 값으로 강제 지정 가능)
+        use_map_reduce = event.get(
+            "mapReduce", len(analysis_text) > MAP_REDUCE_THRESHOLD_CHARS
+        )
+
+        # 동일한 계약서 텍스트의 분석 결과가 캐시에 있으면 그대로 반환 (이벤트의 "bypassCache"로 우회 가능)
+        prompt_version = get_prompt_template(
+            language, compact_output
+        ).version + ("+normalized" if normalize_input else "")
+        if model_routing:
+            prompt_version += f"+tiered:{SCREEN_MODEL_ID}"
+        cache_key = make_analysis_cache_key(
+            full_text, MODEL_ID, prompt_version, KNOWLEDGE_BASE_ID
+        )
+        cached_result = (
+            None
+            if event.get("bypassCache", False)
+            else analysis_cache.get(cache_key)
+        )
+
+        # 캐시에 없으면 저비용 모델로 먼저 선별하여 정밀 분석할 텍스트를 줄임
+        routing_info = None
+        if cached_result is None and model_routing:
+            analysis_pages, routing_info = route_contract(
+                analysis_pages, elements
+            )
+            if routing_info["applied"]:
+                analysis_text = "\n---\n".join(
+                    format_page(idx, text)
+                    for idx, text in enumerate(analysis_pages)
+                    if text
+                )
+                use_map_reduce = event.get(
+                    "mapReduce",
+                    len(analysis_text) > MAP_REDUCE_THRESHOLD_CHARS,
+                )
+
         # 독소조항 추출 수행
-        result = extract_toxic_clauses(contract_id, analysis_id, full_text)
+        if cached_result is not None:
+            logger.info(
+                f"[LAMBDA] 분석 결과 캐시 적중 - Contract ID: {contract_id}"
+            )
+            result = {
+                **cached_result,
+                "data": {**cached_result["data"], "contractId": contract_id},
+            }
+        elif use_map_reduce:
+            result = extract_toxic_clauses_map_reduce(
+                contract_id,
+                analysis_id,
+                analysis_pages,
+                language,
+                elements,
+                compact_output,
+            )
+        else:
+            result = extract_toxic_clauses(
+                contract_id,
+                analysis_id,
+                analysis_text,
+                language,
+                stream,
+                elements,
+                compact_output,
+            )
+
+        # 원문은 모델 응답이 아닌 정규화 전 OCR 입력으로 한 번만 채움
+        if cached_result is None:
+            analysis_result = result["data"].get(
+                "analysisResult", result["data"]
+            )
+            analysis_result["originContent"] = full_text
+            # 정밀 분석은 선별된 요소만 보므로 전체 문서를 본 선별 단계의 제목/요약을 우선 사용
+            if (
+                routing_info
+                and routing_info["applied"]
+                and result.get("status") == "success"
+            ):
+                analysis_result["title"] = routing_info.get(
+                    "title"
+                ) or analysis_result.get("title")
+                analysis_result["summary"] = routing_info.get(
+                    "summary"
+                ) or analysis_result.get("summary")
+
+        # 파싱까지 성공하고 스로틀링으로 빠진 청크가 없는 결과만 캐시
+        degraded = result.get(
+            "analyzed_chunk_count", result.get("chunk_count", 1)
+        ) < result.get("chunk_count", 1)
+        if (
+            cached_result is None
+            and result.get("status") == "success"
+            and not degraded
+        ):
+            analysis_cache.put(cache_key, result)
 
         response = {
             "success": True,
@@ -245,19 +1076,53 @@ def lambda_handler(event, context):
                 "metadata": {
                     "source_type": result.get("source_type", "unknown"),
                     "citations_count": result.get("citations_count", 0),
-                    "model_used": result.get("model_used", "unknown")
+                    "model_used": result.get("model_used", "unknown"),
+                    "prompt_version": result.get("prompt_version", "unknown"),
+                    "chunk_count": result.get("chunk_count", 1),
+                    "analyzed_chunk_count": result.get(
+                        "analyzed_chunk_count", result.get("chunk_count", 1)
+                    ),
+                    "compact_output": result.get("compact_output", False),
+                    "max_tokens": result.get("max_tokens"),
+                    "retrieval_cache": retrieval_cache.stats(),
+                    "analysis_cache_hit": cached_result is not None,
+                    "input_normalization": normalization_stats,
+                    "routing": routing_info
+                    and {
+                        **{
+                            key: value
+                            for key, value in routing_info.items()
+                            if key not in ("title", "summary")
+                        },
+                        "tiers": tier_stats(metrics.summary()),
+                    },
+                    "prompt_cache": prompt_cache_stats(metrics.summary()),
+                    "metrics": metrics.summary()
                 }
             }
         }
+        metrics.emit()
 
-        print(f"[LAMBDA] Lambda 실행 완료 - 소스: {result.get('source_type', 'unknown')}")
-        print(f"[LAMBDA] 최종 응답: {json.dumps(response, ensure_ascii=False, indent=2)}")
+        logger.info(
+            "[LAMBDA] Lambda 실행 완료 - 소스: "
+            f"{result.get('source_type', 'unknown')}"
+        )
+        logger.payload("[LAMBDA] 최종 응답", response)
 
         return response
 
     except Exception as e:
-        print(f"[LAMBDA] Lambda 실행 중 오류 발생: {str(e)}")
-        print(f"[LAMBDA] 오류 유형: {type(e).__name__}")
+        logger.error(f"[LAMBDA] Lambda 실행 중 오류 발생: {str(e)}")
+        logger.error(f"[LAMBDA] 오류 유형: {type(e).__name__}")
+
+        metrics.incr("errors")
+        # 남은 실행 시간 안에 풀리지 않은 스로틀링은 일시적 오류이므로 오류 응답
+        # (on_success로 전달되어 FAILED로 저장됨) 대신 예외를 다시 던져 Lambda 비동기
+        # 재시도와 on_failure(DLQ)가 처리하도록 함 (terraform/wiring.tf 참고)
+        if isinstance(e, ThrottledError):
+            metrics.incr("throttled_requests")
+            metrics.emit()
+            raise
 
         # 오류 발생 시에도 기본 구조 유지
         error_response = {
@@ -281,10 +1146,23 @@ def lambda_handler(event, context):
                 "metadata": {
                     "source_type": "error",
                     "citations_count": 0,
-                    "model_used": "unknown"
+                    "model_used": "unknown",
+                    "prompt_version": "unknown",
+                    "analysis_cache_hit": False,
+                    "metrics": metrics.summary()
                 }
             }
         }
+        metrics.emit()
 
-        print(f"[LAMBDA] 오류 응답: {json.dumps(error_response, ensure_ascii=False, indent=2)}")
+        logger.payload(
+            "[LAMBDA] 오류 응답",
+            error_response,
+            level="ERROR",
+            sample_rate=1.0,
+        )
         return error_response
+
+
+if EAGER_INIT:
+    logger.info("[LAMBDA] Eager init", warmup=warm_up(WARMUP_STEPS))
@@ -0,0 +1,123 @@
+import re
+import json
+
+# 청크별 분석 결과를 종합하여 제목/요약/또박이 해설을 다시 작성하게 하는 프롬프트
+REDUCE_PROMPT = """당신은 "또박이"라는 이름의 전문 계약서 분석 AI입니다.
+하나의 긴 계약서를 여러 부분으로 나누어 분석한 결과가 아래에 있습니다.
+부분별 요약과 발견된 독소조항 목록을 종합하여 계약서 전체에 대한 제목, 요약, 또박이 해설을 작성해주세요.
+해설은 귀엽고 친근한 말투를 사용합니다.
+
+<partial_summaries>
+{summaries}
+</partial_summaries>
+
+<toxic_clauses>
+{toxics}
+</toxic_clauses>
+
+다음 JSON 형식으로만 응답해주세요:
+{{
+  "title": "계약서 유형과 목적을 반영한 제목 (3-10 단어)",
+  "summary": "계약서 핵심 내용 요약 (2-3 문장)",
+  "ddobakCommentary": {{
+    "overallComment": "전체 평가 (정확히 한 문장)",
+    "warningComment": "가장 중요한 위험 요소 요약 (1-2 문장)",
+    "advice": "구체적이고 실천 가능한 조언 (2-3 문장)"
+  }}
+}}"""
+
+
+def format_page(page_idx, text):
+    """단일 요청 모드와 같은 형식으로 페이지 텍스트에 페이지 번호를 붙입니다."""
+    return f"Page {page_idx + 1}:\n{text}"
+
+
+def _split_long_text(text, max_chars):
+    """max_chars보다 긴 페이지를 줄 단위로 나눕니다 (조항 중간이 잘리지 않도록 줄 경계 사용)."""
+    pieces = []
+    current = []
+    current_len = 0
+    for line in text.splitlines(keepends=True):
+        if current and current_len + len(line) > max_chars:
+            pieces.append("".join(current))
+            current, current_len = [], 0
+        current.append(line)
+        current_len += len(line)
+    if current:
+        pieces.append("".join(current))
+    return pieces
+
+
+def split_into_chunks(pages, max_chars):
+    """페이지 목록을 max_chars 이하의 청크로 묶습니다.
+
+    각 청크는 {"index", "text"}입니다. 청크는 원본 요소 id/정규화 요소 번호를 그대로 담으므로
+    청크별 sourceContractTagIdx는 단일 요청 모드와 같은 기준입니다.
+    """
+    segments = []
+    for page_idx, text in enumerate(pages):
+        for piece in _split_long_text(text, max_chars):
+            segments.append(format_page(page_idx, piece))
+
+    chunks = []
+    current = []
+    current_len = 0
+    for segment in segments:
+        if current and current_len + len(segment) > max_chars:
+            chunks.append(current)
+            current, current_len = [], 0
+        current.append(segment)
+        current_len += len(segment)
+    if current:
+        chunks.append(current)
+
+    return [
+        {"index": idx, "text": "\n---\n".join(chunk_segments)}
+        for idx, chunk_segments in enumerate(chunks)
+    ]
+
+
+def _normalize_clause(clause):
+    return re.sub(r"\s+", "", clause or "")
+
+
+def merge_toxics(chunk_analyses):
+    """청크별 독소조항을 합치고, 같은 조항은 경고 수준이 높은 것 하나만 남깁니다.
+
+    chunk_analyses는 (청크, analysisResult) 튜플 목록입니다.
+    """
+    merged = {}
+    order = []
+    for chunk, analysis in chunk_analyses:
+        for toxic in analysis.get("toxics", []) or []:
+            key = (
+                _normalize_clause(toxic.get("clause"))
+                or f"{chunk['index']}:{toxic.get('title', '')}"
+            )
+            if key not in merged:
+                merged[key] = toxic
+                order.append(key)
+            elif toxic.get("warnLevel", 1) > merged[key].get("warnLevel", 1):
+                merged[key] = toxic
+
+    return [merged[key] for key in order]
+
+
+def build_reduce_prompt(chunk_analyses, toxics):
+    """청크 요약과 병합된 독소조항으로 최종 해설 프롬프트를 만듭니다."""
+    summaries = "\n".join(
+        f"- 부분 {chunk['index'] + 1}: {analysis.get('summary', '')}"
+        for chunk, analysis in chunk_analyses
+    )
+    toxic_lines = json.dumps(
+        [
+            {
+                "title": t.get("title", ""),
+                "reason": t.get("reason", ""),
+                "warnLevel": t.get("warnLevel", 1),
+            }
+            for t in toxics
+        ],
+        ensure_ascii=False,
+    )
+    return REDUCE_PROMPT.format(summaries=summaries, toxics=toxic_lines)
@@ -0,0 +1,186 @@
+from html.parser import HTMLParser
+
+from .retrieval import estimate_tokens
+
+# 줄바꿈으로 취급할 태그
+LINE_BREAK_TAGS = {"br", "p", "li", "div"}
+# 내용을 버리는 태그 (이미지/스크립트 등)
+SKIPPED_TAGS = {"img", "script", "style"}
+
+
+class _ElementTextParser(HTMLParser):
+    """Upstage OCR HTML을 id가 붙은 최상위 요소 단위의 텍스트 목록으로 변환합니다.
+
+    표는 행/열 구조를 유지하도록 마크다운 표로 바꾸고, 이미지(base64 포함)는 버립니다.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.elements = []
+        self._current = None
+        self._skip_depth = 0
+
+    def _start_element(self, tag, element_id):
+        self._current = {
+            "tag": tag,
+            "id": element_id,
+            "depth": 0,
+            "parts": [],
+            "rows": [],
+            "row": None,
+            "cell": None,
+        }
+
+    def _finish_element(self):
+        element = self._current
+        self._current = None
+        if element["rows"]:
+            text = self._format_table(element["rows"])
+            category = "table"
+        else:
+            lines = [
+                " ".join(line.split())
+                for line in "".join(element["parts"]).splitlines()
+            ]
+            text = "\n".join(line for line in lines if line)
+            category = element["tag"]
+        if text:
+            self.elements.append(
+                {"id": element["id"], "category": category, "text": text}
+            )
+
+    @staticmethod
+    def _format_table(rows):
+        width = max(len(row) for row in rows)
+        rows = [row + [""] * (width - len(row)) for row in rows]
+        lines = ["| " + " | ".join(rows[0]) + " |", "|" + " --- |" * width]
+        lines.extend("| " + " | ".join(row) + " |" for row in rows[1:])
+        return "\n".join(lines)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            if tag != "img":
+                self._skip_depth += 1
+            return
+
+        if self._current is None:
+            attrs = dict(attrs)
+            # id가 없는 최상위 텍스트도 하나의 요소로 취급
+            self._start_element(tag, attrs.get("id"))
+            if tag == "br":
+                self._finish_element()
+            return
+
+        element = self._current
+        if tag == element["tag"]:
+            element["depth"] += 1
+        if tag == "tr":
+            element["row"] = []
+        elif tag in ("td", "th"):
+            element["cell"] = []
+        elif tag in LINE_BREAK_TAGS:
+            self._append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            if tag != "img":
+                self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        element = self._current
+        if element is None:
+            return
+
+        if (
+            tag in ("td", "th")
+            and element["cell"] is not None
+            and element["row"] is not None
+        ):
+            element["row"].append(" ".join("".join(element["cell"]).split()))
+            element["cell"] = None
+        elif tag == "tr" and element["row"] is not None:
+            if any(element["row"]):
+                element["rows"].append(element["row"])
+            element["row"] = None
+        elif tag in LINE_BREAK_TAGS:
+            self._append("\n")
+
+        if tag == element["tag"]:
+            if element["depth"] == 0:
+                self._finish_element()
+            else:
+                element["depth"] -= 1
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._current is None:
+            if not data.strip():
+                return
+            self._start_element("text", None)
+            self._append(data)
+            self._finish_element()
+            return
+        self._append(data)
+
+    def _append(self, text):
+        element = self._current
+        if element["cell"] is not None:
+            element["cell"].append(text)
+        else:
+            element["parts"].append(text)
+
+    def close(self):
+        super().close()
+        if self._current is not None:
+            self._finish_element()
+
+
+def html_to_elements(html_text):
+    """OCR HTML 한 페이지를 [{"id", "category", "text"}] 요소 목록으로 변환합니다."""
+    parser = _ElementTextParser()
+    parser.feed(html_text)
+    parser.close()
+    return parser.elements
+
+
+def normalize_contract_pages(pages):
+    """페이지별 OCR HTML을 요소 번호가 붙은 압축 텍스트로 변환합니다.
+
+    요소 번호([N])는 문서 전체에서 이어지는 순번으로, 모델이 돌려주는
+    sourceContractTagIdx와 같은 값입니다. 페이지별로 다시 시작하는 Upstage 요소 id와의
+    대응은 tag_map으로 반환하며, 응답은 output.restore_source_location으로 원본 id로 되돌립니다.
+    반환값: (정규화된 페이지 텍스트 목록, tag_map, 크기 통계)
+    """
+    normalized_pages = []
+    tag_map = []
+    for page_idx, html_text in enumerate(pages):
+        lines = []
+        for element in html_to_elements(html_text):
+            tag_idx = len(tag_map)
+            tag_map.append(
+                {
+                    "tagIdx": tag_idx,
+                    "pageIdx": page_idx,
+                    "elementId": element["id"],
+                    "category": element["category"],
+                    "text": element["text"],
+                }
+            )
+            separator = "\n" if element["category"] == "table" else " "
+            lines.append(f"[{tag_idx}]{separator}{element['text']}")
+        normalized_pages.append("\n".join(lines))
+
+    raw_chars = sum(len(page) for page in pages)
+    normalized_chars = sum(len(page) for page in normalized_pages)
+    stats = {
+        "raw_chars": raw_chars,
+        "normalized_chars": normalized_chars,
+        "raw_tokens_estimate": estimate_tokens("".join(pages)),
+        "normalized_tokens_estimate": estimate_tokens(
+            "".join(normalized_pages)
+        ),
+        "reduction_ratio": (
+            round(1 - normalized_chars / raw_chars, 3) if raw_chars else 0.0
+        ),
+    }
+    return normalized_pages, tag_map, stats
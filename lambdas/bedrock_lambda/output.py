@@ -0,0 +1,164 @@
+import os
+import re
+
+from .retrieval import estimate_tokens
+
+# 출력 토큰 예산: 제목/요약/해설 기본량 + 예상 독소조항 수 × 조항당 토큰
+# Bedrock은 요청 시작 시 입력 토큰 + max_tokens를 분당 토큰 한도에서 먼저 차감하므로
+# 필요 이상으로 큰 max_tokens는 실제 출력이 짧아도 동시 처리량을 줄이고 스로틀링을 앞당김
+# 기본량: 제목(~20) + 요약 2-3문장(~150) + 해설 4-6문장(~200) + JSON 키
+OUTPUT_BASE_TOKENS = int(os.getenv("OUTPUT_BASE_TOKENS", "450"))
+# 조항당: 조항 원문(~80) + 이유(~80) + 근거(~30) + 제목/키
+# (compact는 원문 대신 clauseStart, 짧은 이유)
+OUTPUT_TOKENS_PER_TOXIC = int(os.getenv("OUTPUT_TOKENS_PER_TOXIC", "220"))
+OUTPUT_TOKENS_PER_TOXIC_COMPACT = int(
+    os.getenv("OUTPUT_TOKENS_PER_TOXIC_COMPACT", "110")
+)
+# 계약서 입력 토큰 몇 개당 독소조항 하나를 예상할지 (약 2,400자, 한 페이지 분량에 하나)
+OUTPUT_INPUT_TOKENS_PER_TOXIC = int(
+    os.getenv("OUTPUT_INPUT_TOKENS_PER_TOXIC", "1200")
+)
+OUTPUT_MIN_TOXICS = 3
+OUTPUT_MAX_TOXICS = 40
+# 하한: 짧은 계약서에서도 독소조항 5개 정도(450 + 5 × 220)는 잘리지 않도록 함
+MAX_TOKENS_FLOOR = int(os.getenv("BEDROCK_MAX_TOKENS_FLOOR", "1500"))
+# 상한: 기본 모델(Claude 3.5 Sonnet)의 최대 출력 토큰은 4096
+# (기본값 기준 약 2만 토큰, 4만 자 이상의 입력에서만 도달하며 그 길이는 map-reduce 청크로 나뉨)
+MAX_TOKENS_CEILING = int(os.getenv("BEDROCK_MAX_TOKENS_CEILING", "4096"))
+
+# 요소 텍스트가 이보다 길면 clauseStart가 가리키는 문장부터 잘라서 조항으로 사용
+MAX_ELEMENT_CLAUSE_CHARS = 400
+# sourceContractTagIdx가 어긋났을 때 앞뒤로 찾아볼 요소 수
+TAG_SEARCH_RADIUS = 2
+SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?。])\s")
+
+
+def compute_max_tokens(contract_text, compact=False):
+    """계약서 길이로 예상 독소조항 수를 추정하여 응답 max_tokens를 정합니다."""
+    expected_toxics = (
+        estimate_tokens(contract_text) // OUTPUT_INPUT_TOKENS_PER_TOXIC
+    )
+    expected_toxics = max(
+        OUTPUT_MIN_TOXICS, min(OUTPUT_MAX_TOXICS, expected_toxics)
+    )
+    per_toxic = (
+        OUTPUT_TOKENS_PER_TOXIC_COMPACT if compact else OUTPUT_TOKENS_PER_TOXIC
+    )
+    max_tokens = OUTPUT_BASE_TOKENS + expected_toxics * per_toxic
+    return max(MAX_TOKENS_FLOOR, min(MAX_TOKENS_CEILING, max_tokens))
+
+
+def _squash(text):
+    return " ".join((text or "").split())
+
+
+def _as_int(value):
+    """모델이 문자열("5")로 돌려준 번호도 정수로 읽습니다 (읽을 수 없으면 None)."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _locate_element(toxic, tag_map, clause_start):
+    """sourceContractTagIdx 주변에서 clauseStart를 포함한 요소를 찾습니다."""
+    tag_idx = _as_int(toxic.get("sourceContractTagIdx"))
+    if tag_idx is not None and 0 <= tag_idx < len(tag_map):
+        if not clause_start:
+            return tag_map[tag_idx]
+        for distance in range(TAG_SEARCH_RADIUS + 1):
+            for candidate in {tag_idx - distance, tag_idx + distance}:
+                if 0 <= candidate < len(tag_map) and clause_start in _squash(
+                    tag_map[candidate]["text"]
+                ):
+                    return tag_map[candidate]
+    if clause_start:
+        for element in tag_map:
+            if clause_start in _squash(element["text"]):
+                return element
+    if tag_idx is not None and 0 <= tag_idx < len(tag_map):
+        return tag_map[tag_idx]
+    return None
+
+
+def _clause_text(element_text, clause_start):
+    """요소 텍스트에서 조항 원문을 잘라냅니다. 짧은 요소는 전체를 조항으로 사용합니다."""
+    if len(element_text) <= MAX_ELEMENT_CLAUSE_CHARS or not clause_start:
+        return element_text
+    text = _squash(element_text)
+    start = text.find(clause_start)
+    if start < 0:
+        return element_text
+    match = SENTENCE_END_PATTERN.search(text, start + len(clause_start))
+    return text[start:match.start() if match else len(text)].strip()
+
+
+def rehydrate_toxic(toxic, tag_map):
+    """compact 응답의 독소조항에 OCR 요소 텍스트로 clause 원문을 채웁니다.
+
+    sourceContractTagIdx는 정규화 요소 번호로 남으므로 restore_source_location으로 이어서 변환합니다.
+    요소 번호도 clauseStart도 쓸 수 없어 조항을 특정할 수 없으면 None을 반환합니다.
+    """
+    toxic = dict(toxic)
+    clause_start = _squash(toxic.pop("clauseStart", ""))
+    if toxic.get("clause"):
+        return toxic
+
+    element = _locate_element(toxic, tag_map, clause_start)
+    if element is None:
+        if not clause_start:
+            return None
+        toxic["clause"] = clause_start
+        return toxic
+
+    toxic["sourceContractTagIdx"] = element["tagIdx"]
+    toxic["clause"] = _clause_text(element["text"], clause_start)
+    return toxic
+
+
+def restore_source_location(toxic, tag_map):
+    """정규화 요소 번호 sourceContractTagIdx를 OCR 원본 기준으로 되돌립니다.
+
+    원본 기준은 페이지 번호(sourcePageIdx)와 Upstage 요소 id입니다.
+
+    백엔드는 sourceContractTagIdx를 OCR 결과의 요소 id로 보고 원문 위치를 표시하므로
+    정규화 입력으로 얻은 독소조항은 전송/저장 전에 모두 변환합니다. 요소 id는 페이지마다
+    다시 시작하므로 sourcePageIdx와 함께 써야 하며, 대응하는 요소가 없으면 기존 기본값인
+    0번 페이지의 0번 요소로 둡니다.
+    """
+    toxic = dict(toxic)
+    tag_idx = _as_int(toxic.get("sourceContractTagIdx"))
+    if tag_idx is None or not 0 <= tag_idx < len(tag_map):
+        toxic["sourceContractTagIdx"] = 0
+        toxic["sourcePageIdx"] = 0
+        return toxic
+
+    element = tag_map[tag_idx]
+    element_id = _as_int(element["elementId"])
+    toxic["sourceContractTagIdx"] = element_id if element_id is not None else 0
+    toxic["sourcePageIdx"] = element["pageIdx"]
+    return toxic
+
+
+def finalize_toxic(toxic, tag_map, compact=False):
+    """정규화 입력으로 얻은 독소조항을 기존 스키마로 변환합니다 (compact 응답은 조항 원문 복원 후 위치 변환).
+
+    조항을 특정할 수 없는 compact 독소조항은 None을 반환합니다.
+    """
+    if compact:
+        toxic = rehydrate_toxic(toxic, tag_map)
+        if toxic is None:
+            return None
+    return restore_source_location(toxic, tag_map)
+
+
+def finalize_toxics(analysis_result, tag_map, compact=False):
+    """analysisResult의 toxics 전체를 변환하고, 조항을 특정할 수 없는 항목은 제외합니다."""
+    toxics = [
+        finalize_toxic(toxic, tag_map, compact)
+        for toxic in analysis_result.get("toxics", []) or []
+    ]
+    toxics = [toxic for toxic in toxics if toxic is not None]
+    analysis_result["toxics"] = toxics
+    analysis_result["toxicCount"] = len(toxics)
+    return analysis_result
@@ -0,0 +1,91 @@
+import os
+import re
+import hashlib
+
+# 계약서 본문이 들어갈 자리표시자
+CONTRACT_PLACEHOLDER = "{{contract_document}}"
+
+# 언어별 프롬프트 템플릿 파일
+PROMPT_FILES = {
+    "en": "prompt.txt",
+    "ko": "prompt-ko.txt",
+}
+
+DEFAULT_LANGUAGE = os.getenv("PROMPT_LANGUAGE", "en")
+
+# compact 출력 모드에서 언어별 <output_format> 구역을 대체할 파일 (조항 원문 대신 요소 번호로 응답)
+COMPACT_OUTPUT_FILES = {
+    "en": "output-compact.txt",
+    "ko": "output-compact-ko.txt",
+}
+OUTPUT_FORMAT_PATTERN = re.compile(
+    r"<output_format>.*?</output_format>", re.DOTALL
+)
+# 계약서 앞부분에서 마지막 닫는 태그(</error_handling> 등)까지를 고정 지시문으로 취급
+INSTRUCTIONS_PATTERN = re.compile(r"^(.*</[a-z_]+>)(.*)$", re.DOTALL)
+
+
+class PromptTemplate:
+    """자리표시자 기준으로 미리 분할해 둔 프롬프트 템플릿.
+
+    렌더링 시 템플릿 전체를 다시 검색하지 않고 분할된 조각 사이에 계약서를 끼워 넣습니다.
+    """
+
+    def __init__(self, language, text):
+        self.language = language
+        self.prefix, self.suffix = text.split(CONTRACT_PLACEHOLDER, 1)
+        # 프롬프트 캐시 대상이 되는 고정 지시문과 계약서 바로 앞의 안내 문구로 다시 분할
+        match = INSTRUCTIONS_PATTERN.match(self.prefix)
+        self.instructions, self.lead_in = (
+            match.groups() if match else (self.prefix, "")
+        )
+        # 템플릿 내용이 바뀌면 버전도 바뀌므로 캐시된 분석 결과 무효화에 사용
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self.version = f"{language}-{digest[:12]}"
+
+    def render(self, contract_text):
+        return f"{self.prefix}{contract_text}{self.suffix}"
+
+    def render_parts(self, contract_text):
+        """(고정 지시문, 계약서를 포함한 나머지)로 나누어 렌더링합니다.
+
+        고정 지시문은 요청마다 동일하므로 모델 요청에서 프롬프트 캐시 체크포인트를 둘 수 있습니다.
+        """
+        return self.instructions, f"{self.lead_in}{contract_text}{self.suffix}"
+
+
+def _read_prompt_file(filename):
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(current_dir, filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _load_templates():
+    templates = {}
+    compact_templates = {}
+    for language, filename in PROMPT_FILES.items():
+        text = _read_prompt_file(filename)
+        templates[language] = PromptTemplate(language, text)
+        compact_output = _read_prompt_file(
+            COMPACT_OUTPUT_FILES[language]
+        ).strip()
+        compact_text = OUTPUT_FORMAT_PATTERN.sub(
+            lambda _: compact_output, text, count=1
+        )
+        compact_templates[language] = PromptTemplate(
+            f"{language}-compact", compact_text
+        )
+    return templates, compact_templates
+
+
+# import 시 한 번만 읽어서 warm 컨테이너에서 재사용
+PROMPT_TEMPLATES, COMPACT_PROMPT_TEMPLATES = _load_templates()
+
+
+def get_prompt_template(language=None, compact=False):
+    """언어에 맞는 프롬프트 템플릿을 반환합니다. 지원하지 않는 언어는 기본 언어로 대체합니다.
+
+    compact=True이면 독소조항 원문 대신 요소 번호와 짧은 시작 문구로 응답하는 템플릿을 반환합니다.
+    """
+    templates = COMPACT_PROMPT_TEMPLATES if compact else PROMPT_TEMPLATES
+    return templates.get(language or DEFAULT_LANGUAGE, templates["en"])
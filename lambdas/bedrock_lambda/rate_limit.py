@@ -0,0 +1,247 @@
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from lambdas.common.log import get_logger
+
+logger = get_logger("bedrock_lambda")
+
+# 재시도할 Bedrock 오류 코드 (요청량 초과/일시적 과부하)
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+}
+# 스로틀링은 아니지만 다시 시도하면 성공할 수 있는 일시적 오류 코드
+# (botocore 재시도를 끈 클라이언트에서 botocore standard 모드 대신 재시도)
+TRANSIENT_ERROR_CODES = {
+    "InternalServerException",
+    "ModelTimeoutException",
+}
+
+# 지수 백오프(full jitter) 설정
+RATE_LIMIT_MAX_ATTEMPTS = int(os.getenv("RATE_LIMIT_MAX_ATTEMPTS", "6"))
+RATE_LIMIT_BASE_DELAY_MS = int(os.getenv("RATE_LIMIT_BASE_DELAY_MS", "500"))
+RATE_LIMIT_MAX_DELAY_MS = int(os.getenv("RATE_LIMIT_MAX_DELAY_MS", "20000"))
+# 대기 후에도 이만큼의 실행 시간이 남아 있을 때만 재시도 (모델 응답 시간과 응답 반환 여유)
+RATE_LIMIT_TIME_RESERVE_MS = int(
+    os.getenv("RATE_LIMIT_TIME_RESERVE_MS", "30000")
+)
+
+# 호출 대상(모델 ID 등)별 동시 호출 수: 시작값과 상한, 대상별 상한 지정 ("model_id=4,other_model=2")
+RATE_LIMIT_INITIAL_CONCURRENCY = int(
+    os.getenv("RATE_LIMIT_INITIAL_CONCURRENCY", "4")
+)
+RATE_LIMIT_MAX_CONCURRENCY = int(os.getenv("RATE_LIMIT_MAX_CONCURRENCY", "8"))
+
+
+def _parse_limits(value):
+    limits = {}
+    for item in value.split(","):
+        key, _, limit = item.strip().rpartition("=")
+        if key and limit.isdigit():
+            limits[key] = max(1, int(limit))
+    return limits
+
+
+RATE_LIMIT_CONCURRENCY = _parse_limits(os.getenv("RATE_LIMIT_CONCURRENCY", ""))
+
+
+class ThrottledError(Exception):
+    """재시도 횟수나 남은 실행 시간을 모두 써도 스로틀링이 풀리지 않았을 때 발생합니다."""
+
+
+def _error_code(error):
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return None
+    return response.get("Error", {}).get("Code")
+
+
+def is_throttling_error(error):
+    """botocore ClientError의 오류 코드로 재시도할 스로틀링 오류인지 판단합니다."""
+    return _error_code(error) in THROTTLING_ERROR_CODES
+
+
+def is_transient_error(error):
+    """서버 오류나 연결/읽기 시간 초과처럼 스로틀링 외에 재시도할 오류인지 판단합니다."""
+    if _error_code(error) in TRANSIENT_ERROR_CODES:
+        return True
+    from botocore.exceptions import ConnectionError, ReadTimeoutError
+
+    return isinstance(error, (ConnectionError, ReadTimeoutError))
+
+
+class AimdLimiter:
+    """동시 호출 수를 AIMD로 조절하는 제한기.
+
+    성공할 때마다 한도를 조금씩(1/한도) 늘리고, 스로틀링되면 절반으로 줄입니다.
+    """
+
+    def __init__(self, name, initial, maximum):
+        self.name = name
+        self.maximum = maximum
+        self.limit = float(max(1, min(initial, maximum)))
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout=None):
+        """호출 슬롯을 얻습니다. timeout(초) 안에 얻지 못하면 False를 반환합니다."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                remaining = (
+                    None if deadline is None else deadline - time.monotonic()
+                )
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            self.in_flight += 1
+            return True
+
+    def release(self, throttled=False):
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(1.0, self.limit / 2)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class RateLimiter:
+    """호출 대상별 AIMD 동시성 제한과 지수 백오프 재시도를 적용합니다.
+
+    컨테이너 안의 동시 호출(map-reduce 청크, 병렬 검색)은 제한기가 조절하고,
+    다른 Lambda 인스턴스와의 경합으로 생긴 스로틀링은 남은 실행 시간 안에서 백오프 재시도로 흡수합니다.
+    일시적 오류(is_transient_error)도 같은 백오프로 재시도하되 동시성 한도는 줄이지 않습니다.
+    """
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self._limiters = {}
+        self._lock = threading.Lock()
+        self._deadline = None
+
+    def set_deadline(self, context):
+        """호출마다 Lambda의 남은 실행 시간으로 재시도 마감 시각을 정합니다 (context가 없으면 제한 없음)."""
+        get_remaining = getattr(context, "get_remaining_time_in_millis", None)
+        self._deadline = (
+            time.monotonic() + get_remaining() / 1000
+            if get_remaining
+            else None
+        )
+
+    def remaining_ms(self):
+        if self._deadline is None:
+            return None
+        return (self._deadline - time.monotonic()) * 1000
+
+    def limiter(self, key):
+        with self._lock:
+            if key not in self._limiters:
+                maximum = RATE_LIMIT_CONCURRENCY.get(
+                    key, RATE_LIMIT_MAX_CONCURRENCY
+                )
+                self._limiters[key] = AimdLimiter(
+                    key, min(RATE_LIMIT_INITIAL_CONCURRENCY, maximum), maximum
+                )
+            return self._limiters[key]
+
+    def _budget_seconds(self):
+        remaining = self.remaining_ms()
+        if remaining is None:
+            return None
+        return max(0.0, (remaining - RATE_LIMIT_TIME_RESERVE_MS) / 1000)
+
+    def call(self, key, fn, *args, **kwargs):
+        """fn을 key의 동시성 제한 안에서 호출하고, 스로틀링/일시적 오류면 백오프 후 재시도합니다.
+
+        스로틀링이 끝내 풀리지 않으면 ThrottledError를, 일시적 오류가 계속되면 마지막 오류를 그대로 던집니다.
+        """
+        return self._call(self.limiter(key), key, fn, args, kwargs, False)
+
+    @contextmanager
+    def hold(self, key, fn, *args, **kwargs):
+        """call과 같이 fn을 호출하되, 호출 슬롯을 with 블록이 끝날 때까지 유지합니다.
+
+        스트림 응답처럼 호출이 반환된 뒤에도 모델이 계속 생성하는 경우 본문을 끝까지 읽는 동안
+        동시 호출 수에 포함되도록 사용합니다. 블록 안의 오류는 재시도하지 않습니다.
+        """
+        limiter = self.limiter(key)
+        result = self._call(limiter, key, fn, args, kwargs, True)
+        throttled = False
+        try:
+            yield result
+        except Exception as e:
+            throttled = is_throttling_error(e)
+            raise
+        finally:
+            limiter.release(throttled)
+
+    def _call(self, limiter, key, fn, args, kwargs, keep_slot):
+        for attempt in range(1, RATE_LIMIT_MAX_ATTEMPTS + 1):
+            started = time.perf_counter()
+            acquired = limiter.acquire(self._budget_seconds())
+            self.metrics.record_time(
+                "rate_limit_wait", (time.perf_counter() - started) * 1000
+            )
+            if not acquired:
+                self.metrics.incr("throttle_giveups")
+                raise ThrottledError(
+                    f"{key} 호출 슬롯 대기 중 실행 시간이 부족합니다"
+                )
+
+            throttled = False
+            succeeded = False
+            try:
+                result = fn(*args, **kwargs)
+                succeeded = True
+                return result
+            except Exception as e:
+                if is_throttling_error(e):
+                    throttled = True
+                    self.metrics.incr("throttles")
+                elif is_transient_error(e):
+                    self.metrics.incr("transient_errors")
+                else:
+                    raise
+                error = e
+            finally:
+                # keep_slot이면 성공한 호출의 슬롯은 호출부(hold)가 반환
+                if not (succeeded and keep_slot):
+                    limiter.release(throttled)
+
+            delay_ms = random.uniform(
+                0,
+                min(
+                    RATE_LIMIT_MAX_DELAY_MS,
+                    RATE_LIMIT_BASE_DELAY_MS * 2 ** (attempt - 1),
+                ),
+            )
+            remaining = self.remaining_ms()
+            if attempt == RATE_LIMIT_MAX_ATTEMPTS or (
+                remaining is not None
+                and remaining - delay_ms < RATE_LIMIT_TIME_RESERVE_MS
+            ):
+                if not throttled:
+                    raise error
+                self.metrics.incr("throttle_giveups")
+                raise ThrottledError(
+                    f"{key} 스로틀링 재시도 한도 초과 ({attempt}회)"
+                ) from error
+
+            reason = "스로틀링" if throttled else f"일시적 오류({error})"
+            logger.warning(
+                f"[THROTTLE] {key} {reason} - {delay_ms:.0f}ms 후 재시도 "
+                f"({attempt}/{RATE_LIMIT_MAX_ATTEMPTS})",
+                concurrency_limit=round(limiter.limit, 2),
+            )
+            self.metrics.incr(
+                "throttle_retries" if throttled else "transient_retries"
+            )
+            self.metrics.record_time("throttle_backoff", delay_ms)
+            time.sleep(delay_ms / 1000)
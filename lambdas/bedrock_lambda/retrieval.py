@@ -0,0 +1,111 @@
+import re
+import html
+import math
+
+HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+# "Page N:" 페이지 머리말과 "---" 페이지 구분선
+PAGE_MARKER_PATTERN = re.compile(r"^(Page \d+:|---)$")
+# 정규화 입력의 요소 번호 표시 (예: "[12] 제3조 ...")
+ELEMENT_MARKER_PATTERN = re.compile(r"^\[\d+\]\s*")
+# 줄 맨 앞의 조항 머리말 (예: "제 3 조", "제12조(목적)") - 본문 속 "제3조에 따라" 같은 참조는 제외
+CLAUSE_HEADING_PATTERN = re.compile(
+    r"^(?=제\s*\d+\s*조(?:[\s(\[【（:.]|$))", re.MULTILINE
+)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# 검색 쿼리로 쓰기에 너무 짧은 조각은 제외
+MIN_CLAUSE_CHARS = 20
+
+
+def contract_to_plain_text(contract_text):
+    """OCR HTML 계약서에서 태그, 페이지 구분자, 정규화 요소 번호를 제거한 평문을 반환합니다."""
+    text = html.unescape(HTML_TAG_PATTERN.sub("\n", contract_text))
+    lines = [
+        ELEMENT_MARKER_PATTERN.sub("", line.strip())
+        for line in text.splitlines()
+    ]
+    return "\n".join(
+        line for line in lines if line and not PAGE_MARKER_PATTERN.match(line)
+    )
+
+
+def build_retrieval_queries(contract_text, max_queries=8, max_query_chars=500):
+    """계약서를 조항 단위 검색 쿼리 목록으로 나눕니다.
+
+    "제N조" 머리말이 있으면 조항 단위로, 없으면 줄 단위로 나누고,
+    조각 수가 max_queries를 넘으면 인접 조각을 묶어 쿼리 수를 맞춥니다.
+    """
+    plain_text = contract_to_plain_text(contract_text)
+    if CLAUSE_HEADING_PATTERN.search(plain_text):
+        parts = CLAUSE_HEADING_PATTERN.split(plain_text)
+    else:
+        parts = plain_text.splitlines()
+
+    clauses = [WHITESPACE_PATTERN.sub(" ", part).strip() for part in parts]
+    clauses = [clause for clause in clauses if len(clause) >= MIN_CLAUSE_CHARS]
+    if not clauses:
+        return []
+
+    group_size = math.ceil(len(clauses) / max_queries)
+    return [
+        " ".join(clauses[i:i + group_size])[:max_query_chars]
+        for i in range(0, len(clauses), group_size)
+    ]
+
+
+def _result_uri(result):
+    return (
+        result.get("location", {}).get("s3Location", {}).get("uri", "Unknown")
+    )
+
+
+def merge_retrieval_results(result_lists):
+    """여러 쿼리의 retrievalResults를 합쳐 점수순으로 정렬합니다.
+
+    (S3 URI, 내용)이 같은 결과는 가장 높은 점수만 남깁니다.
+    """
+    merged = {}
+    for results in result_lists:
+        for result in results:
+            key = (
+                _result_uri(result),
+                result.get("content", {}).get("text", ""),
+            )
+            if key not in merged or result.get("score", 0) > merged[key].get(
+                "score", 0
+            ):
+                merged[key] = result
+    return sorted(
+        merged.values(),
+        key=lambda result: result.get("score", 0),
+        reverse=True,
+    )
+
+
+def estimate_tokens(text):
+    """토큰 수 근사치 (한국어 위주 텍스트 기준 약 2자당 1토큰)."""
+    return math.ceil(len(text) / 2)
+
+
+def build_knowledge_context(retrieval_results, token_budget):
+    """점수순 검색 결과를 토큰 예산 안에서 참고 문서 텍스트로 변환합니다.
+
+    (context, 사용된 결과 목록)을 반환합니다.
+    """
+    knowledge_context = ""
+    used_results = []
+    used_tokens = 0
+    for result in retrieval_results:
+        content = result.get("content", {}).get("text", "")
+        block = f"\n--- 참고 문서 {len(used_results) + 1} ---\n"
+        block += f"출처: {_result_uri(result)}\n"
+        block += f"내용: {content}\n"
+
+        block_tokens = estimate_tokens(block)
+        if used_results and used_tokens + block_tokens > token_budget:
+            break
+        knowledge_context += block
+        used_results.append(result)
+        used_tokens += block_tokens
+
+    return knowledge_context, used_results
@@ -0,0 +1,12 @@
+import re
+import hashlib
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def make_retrieval_cache_key(knowledge_base_id, query):
+    """지식 기반 ID와 정규화된 쿼리 텍스트(공백 정리, 소문자)로 캐시 키를 만듭니다."""
+    normalized_query = WHITESPACE_PATTERN.sub(" ", query).strip().lower()
+    return hashlib.sha256(
+        f"{knowledge_base_id}\n{normalized_query}".encode("utf-8")
+    ).hexdigest()
@@ -0,0 +1,71 @@
+import re
+
+# 1차 선별(저비용 모델) 프롬프트: 정밀 분석이 필요한 요소 번호만 고르게 함
+SCREEN_PROMPT = """당신은 계약서 독소조항 1차 선별기입니다.
+아래 계약서의 각 요소는 "[번호]"로 시작합니다. 한쪽 당사자에게 불리하거나 책임, 손해배상, 위약금, 해지,
+권리 포기, 비밀유지, 개인정보, 모호한 조건 등과 관련되어 정밀 검토가 필요할 수 있는 요소의 번호를 모두 골라주세요.
+확실하지 않으면 포함하세요. 당사자 정보, 서명란, 단순 정의처럼 일반적인 내용은 제외합니다.
+
+<contract_document>
+{contract}
+</contract_document>
+
+다음 JSON 형식으로만 응답해주세요:
+{{
+  "title": "계약서 유형과 목적을 반영한 제목 (3-10 단어)",
+  "summary": "계약서 핵심 내용 요약 (2-3 문장)",
+  "suspicious": [정밀 검토가 필요한 요소 번호, ...]
+}}"""
+
+# 정규화 텍스트의 요소 줄 시작 "[12] ..." / 표 요소 "[12]\n| ..."
+ELEMENT_LINE_PATTERN = re.compile(r"^\[(\d+)\]")
+
+
+def build_screen_prompt(contract_text):
+    return SCREEN_PROMPT.format(contract=contract_text)
+
+
+def parse_suspicious(screen_result, element_count):
+    """선별 응답에서 유효한 요소 번호 집합을 꺼냅니다."""
+    suspicious = set()
+    for value in screen_result.get("suspicious", []) or []:
+        try:
+            idx = int(value)
+        except (TypeError, ValueError):
+            continue
+        if 0 <= idx < element_count:
+            suspicious.add(idx)
+    return suspicious
+
+
+def expand_selection(
+    suspicious, element_count, context_radius, header_elements
+):
+    """선별된 요소 앞뒤 context_radius개와 문서 앞부분(당사자/제목) header_elements개를 포함시킵니다."""
+    selected = set(range(min(header_elements, element_count)))
+    for idx in suspicious:
+        for neighbor in range(idx - context_radius, idx + context_radius + 1):
+            if 0 <= neighbor < element_count:
+                selected.add(neighbor)
+    return selected
+
+
+def select_pages(normalized_pages, selected):
+    """정규화된 페이지 텍스트에서 선택된 요소만 남깁니다.
+
+    요소 번호([N])와 페이지 순서는 그대로 유지하므로 정밀 분석 결과의 sourceContractTagIdx는
+    문서 전체 기준 번호로 남습니다. 선택된 요소가 없는 페이지는 빈 문자열이 됩니다.
+    """
+    pages = []
+    for page_text in normalized_pages:
+        kept = []
+        keep_current = False
+        for line in page_text.split("\n"):
+            match = ELEMENT_LINE_PATTERN.match(line)
+            if match:
+                keep_current = int(match.group(1)) in selected
+            # 표 요소는 여러 줄이므로 요소 시작 줄의 선택 여부를 이어받음
+            if keep_current:
+                kept.append(line)
+        pages.append("\n".join(kept))
+    return pages
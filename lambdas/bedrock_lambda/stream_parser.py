@@ -0,0 +1,87 @@
+import re
+import json
+
+# 응답 JSON에서 toxics 배열 시작 위치를 찾기 위한 패턴
+TOXICS_ARRAY_PATTERN = re.compile(r'"toxics"\s*:\s*\[')
+
+
+class ToxicsStreamParser:
+    """스트리밍으로 들어오는 모델 응답에서 toxics 배열의 항목을 완성되는 즉시 추출합니다.
+
+    전체 응답을 다시 파싱하지 않고 마지막으로 검사한 위치부터 이어서
+    문자열/이스케이프를 고려한 중괄호 깊이만 추적합니다.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.state = "seek_array"
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.object_start = None
+        self.count = 0
+
+    def feed(self, text):
+        """텍스트 조각을 추가하고, 새로 완성된 독소조항 dict 목록을 반환합니다."""
+        self.buffer += text
+        completed = []
+
+        if self.state == "seek_array":
+            match = TOXICS_ARRAY_PATTERN.search(
+                self.buffer, max(0, self.pos - 32)
+            )
+            if not match:
+                # 키가 조각 경계에 걸쳐 있을 수 있으므로 끝부분은 다음에 다시 검사
+                self.pos = len(self.buffer)
+                return completed
+            self.pos = match.end()
+            self.state = "in_array"
+
+        while self.state == "in_array" and self.pos < len(self.buffer):
+            char = self.buffer[self.pos]
+
+            if self.depth == 0:
+                if char == "{":
+                    self.depth = 1
+                    self.object_start = self.pos
+                elif char == "]":
+                    self.state = "done"
+            elif self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == "\\":
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{":
+                self.depth += 1
+            elif char == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    toxic = self._parse_object(
+                        self.buffer[self.object_start:self.pos + 1]
+                    )
+                    if toxic is not None:
+                        completed.append(toxic)
+                        self.count += 1
+                    self.object_start = None
+
+            self.pos += 1
+
+        return completed
+
+    @staticmethod
+    def _parse_object(object_text):
+        try:
+            return json.loads(object_text)
+        except json.JSONDecodeError:
+            # 깨진 항목에서만 필요하므로 이때 import
+            from json_repair import repair_json
+
+            repaired = json.loads(repair_json(object_text))
+            return (
+                repaired if isinstance(repaired, dict) and repaired else None
+            )
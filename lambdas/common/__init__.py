@@ -0,0 +1 @@
+# Lambda 공용 유틸리티
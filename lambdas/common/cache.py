@@ -0,0 +1,127 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+from lambdas.common.log import get_logger
+
+logger = get_logger("cache")
+
+
+class S3JsonStore:
+    """S3 prefix 아래에 키별 JSON 객체로 저장하는 저장소 (여러 컨테이너가 공유하는 캐시 계층용).
+
+    없는 키는 None을 반환하고, 그 밖의 S3 오류는 호출한 캐시에서 처리하도록 그대로 전달합니다.
+    """
+
+    def __init__(self, s3_client, bucket, prefix=""):
+        self.s3 = s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _object_key(self, key):
+        return f"{self.prefix}{key}.json"
+
+    def get(self, key):
+        try:
+            response = self.s3.get_object(
+                Bucket=self.bucket, Key=self._object_key(key)
+            )
+        except self.s3.exceptions.NoSuchKey:
+            return None
+        return json.loads(response["Body"].read())
+
+    def put(self, key, payload):
+        self.s3.put_object(
+            Bucket=self.bucket,
+            Key=self._object_key(key),
+            Body=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+            ContentType="application/json",
+        )
+
+
+class TTLCache:
+    """warm 컨테이너용 프로세스 내 LRU 캐시 (선택적 TTL과 공유 영구 계층).
+
+    프로세스 내 LRU를 먼저 확인하고, 설정된 경우 영구 계층(S3JsonStore 등)을 확인합니다.
+    영구 계층 오류는 miss로 처리하여 캐시를 쓰는 작업 자체를 실패시키지 않습니다.
+    ttl_seconds가 None이면 항목이 만료되지 않고 LRU 한도로만 밀려납니다.
+    """
+
+    def __init__(
+        self, name, ttl_seconds=None, max_entries=128, persistent_tier=None
+    ):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.persistent_tier = persistent_tier
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {"hits": 0, "persistent_hits": 0, "misses": 0}
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    @staticmethod
+    def _is_live(entry, now):
+        if not isinstance(entry, dict) or "value" not in entry:
+            return False
+        return entry.get("expires_at") is None or entry["expires_at"] > now
+
+    def _put_local(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._is_live(entry, now):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry["value"]
+
+        if self.persistent_tier is not None:
+            try:
+                entry = self.persistent_tier.get(key)
+            except Exception as e:
+                logger.warning(f"[CACHE] {self.name} 캐시 읽기 실패: {str(e)}")
+                entry = None
+            # 형식이 다른(이전 버전) 항목도 miss로 처리
+            if entry is not None and self._is_live(entry, now):
+                self._put_local(key, entry)
+                self._count("persistent_hits")
+                return entry["value"]
+
+        self._count("misses")
+        return None
+
+    def put(self, key, value):
+        expires_at = (
+            None
+            if self.ttl_seconds is None
+            else time.time() + self.ttl_seconds
+        )
+        entry = {"expires_at": expires_at, "value": value}
+        self._put_local(key, entry)
+
+        if self.persistent_tier is not None:
+            try:
+                self.persistent_tier.put(key, entry)
+            except Exception as e:
+                logger.warning(f"[CACHE] {self.name} 캐시 쓰기 실패: {str(e)}")
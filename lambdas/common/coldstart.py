@@ -0,0 +1,134 @@
+import os
+import sys
+import time
+import threading
+import importlib.util
+from typing import Any
+
+# provisioned concurrency 환경에서 초기화(init) 단계에 클라이언트/연결을 미리 만들지 여부
+# (init 시간은 요청 지연에 포함되지 않으므로 켜 두면 첫 요청이 빨라짐)
+EAGER_INIT = os.getenv("LAMBDA_EAGER_INIT", "false").lower() == "true"
+
+# 호출 이벤트로 보내는 워밍업 신호: {"warmup": true}
+WARMUP_EVENT_KEY = "warmup"
+
+# (service_name, region_name, max_attempts) -> boto3 클라이언트
+_clients: dict[tuple, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def load_local_env(module_file):
+    """모듈과 같은 디렉터리에 .env가 있을 때만 python-dotenv를 불러와 읽습니다.
+
+    Lambda 배포 이미지에는 .env가 없으므로 dotenv import 자체를 건너뜁니다.
+    """
+    dotenv_path = os.path.join(os.path.dirname(module_file), ".env")
+    if not os.path.exists(dotenv_path):
+        return False
+    from dotenv import load_dotenv
+
+    return load_dotenv(dotenv_path=dotenv_path)
+
+
+def get_client(service_name, region_name=None, max_attempts=None):
+    """boto3 클라이언트를 처음 요청될 때 만들고 프로세스 안에서 재사용합니다 (boto3 import도 이때 수행).
+
+    max_attempts를 주면 botocore 재시도 횟수(첫 시도 포함)를 그 값으로 제한합니다.
+    호출부가 자체 재시도를 가진 경우 1로 두어 재시도가 겹치지 않게 합니다.
+    """
+    key = (service_name, region_name, max_attempts)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _clients_lock:
+        if key not in _clients:
+            import boto3
+
+            options = {}
+            if max_attempts is not None:
+                from botocore.config import Config
+
+                options["config"] = Config(
+                    retries={
+                        "mode": "standard",
+                        "total_max_attempts": max_attempts,
+                    }
+                )
+            _clients[key] = boto3.client(
+                service_name=service_name, region_name=region_name, **options
+            )
+        return _clients[key]
+
+
+class LazyClient:
+    """첫 속성 접근 시 boto3 클라이언트를 만드는 대리 객체.
+
+    모듈 레벨 변수(s3, bedrock_runtime 등)를 그대로 두고 호출부를 바꾸지 않으면서
+    import 시점의 클라이언트 생성 비용을 첫 사용 시점으로 미룹니다.
+    """
+
+    def __init__(self, service_name, region_name=None, max_attempts=None):
+        self.service_name = service_name
+        self.region_name = region_name
+        self.max_attempts = max_attempts
+
+    def resolve(self):
+        return get_client(
+            self.service_name, self.region_name, self.max_attempts
+        )
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+
+def lazy_client(service_name, region_name=None, max_attempts=None):
+    return LazyClient(service_name, region_name, max_attempts)
+
+
+def lazy_import(name):
+    """모듈 객체는 바로 반환하되 실제 로딩은 첫 속성 접근 때 수행합니다 (importlib.util.LazyLoader).
+
+    psycopg2처럼 무거운 모듈을 모듈 레벨 이름으로 유지하면서 import 비용을 미룰 때 사용합니다.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def is_warmup_event(event):
+    return isinstance(event, dict) and event.get(WARMUP_EVENT_KEY) is True
+
+
+def warm_up(steps):
+    """워밍업 단계(이름, callable)를 차례로 실행하고 단계별 소요 시간(ms)을 반환합니다.
+
+    실패한 단계는 오류 메시지만 기록하고 나머지 단계를 계속 진행합니다.
+    """
+    results = {}
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            step()
+            results[name] = {"ok": True}
+        except Exception as e:
+            results[name] = {"ok": False, "error": str(e)}
+        results[name]["ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return results
+
+
+def warmup_response(steps):
+    """워밍업 이벤트에 대한 공통 응답 형식."""
+    results = warm_up(steps)
+    return {
+        "success": all(result["ok"] for result in results.values()),
+        "message": "warmed up",
+        "data": {"warmup": results},
+    }
@@ -0,0 +1,137 @@
+import os
+import json
+import random
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+# 로그 레벨 (DEBUG, INFO, WARNING, ERROR)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# 페이로드(이벤트/응답 전문) 로그 한 건의 최대 길이
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "2000"))
+# 페이로드 전문을 남길 호출 비율 (0이면 남기지 않음, 1이면 항상)
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+
+# 페이로드 축약 기준: 문자열 길이, dict/list 항목 수, 중첩 깊이
+PAYLOAD_MAX_STRING_CHARS = 200
+PAYLOAD_MAX_ITEMS = 20
+PAYLOAD_MAX_DEPTH = 6
+
+
+def shrink_payload(value, depth=0):
+    """직렬화 전에 긴 문자열(OCR HTML, base64 등)과 큰 목록을 잘라 직렬화 비용을 제한합니다."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        if len(value) <= PAYLOAD_MAX_STRING_CHARS:
+            return value
+        omitted = len(value) - PAYLOAD_MAX_STRING_CHARS
+        return f"{value[:PAYLOAD_MAX_STRING_CHARS]}...(+{omitted} chars)"
+    if isinstance(value, (bytes, bytearray)):
+        return f"<{len(value)} bytes>"
+    if depth >= PAYLOAD_MAX_DEPTH:
+        return "<...>"
+    if isinstance(value, dict):
+        items = list(value.items())
+        shrunk = {
+            str(key): shrink_payload(item, depth + 1)
+            for key, item in items[:PAYLOAD_MAX_ITEMS]
+        }
+        if len(items) > PAYLOAD_MAX_ITEMS:
+            shrunk["..."] = f"+{len(items) - PAYLOAD_MAX_ITEMS} keys"
+        return shrunk
+    if isinstance(value, (list, tuple)):
+        shrunk = [
+            shrink_payload(item, depth + 1)
+            for item in value[:PAYLOAD_MAX_ITEMS]
+        ]
+        if len(value) > PAYLOAD_MAX_ITEMS:
+            shrunk.append(f"...(+{len(value) - PAYLOAD_MAX_ITEMS} items)")
+        return shrunk
+    return shrink_payload(repr(value), depth + 1)
+
+
+def render_payload(payload, max_chars):
+    """페이로드(또는 페이로드를 반환하는 함수)를 축약합니다.
+
+    축약 후에도 max_chars를 넘으면 잘린 JSON 문자열을, 아니면 축약된 값을 그대로 반환합니다.
+    """
+    if callable(payload):
+        payload = payload()
+    shrunk = shrink_payload(payload)
+    text = json.dumps(shrunk, ensure_ascii=False, default=str)
+    if len(text) > max_chars:
+        return f"{text[:max_chars]}...(+{len(text) - max_chars} chars)"
+    return shrunk
+
+
+class StructuredLogger:
+    """CloudWatch에 한 줄 JSON으로 기록하는 경량 로거.
+
+    payload()로 넘긴 이벤트/응답 전문은 레벨이 켜져 있고 샘플링에 걸린 경우에만
+    축약·직렬화하므로, 로그가 꺼져 있으면 직렬화 비용이 들지 않습니다.
+    """
+
+    def __init__(
+        self,
+        name,
+        level=None,
+        payload_max_chars=None,
+        payload_sample_rate=None,
+    ):
+        self.name = name
+        self.level = LEVELS.get((level or LOG_LEVEL).upper(), LEVELS["INFO"])
+        self.payload_max_chars = (
+            payload_max_chars
+            if payload_max_chars is not None
+            else LOG_PAYLOAD_MAX_CHARS
+        )
+        self.payload_sample_rate = (
+            payload_sample_rate
+            if payload_sample_rate is not None
+            else LOG_PAYLOAD_SAMPLE_RATE
+        )
+
+    def is_enabled(self, level):
+        return LEVELS[level] >= self.level
+
+    def _emit(self, level, message, fields):
+        record = {"level": level, "logger": self.name, "message": message}
+        record.update(fields)
+        print(json.dumps(record, ensure_ascii=False, default=str))
+
+    def log(self, level, message, **fields):
+        if self.is_enabled(level):
+            self._emit(level, message, fields)
+
+    def debug(self, message, **fields):
+        self.log("DEBUG", message, **fields)
+
+    def info(self, message, **fields):
+        self.log("INFO", message, **fields)
+
+    def warning(self, message, **fields):
+        self.log("WARNING", message, **fields)
+
+    def error(self, message, **fields):
+        self.log("ERROR", message, **fields)
+
+    def payload(
+        self, message, payload, level="INFO", sample_rate=None, **fields
+    ):
+        """페이로드 전문을 지연 렌더링하여 기록합니다.
+
+        payload에는 값 또는 값을 반환하는 함수를 넘깁니다. 레벨이 꺼져 있거나
+        샘플링에서 제외되면 아무것도 직렬화하지 않습니다.
+        """
+        if not self.is_enabled(level):
+            return
+        rate = self.payload_sample_rate if sample_rate is None else sample_rate
+        if rate < 1 and random.random() >= rate:
+            return
+        fields["payload"] = render_payload(payload, self.payload_max_chars)
+        self._emit(level, message, fields)
+
+
+def get_logger(name):
+    """Lambda 패키지별 구조화 로거를 반환합니다."""
+    return StructuredLogger(name)
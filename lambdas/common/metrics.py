@@ -0,0 +1,112 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+# CloudWatch 메트릭 네임스페이스 (METRICS_ENABLED=false이면 EMF 로그를 남기지 않음)
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "DDOBAK/Lambda")
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+
+class Metrics:
+    """호출 단위로 단계별 소요 시간과 카운터를 모으고 CloudWatch EMF 로그로 내보내는 계측기.
+
+    여러 스레드(페이지 병렬 OCR, 병렬 검색 등)에서 동시에 기록해도 안전합니다.
+    호출 시작 시 reset(), 종료 시 summary()를 응답 metadata에 붙이고 emit()을 호출합니다.
+    """
+
+    def __init__(self, service, namespace=None):
+        self.service = service
+        self.namespace = namespace or METRICS_NAMESPACE
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._timings = {}
+            self._counters = {}
+            self._started = time.perf_counter()
+
+    @contextmanager
+    def timer(self, name):
+        """with 블록의 소요 시간(ms)을 name 단계에 누적합니다 (예외가 나도 기록)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_time(name, (time.perf_counter() - started) * 1000)
+
+    def record_time(self, name, elapsed_ms):
+        with self._lock:
+            timing = self._timings.setdefault(
+                name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            timing["count"] += 1
+            timing["total_ms"] += elapsed_ms
+            timing["max_ms"] = max(timing["max_ms"], elapsed_ms)
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def add_usage(self, usage, prefix=""):
+        """Bedrock 응답의 usage 블록에서 입력/출력 토큰 수를 누적합니다 (prefix로 모델 단계별 구분)."""
+        for key, value in (usage or {}).items():
+            if key.endswith("_tokens") and isinstance(value, int):
+                self.incr(f"{prefix}{key}", value)
+
+    def summary(self):
+        """응답 metadata에 붙일 요약 (단계별 횟수/합계/최대 ms, 카운터, 전체 소요 시간)."""
+        with self._lock:
+            return {
+                "duration_ms": round(
+                    (time.perf_counter() - self._started) * 1000, 1
+                ),
+                "timings": {
+                    name: {
+                        "count": timing["count"],
+                        "total_ms": round(timing["total_ms"], 1),
+                        "max_ms": round(timing["max_ms"], 1),
+                    }
+                    for name, timing in self._timings.items()
+                },
+                "counters": dict(self._counters),
+            }
+
+    def emit(self, **dimensions):
+        """요약을 CloudWatch Embedded Metric Format 한 줄로 출력합니다."""
+        if not METRICS_ENABLED:
+            return
+        summary = self.summary()
+        values = {"duration_ms": summary["duration_ms"]}
+        units = {"duration_ms": "Milliseconds"}
+        for name, timing in summary["timings"].items():
+            values[f"{name}_ms"] = timing["total_ms"]
+            units[f"{name}_ms"] = "Milliseconds"
+        for name, value in summary["counters"].items():
+            values[name] = value
+            units[name] = "Count"
+
+        dimension_values = {
+            "Service": self.service,
+            **{key: str(value) for key, value in dimensions.items()},
+        }
+        record = {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": self.namespace,
+                        "Dimensions": [list(dimension_values.keys())],
+                        "Metrics": [
+                            {"Name": name, "Unit": unit}
+                            for name, unit in units.items()
+                        ],
+                    }
+                ],
+            },
+            **dimension_values,
+            **values,
+        }
+        print(json.dumps(record, ensure_ascii=False))
@@ -1,33 +1,51 @@
-import boto3
-import requests
 import os
 import io
-import logging
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from .ocr_client import UpstageOCRClient
+from .ocr_cache import create_ocr_cache, content_md5, make_cache_key
+from .image_preprocess import downscale_image
+from lambdas.common.log import get_logger
+from lambdas.common.metrics import Metrics
+from lambdas.common.coldstart import (
+    EAGER_INIT,
+    lazy_client,
+    load_local_env,
+    is_warmup_event,
+    warm_up,
+    warmup_response,
+)
 
-# CloudWatch 로깅 설정
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+# CloudWatch 구조화 로깅 (LOG_LEVEL, LOG_PAYLOAD_SAMPLE_RATE로 조절)
+logger = get_logger("ocr_lambda")
+
+# 호출 단위 단계별 소요 시간/카운터 (응답 metadata와 CloudWatch EMF로 출력)
+metrics = Metrics("ocr_lambda")
 
 # 코드랑 같은 디렉터리에 .env
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env'))
+load_local_env(__file__)
 
-s3 = boto3.client("s3")
+# 클라이언트는 첫 사용 시 생성 (boto3 import 포함)
+s3 = lazy_client("s3")
 
-def lambda_handler(event, context):
-    bucket = os.environ["S3_BUCKET"]
-    key = event["s3Key"]
-    page_num = event["pageIdx"]
+# warm 컨테이너에서 커넥션 풀을 재사용하기 위한 모듈 레벨 OCR 클라이언트
+ocr_client = UpstageOCRClient()
+
+# 동일 이미지 재업로드 시 OCR 재호출을 피하기 위한 결과 캐시 (OCR_CACHE_BACKEND=none이면 비활성)
+ocr_cache = create_ocr_cache(s3)
+
+# 배치 모드에서 동시에 처리할 최대 페이지 수
+OCR_MAX_WORKERS = int(os.getenv("OCR_MAX_WORKERS", "4"))
 
+# 업로드 전 이미지 축소 기준 (긴 변 픽셀 수, 0이면 축소하지 않고 S3 본문을 그대로 스트리밍)
+OCR_MAX_IMAGE_DIMENSION = int(os.getenv("OCR_MAX_IMAGE_DIMENSION", "0"))
+OCR_JPEG_QUALITY = int(os.getenv("OCR_JPEG_QUALITY", "85"))
+
+
+def process_page(bucket, key, page_num):
+    """단일 페이지 이미지를 S3에서 내려받아 OCR을 수행합니다."""
     logger.info(f"Processing OCR for key: {key}, page: {page_num}")
 
     try:
-        # Download the image from S3
-        response = s3.get_object(Bucket=bucket, Key=key)
-        image_content = response["Body"].read()
-
-        # Create file-like object from bytes
-        image_file = io.BytesIO(image_content)
         filename = key.split("/")[-1]
 
         # Determine content type from file extension
@@ -38,20 +56,92 @@ def lambda_handler(event, context):
             return {"error": f"Unsupported file type: {file_ext}. Only jpg/jpeg files are supported."}
 
         # Process with Upstage OCR
-        api_key = os.environ["UPSTAGE_API_KEY"]
-        url = "https://api.upstage.ai/v1/document-digitization"
-        headers = {"Authorization": f"Bearer {api_key}"}
-        files = {"document": image_file}
         data = {"ocr": "force", "base64_encoding": "['table']", "model": "document-parse"}
 
-        response = requests.post(url, headers=headers, files=files, data=data)
+        # Download the image from S3 (본문은 스트림으로 두고 필요할 때만 메모리에 올림)
+        # 스트리밍 시 s3_get은 응답 헤더까지의 시간이며, 본문 전송은 upstage_post에 포함됨
+        with metrics.timer("s3_get"):
+            response = s3.get_object(Bucket=bucket, Key=key)
+        body = response["Body"]
+        etag = response.get("ETag", "").strip('"')
+        # 멀티파트 업로드 객체의 ETag("...-N")는 내용 MD5가 아니므로 캐시 키로 쓸 수 없음
+        etag_is_md5 = bool(etag) and "-" not in etag
+
+        image_content = None
+        if OCR_MAX_IMAGE_DIMENSION > 0 or (ocr_cache and not etag_is_md5):
+            with metrics.timer("s3_read"):
+                image_content = body.read()
+            body.close()
+
+        # 축소 여부에 따라 OCR 결과가 달라지므로 캐시 파라미터에 포함
+        cache_params = {**data, "max_dimension": OCR_MAX_IMAGE_DIMENSION}
+
+        # 캐시에 같은 이미지의 OCR 결과가 있으면 API 호출 없이 반환
+        cache_key = None
+        if ocr_cache:
+            content_digest = (
+                content_md5(image_content)
+                if image_content is not None
+                else etag
+            )
+            cache_key = make_cache_key(content_digest, cache_params)
+            cached = ocr_cache.get(cache_key)
+            metrics.incr(
+                "ocr_cache_hits" if cached is not None else "ocr_cache_misses"
+            )
+            if cached is not None:
+                if image_content is None:
+                    body.close()
+                logger.info(f"OCR cache hit for page: {page_num}")
+                return {
+                    "success": True,
+                    "message": "",
+                    "data": {
+                        "page_idx": page_num,
+                        "html_entire": cached["html_entire"],
+                        "html_array": cached["html_array"],
+                    },
+                }
+
+        if image_content is not None:
+            if OCR_MAX_IMAGE_DIMENSION > 0:
+                with metrics.timer("downscale"):
+                    image_content = downscale_image(
+                        image_content,
+                        file_ext,
+                        OCR_MAX_IMAGE_DIMENSION,
+                        OCR_JPEG_QUALITY,
+                    )
+
+            def open_document():
+                return io.BytesIO(image_content), len(image_content)
+
+        else:
+            # S3 본문을 multipart 업로드로 그대로 흘려보냄. 재시도 시에는 S3에서 다시 받음
+            pending_body = [(body, response["ContentLength"])]
+
+            def open_document():
+                if pending_body:
+                    return pending_body.pop()
+                retry_response = s3.get_object(Bucket=bucket, Key=key)
+                return retry_response["Body"], retry_response["ContentLength"]
+
+        with metrics.timer("upstage_post"):
+            response = ocr_client.digitize(
+                open_document, filename, content_type, data
+            )
         
         # API 응답 상태 코드와 내용 로깅
         logger.info(f"OCR API response status: {response.status_code}")
         
         if response.status_code != 200:
             logger.error(f"OCR API request failed with status {response.status_code}")
-            logger.error(f"Response content: {response.text}")
+            logger.payload(
+                "OCR API error response",
+                lambda: response.text,
+                level="ERROR",
+                sample_rate=1.0,
+            )
             return {
                 "success": False,
                 "message": f"OCR API request failed with status {response.status_code}",
@@ -78,8 +168,14 @@ def lambda_handler(event, context):
                 "html_array": html_array
             }
 
+        if cache_key:
+            ocr_cache.put(
+                cache_key,
+                {"html_entire": html_entire, "html_array": html_array},
+            )
+
         logger.info(f"OCR processing completed successfully for page: {page_num}")
-        logger.info(data)
+        logger.payload("OCR result", data, level="DEBUG", page=page_num)
         return {
             "success": True,
             "message": "",
@@ -93,3 +189,83 @@ def lambda_handler(event, context):
             "message": str(e),
             "data": {}
         }
+
+
+def process_pages(bucket, pages):
+    """여러 페이지를 제한된 워커 풀로 동시에 OCR 처리하고 페이지 순서대로 반환합니다."""
+    ordered_pages = sorted(pages, key=lambda page: page["pageIdx"])
+    max_workers = max(1, min(OCR_MAX_WORKERS, len(ordered_pages)))
+
+    logger.info(
+        f"Processing OCR batch: {len(ordered_pages)} pages, "
+        f"workers: {max_workers}"
+    )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                process_page, bucket, page["s3Key"], page["pageIdx"]
+            )
+            for page in ordered_pages
+        ]
+        page_results = []
+        for page, future in zip(ordered_pages, futures):
+            result = future.result()
+            # 지원하지 않는 파일 형식 등 error 형태의 응답도 실패 항목으로 정규화
+            if "error" in result:
+                result = {
+                    "success": False,
+                    "message": result["error"],
+                    "data": {},
+                }
+            page_results.append(
+                {"pageIdx": page["pageIdx"], "s3Key": page["s3Key"], **result}
+            )
+
+    return page_results
+
+
+# 워밍업 이벤트({"warmup": true}) 또는 LAMBDA_EAGER_INIT 시 미리 준비할 항목
+WARMUP_STEPS = [
+    ("s3_client", lambda: s3.meta),
+    ("upstage_connection", ocr_client.warm_up),
+]
+
+
+def lambda_handler(event, context):
+    if is_warmup_event(event):
+        return warmup_response(WARMUP_STEPS)
+
+    bucket = os.environ["S3_BUCKET"]
+    metrics.reset()
+
+    # 배치 모드: {"pages": [{"s3Key": "...", "pageIdx": 0}, ...]}
+    if "pages" in event:
+        page_results = process_pages(bucket, event["pages"])
+        failed_count = sum(
+            1 for result in page_results if not result["success"]
+        )
+        metrics.incr("pages", len(page_results))
+        metrics.incr("failed_pages", failed_count)
+        response = {
+            "success": failed_count == 0,
+            "message": (
+                ""
+                if failed_count == 0
+                else f"OCR failed for {failed_count} of "
+                f"{len(page_results)} pages"
+            ),
+            "data": {"pages": page_results},
+        }
+    else:
+        response = process_page(bucket, event["s3Key"], event["pageIdx"])
+        metrics.incr("pages")
+        metrics.incr("failed_pages", 0 if response.get("success") else 1)
+
+    response["metadata"] = {"metrics": metrics.summary()}
+    metrics.emit()
+    return response
+
+
+if EAGER_INIT:
+    logger.info("Eager init", warmup=warm_up(WARMUP_STEPS))
@@ -0,0 +1,44 @@
+import io
+from lambdas.common.log import get_logger
+
+logger = get_logger("ocr_lambda")
+
+PIL_FORMATS = {"jpeg": "JPEG", "png": "PNG"}
+
+
+def downscale_image(image_content, file_ext, max_dimension, jpeg_quality=85):
+    """긴 변이 max_dimension을 넘는 이미지를 축소/재압축하여 업로드 바이트를 줄입니다.
+
+    Pillow가 설치되어 있지 않거나, 처리 결과가 원본보다 크면 원본을 그대로 반환합니다.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        logger.warning("Pillow is not installed, skipping image downscaling")
+        return image_content
+
+    with Image.open(io.BytesIO(image_content)) as image:
+        if max(image.size) <= max_dimension:
+            return image_content
+
+        original_size = image.size
+        image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+        output = io.BytesIO()
+        pil_format = PIL_FORMATS[file_ext]
+        if pil_format == "JPEG":
+            image.convert("RGB").save(
+                output, format=pil_format, quality=jpeg_quality, optimize=True
+            )
+        else:
+            image.save(output, format=pil_format, optimize=True)
+
+    resized_content = output.getvalue()
+    if len(resized_content) >= len(image_content):
+        return image_content
+
+    logger.info(
+        f"Downscaled image {original_size} -> {image.size}, "
+        f"bytes {len(image_content)} -> {len(resized_content)}"
+    )
+    return resized_content
@@ -0,0 +1,107 @@
+import os
+import json
+import hashlib
+import threading
+from lambdas.common.log import get_logger
+from lambdas.common.cache import S3JsonStore, TTLCache
+
+logger = get_logger("ocr_lambda")
+
+
+def content_md5(image_content):
+    """이미지 바이트의 MD5 (단일 PUT으로 업로드된 S3 객체의 ETag와 같은 값)."""
+    return hashlib.md5(image_content, usedforsecurity=False).hexdigest()
+
+
+def make_cache_key(content_digest, ocr_params):
+    """이미지 내용 해시와 OCR 파라미터(ocr, base64_encoding, model)로 캐시 키를 만듭니다.
+
+    content_digest는 content_md5() 결과 또는 동일한 값인 S3 ETag를 사용하므로
+    이미지를 메모리에 올리지 않고 스트리밍하는 경우에도 같은 키가 나옵니다.
+    """
+    digest = hashlib.sha256()
+    digest.update(content_digest.encode("utf-8"))
+    digest.update(
+        json.dumps(ocr_params, sort_keys=True, ensure_ascii=False).encode(
+            "utf-8"
+        )
+    )
+    return digest.hexdigest()
+
+
+class LocalDirCacheBackend:
+    """로컬 디렉터리에 키별 JSON 파일로 저장하는 캐시."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, payload):
+        # 동시 쓰기 시 깨진 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = (
+            f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(key))
+
+
+class OCRResultCache:
+    """OCR 결과(html_entire/html_array)를 이미지 해시로 저장하는 캐시.
+
+    캐시 오류는 OCR 처리 자체를 실패시키지 않도록 로그만 남기고 miss로 처리합니다.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, key):
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"OCR cache read failed: {str(e)}")
+            return None
+
+    def put(self, key, payload):
+        try:
+            self.backend.put(key, payload)
+        except Exception as e:
+            logger.warning(f"OCR cache write failed: {str(e)}")
+
+
+def create_ocr_cache(s3_client):
+    """OCR_CACHE_BACKEND 환경 변수(s3/local/memory/none)에 따라 캐시를 생성합니다."""
+    backend_name = os.getenv("OCR_CACHE_BACKEND", "none").lower()
+
+    if backend_name == "s3":
+        bucket = os.getenv("OCR_CACHE_BUCKET") or os.getenv("S3_BUCKET")
+        if not bucket:
+            logger.warning(
+                "OCR cache disabled: OCR_CACHE_BUCKET/S3_BUCKET is not set"
+            )
+            return None
+        backend = S3JsonStore(
+            s3_client, bucket, os.getenv("OCR_CACHE_PREFIX", "ocr-cache/")
+        )
+    elif backend_name == "local":
+        backend = LocalDirCacheBackend(
+            os.getenv("OCR_CACHE_DIR", "/tmp/ocr-cache")
+        )
+    elif backend_name == "memory":
+        backend = TTLCache(
+            "ocr", max_entries=int(os.getenv("OCR_CACHE_MAX_ENTRIES", "128"))
+        )
+    else:
+        return None
+
+    return OCRResultCache(backend)
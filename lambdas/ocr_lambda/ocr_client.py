@@ -0,0 +1,218 @@
+import io
+import os
+import time
+import uuid
+import random
+import threading
+from lambdas.common.log import get_logger
+
+logger = get_logger("ocr_lambda")
+
+UPSTAGE_OCR_URL = "https://api.upstage.ai/v1/document-digitization"
+
+# 재시도 대상 상태 코드 (Rate limit + 서버 오류)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class MultipartStream:
+    """multipart/form-data 본문을 메모리에 모으지 않고 파일 객체에서 그대로 흘려보내는 스트림.
+
+    requests에 data로 넘기면 len()으로 Content-Length를 설정하고
+    read()로 블록 단위 전송하므로, 이미지 바이트를 한 번 더 복사하지 않습니다.
+    """
+
+    def __init__(
+        self, fields, field_name, filename, content_type, fileobj, file_length
+    ):
+        self.boundary = uuid.uuid4().hex
+        head = b"".join(
+            (
+                f"--{self.boundary}\r\n"
+                f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+                f"{value}\r\n"
+            ).encode("utf-8")
+            for name, value in fields.items()
+        )
+        head += (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; '
+            f'filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode("utf-8")
+        tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+
+        self._parts = [io.BytesIO(head), fileobj, io.BytesIO(tail)]
+        self._length = len(head) + file_length + len(tail)
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        chunks = []
+        while self._parts and (size < 0 or size > 0):
+            chunk = self._parts[0].read(size)
+            if not chunk:
+                self._parts.pop(0)
+                continue
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        return b"".join(chunks)
+
+
+class UpstageOCRClient:
+    """커넥션 풀을 재사용하는 Upstage document-digitization 클라이언트.
+
+    warm 컨테이너에서는 모듈 레벨 인스턴스의 세션이 유지되므로
+    페이지마다 TCP/TLS 핸드셰이크를 다시 하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        url=None,
+        api_key=None,
+        connect_timeout=None,
+        read_timeout=None,
+        max_retries=None,
+        backoff_base=None,
+        backoff_max=None,
+        pool_size=None,
+    ):
+        self.url = url or os.getenv("UPSTAGE_OCR_URL", UPSTAGE_OCR_URL)
+        self._api_key = api_key
+        self.connect_timeout = (
+            connect_timeout
+            if connect_timeout is not None
+            else float(os.getenv("UPSTAGE_CONNECT_TIMEOUT", "3"))
+        )
+        self.read_timeout = (
+            read_timeout
+            if read_timeout is not None
+            else float(os.getenv("UPSTAGE_READ_TIMEOUT", "20"))
+        )
+        self.max_retries = (
+            max_retries
+            if max_retries is not None
+            else int(os.getenv("UPSTAGE_MAX_RETRIES", "2"))
+        )
+        self.backoff_base = (
+            backoff_base
+            if backoff_base is not None
+            else float(os.getenv("UPSTAGE_BACKOFF_BASE", "0.5"))
+        )
+        self.backoff_max = (
+            backoff_max
+            if backoff_max is not None
+            else float(os.getenv("UPSTAGE_BACKOFF_MAX", "4"))
+        )
+        self.pool_size = (
+            pool_size
+            if pool_size is not None
+            else int(os.getenv("UPSTAGE_POOL_SIZE", "10"))
+        )
+
+        # 세션(과 requests import)은 첫 요청 시 생성하여 콜드 스타트 시간을 줄임
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    # 재시도는 직접 처리하므로 adapter 레벨 재시도는 끔
+                    adapter = HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=self.pool_size,
+                        max_retries=0,
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def warm_up(self):
+        """세션을 만들고 API 호스트와 TCP/TLS 연결을 미리 맺어 풀에 남겨 둡니다 (응답 상태는 무시)."""
+        self.session.head(
+            self.url, timeout=(self.connect_timeout, self.connect_timeout)
+        )
+
+    @property
+    def api_key(self):
+        return self._api_key or os.environ["UPSTAGE_API_KEY"]
+
+    def _backoff_delay(self, attempt, response=None):
+        """Retry-After 헤더를 우선하고, 없으면 full jitter 지수 백오프를 사용합니다."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.backoff_max)
+                except ValueError:
+                    pass
+        return random.uniform(
+            0, min(self.backoff_max, self.backoff_base * (2**attempt))
+        )
+
+    def digitize(self, open_document, filename, content_type, data):
+        """문서를 업로드하여 OCR을 요청하고 최종 응답(requests.Response)을 반환합니다.
+
+        open_document는 (파일 객체, 바이트 길이)를 반환하는 callable이며,
+        429/5xx 응답과 연결 오류로 재시도할 때마다 다시 호출되어 새 스트림을 엽니다.
+        """
+        import requests
+
+        timeout = (self.connect_timeout, self.read_timeout)
+
+        for attempt in range(self.max_retries + 1):
+            document, length = open_document()
+            body = MultipartStream(
+                data, "document", filename, content_type, document, length
+            )
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": body.content_type,
+            }
+
+            try:
+                response = self.session.post(
+                    self.url, headers=headers, data=body, timeout=timeout
+                )
+            except requests.exceptions.ConnectionError as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(
+                    f"OCR API connection error: {str(e)}, "
+                    f"retrying in {delay:.2f}s "
+                    f"({attempt + 1}/{self.max_retries})"
+                )
+                time.sleep(delay)
+                continue
+            finally:
+                if hasattr(document, "close"):
+                    document.close()
+
+            if (
+                response.status_code not in RETRYABLE_STATUS_CODES
+                or attempt >= self.max_retries
+            ):
+                return response
+
+            delay = self._backoff_delay(attempt, response)
+            logger.warning(
+                f"OCR API responded {response.status_code}, "
+                f"retrying in {delay:.2f}s "
+                f"({attempt + 1}/{self.max_retries})"
+            )
+            time.sleep(delay)
+
+        return response
@@ -0,0 +1,56 @@
+import os
+import json
+import uuid
+
+
+class LambdaHandlerBackends:
+    """기존 Lambda 핸들러 함수를 같은 프로세스에서 직접 호출하는 백엔드 (실제 AWS/Upstage/Postgres 사용).
+
+    로컬 실행이나 벤치마크에서는 같은 메서드(ocr_pages, analyze, persist)를 가진
+    가짜 백엔드 객체를 대신 넘기면 됩니다.
+    """
+
+    def __init__(self, bucket=None):
+        # 각 핸들러는 import 시 클라이언트를 만들므로 실제로 사용할 때 import
+        from lambdas.ocr_lambda import handler as ocr_handler
+        from lambdas.bedrock_lambda import handler as bedrock_handler
+        from lambdas.analysis_result_loader import handler as loader_handler
+
+        self.ocr_handler = ocr_handler
+        self.bedrock_handler = bedrock_handler
+        self.loader_handler = loader_handler
+        self.bucket = bucket
+
+    def ocr_pages(self, pages):
+        """페이지 목록을 OCR하여 페이지 순서대로 결과를 반환합니다 (ocr_lambda 배치 모드와 같은 형식)."""
+        return self.ocr_handler.process_pages(
+            self.bucket or os.environ["S3_BUCKET"], pages
+        )
+
+    def analyze(self, request_payload):
+        """bedrock_lambda 이벤트로 분석을 수행하고 응답을 반환합니다."""
+        return self.bedrock_handler.lambda_handler(request_payload, None)
+
+    def persist(self, request_payload, response_payload):
+        """Lambda Destinations 메시지 형식으로 analysis_result_loader에 기록합니다."""
+        message_id = str(uuid.uuid4())
+        event = {
+            "Records": [
+                {
+                    "messageId": message_id,
+                    "body": json.dumps(
+                        {
+                            "requestPayload": request_payload,
+                            "responsePayload": response_payload,
+                        },
+                        ensure_ascii=False,
+                    ),
+                }
+            ]
+        }
+        result = self.loader_handler.lambda_handler(event, None)
+        if result.get("batchItemFailures"):
+            raise RuntimeError(
+                f"Failed to persist analysis result: {result.get('body')}"
+            )
+        return result
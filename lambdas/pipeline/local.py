@@ -0,0 +1,90 @@
+"""
+로컬 파이프라인 실행기
+세 Lambda 핸들러를 한 프로세스에서 OCR → 분석 → 저장 순서로 실행합니다 (배포 대상 아님).
+
+사용 예:
+    python -m lambdas.pipeline.local contracts.json
+
+contracts.json 형식:
+    [{"contractId": "...", "analysisId": "...",
+      "pages": [{"s3Key": "...", "pageIdx": 0}]}]
+"""
+
+import os
+import sys
+import json
+import argparse
+from .backends import LambdaHandlerBackends
+from .stages import build_pipeline
+from lambdas.common.log import get_logger
+
+logger = get_logger("pipeline")
+
+# 단계별 동시 실행 수 / 단계 사이 큐 크기
+# 분석 단계는 bedrock_lambda 핸들러의 모듈 전역 상태를 공유하므로 기본 1 (stages.build_pipeline 참고)
+PIPELINE_OCR_WORKERS = int(os.getenv("PIPELINE_OCR_WORKERS", "2"))
+PIPELINE_ANALYSIS_WORKERS = int(os.getenv("PIPELINE_ANALYSIS_WORKERS", "1"))
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))
+
+
+def run_pipeline(contracts, backends):
+    """계약서 목록을 OCR부터 저장까지 한 프로세스에서 처리하고 결과와 단계별 시간을 반환합니다."""
+    pipeline = build_pipeline(
+        backends,
+        ocr_workers=PIPELINE_OCR_WORKERS,
+        analysis_workers=PIPELINE_ANALYSIS_WORKERS,
+        queue_size=PIPELINE_QUEUE_SIZE,
+    )
+    items = [
+        {
+            "contractId": contract["contractId"],
+            "analysisId": contract["analysisId"],
+            "pages": contract["pages"],
+        }
+        for contract in contracts
+    ]
+    return pipeline.run(items)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="OCR, 분석, 저장을 한 프로세스에서 실행합니다"
+    )
+    parser.add_argument(
+        "contracts", help="계약서 목록 JSON 파일 (단일 계약서 객체도 허용)"
+    )
+    parser.add_argument(
+        "--bucket", help="페이지 이미지 S3 버킷 (기본: S3_BUCKET 환경 변수)"
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.contracts, "r", encoding="utf-8") as f:
+        contracts = json.load(f)
+    if isinstance(contracts, dict):
+        contracts = [contracts]
+
+    logger.info(f"[PIPELINE] 파이프라인 실행 시작 - 계약서 {len(contracts)}건")
+    results, summary = run_pipeline(
+        contracts, LambdaHandlerBackends(args.bucket)
+    )
+    logger.info("[PIPELINE] 파이프라인 실행 완료", summary=summary)
+
+    output = {
+        "results": [
+            {
+                "contractId": item["contractId"],
+                "analysisId": item["analysisId"],
+                "success": "error" not in item,
+                "error": item.get("error"),
+                "timings": item["timings"],
+            }
+            for item in results
+        ],
+        "metadata": summary,
+    }
+    print(json.dumps(output, ensure_ascii=False, indent=2))
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
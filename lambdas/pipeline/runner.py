@@ -0,0 +1,124 @@
+import time
+import queue
+import threading
+from lambdas.common.log import get_logger
+
+logger = get_logger("pipeline")
+
+# 스테이지 종료 신호
+_SENTINEL = object()
+
+
+class PipelineRunner:
+    """단계(stage)를 제한된 크기의 큐로 연결해 계약서 단위로 흘려보내는 파이프라인 실행기.
+
+    각 단계는 item(dict)을 받아 같은 item을 갱신하는 함수이며, 단계마다 지정된 수의
+    워커 스레드가 처리합니다. 여러 계약서를 넣으면 앞 계약서의 분석과 다음 계약서의
+    OCR이 겹쳐서 진행됩니다. 단계에서 예외가 나면 item["error"]에 기록하고 이후 단계는 건너뜁니다.
+    """
+
+    def __init__(self, stages, queue_size=4):
+        # stages: [(이름, 함수, 워커 수), ...]
+        self.stages = stages
+        self.queue_size = queue_size
+
+    def _run_stage(self, name, func, inbox, outbox):
+        while True:
+            item = inbox.get()
+            if item is _SENTINEL:
+                inbox.put(_SENTINEL)
+                return
+            if "error" not in item:
+                started = time.perf_counter()
+                try:
+                    func(item)
+                except Exception as e:
+                    logger.error(
+                        f"[PIPELINE] {name} 단계 실패 - "
+                        f"Contract ID: {item.get('contractId')}: {str(e)}"
+                    )
+                    item["error"] = {"stage": name, "message": str(e)}
+                finally:
+                    item["timings"][name] = (
+                        time.perf_counter() - started
+                    ) * 1000
+            outbox.put(item)
+
+    def run(self, items):
+        """item 목록을 파이프라인에 흘려보내고, 처리된 item 목록과 단계별 시간 요약을 반환합니다."""
+        queues = [
+            queue.Queue(maxsize=self.queue_size)
+            for _ in range(len(self.stages) + 1)
+        ]
+        started = time.perf_counter()
+
+        stage_threads = []
+        for idx, (name, func, workers) in enumerate(self.stages):
+            threads = [
+                threading.Thread(
+                    target=self._run_stage,
+                    args=(name, func, queues[idx], queues[idx + 1]),
+                    daemon=True,
+                )
+                for _ in range(max(1, workers))
+            ]
+            for thread in threads:
+                thread.start()
+            stage_threads.append(threads)
+
+        # 마지막 큐는 별도 스레드에서 비워서 앞 단계가 막히지 않도록 함
+        results = []
+        collector = threading.Thread(
+            target=self._collect, args=(queues[-1], results), daemon=True
+        )
+        collector.start()
+
+        for item in items:
+            item.setdefault("timings", {})
+            queues[0].put(item)
+        queues[0].put(_SENTINEL)
+
+        # 단계별로 모든 워커가 끝나면 다음 단계에 종료 신호 전달
+        for idx, threads in enumerate(stage_threads):
+            for thread in threads:
+                thread.join()
+            queues[idx + 1].put(_SENTINEL)
+        collector.join()
+
+        return results, self.summarize(
+            results, (time.perf_counter() - started) * 1000
+        )
+
+    @staticmethod
+    def _collect(outbox, results):
+        while True:
+            item = outbox.get()
+            if item is _SENTINEL:
+                return
+            results.append(item)
+
+    def summarize(self, results, wall_ms):
+        """단계별 처리 건수와 합계/평균/최대 소요 시간(ms)을 요약합니다."""
+        stages = {}
+        for name, _, _ in self.stages:
+            durations = [
+                item["timings"][name]
+                for item in results
+                if name in item["timings"]
+            ]
+            stages[name] = {
+                "count": len(durations),
+                "total_ms": round(sum(durations), 1),
+                "avg_ms": (
+                    round(sum(durations) / len(durations), 1)
+                    if durations
+                    else 0.0
+                ),
+                "max_ms": round(max(durations), 1) if durations else 0.0,
+            }
+        return {
+            "wall_ms": round(wall_ms, 1),
+            "contracts": len(results),
+            "failed": sum(1 for item in results if "error" in item),
+            "stages": stages,
+        }
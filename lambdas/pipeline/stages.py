@@ -0,0 +1,54 @@
+from .runner import PipelineRunner
+
+
+def build_pipeline(
+    backends,
+    ocr_workers=2,
+    analysis_workers=1,
+    persist_workers=1,
+    queue_size=4,
+):
+    """OCR → HTML 텍스트 변환 → 분석 → 저장 단계로 구성된 파이프라인을 만듭니다.
+
+    LambdaHandlerBackends의 분석 단계는 bedrock_lambda 핸들러를 직접 호출하는데, 핸들러는 호출마다
+    모듈 전역 상태(metrics, retrieval_cache 통계, rate_limiter 마감 시각)를 초기화하므로
+    analysis_workers는 1로 둡니다. 계약서 내부의 병렬 처리는 핸들러의 map-reduce/검색 워커 풀이 담당합니다.
+    """
+
+    def ocr_stage(item):
+        # 페이지 팬아웃은 백엔드(ocr_lambda 배치 모드)의 워커 풀에서 처리
+        page_results = backends.ocr_pages(item["pages"])
+        failed = [result for result in page_results if not result["success"]]
+        if failed:
+            failed_pages = [result["pageIdx"] for result in failed]
+            raise RuntimeError(f"OCR failed for pages: {failed_pages}")
+        item["ocrPages"] = page_results
+
+    def text_stage(item):
+        item["contractTexts"] = [
+            result["data"]["html_entire"] for result in item["ocrPages"]
+        ]
+
+    def analysis_stage(item):
+        item["requestPayload"] = {
+            "contractId": item["contractId"],
+            "analysisId": item["analysisId"],
+            "contractTexts": item["contractTexts"],
+        }
+        response = backends.analyze(item["requestPayload"])
+        if not response.get("success"):
+            raise RuntimeError(response.get("message") or "analysis failed")
+        item["responsePayload"] = response
+
+    def persist_stage(item):
+        backends.persist(item["requestPayload"], item["responsePayload"])
+
+    return PipelineRunner(
+        [
+            ("ocr", ocr_stage, ocr_workers),
+            ("html_to_text", text_stage, 1),
+            ("analysis", analysis_stage, analysis_workers),
+            ("persist", persist_stage, persist_workers),
+        ],
+        queue_size=queue_size,
+    )
@@ -0,0 +1,686 @@
+#!/usr/bin/env python3
+"""
+오프라인 Lambda 벤치마크 스크립트
+S3/Bedrock/Postgres 가짜 객체와 Upstage HTTP 스텁 서버로 세 핸들러를 실행하여
+페이지 수별 p50/p95 지연 시간, 최대 RSS, 의존성별 호출 수를 측정합니다.
+최대 RSS가 시나리오(핸들러 × 페이지 수)별 값이 되도록 시나리오마다 별도 프로세스에서 실행합니다.
+
+사용 예:
+    python scripts/benchmark.py --pages 1,10,50 --iterations 5 \
+        --ocr-latency-ms 300
+    # DB_* 환경 변수의 로컬 Postgres 사용
+    python scripts/benchmark.py --handlers loader --postgres local
+"""
+
+import io
+import os
+import sys
+import json
+import re
+import time
+import uuid
+import random
+import hashlib
+import argparse
+import resource
+import tempfile
+import subprocess
+import threading
+import tracemalloc
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# 의존성별 호출 수
+CALLS = Counter()
+
+
+def sleep_ms(latency_ms):
+    if latency_ms > 0:
+        time.sleep(latency_ms / 1000)
+
+
+# ---------------------------------------------------------------------------
+# 합성 계약서
+# ---------------------------------------------------------------------------
+
+
+def synthetic_page_html(page_idx, clauses_per_page=8, seed=""):
+    """조항 문단과 표 하나로 구성된 Upstage 형식의 페이지 HTML을 만듭니다."""
+    elements = [f"<h1 id='0' style='font-size:22px'>근로계약서 {seed}</h1>"]
+    for i in range(clauses_per_page):
+        clause_no = page_idx * clauses_per_page + i + 1
+        elements.append(
+            f"<p id='{i + 1}' data-category='paragraph' "
+            f"style='font-size:14px'>제{clause_no}조 (조건) "
+            f"갑은 을에게 계약 기간 중 발생한 모든 손해에 대하여 배상을 청구할 수 있으며, "
+            f"을은 어떠한 경우에도 이의를 제기할 수 없다. 위반 시 위약금은 월 임금의 {i + 2}배로 한다.</p>"
+        )
+    elements.append(
+        f"<table id='{clauses_per_page + 1}' style='font-size:14px'>"
+        "<tr><th>항목</th><th>내용</th></tr>"
+        "<tr><td>임금</td><td>월 2,000,000원</td></tr>"
+        "<tr><td>근무시간</td><td>09:00 ~ 18:00</td></tr></table>"
+    )
+    return "".join(elements)
+
+
+def synthetic_ocr_response(page_html):
+    return {
+        "content": {"html": page_html},
+        "elements": [
+            {
+                "category": "paragraph",
+                "content": {"html": page_html[:200]},
+                "id": 0,
+            },
+        ],
+    }
+
+
+def synthetic_analysis(toxic_count):
+    return {
+        "title": "근로계약서",
+        "summary": "합성 계약서 요약입니다.",
+        "ddobakCommentary": {
+            "overallComment": "조금 까다로운 조항들이 있어요~",
+            "warningComment": "손해배상 조항을 꼼꼼히 확인해보세요!",
+            "advice": "계약 전에 꼭 다시 협의해보세요!",
+        },
+        "toxicCount": toxic_count,
+        "toxics": [
+            {
+                "title": f"과도한 손해배상 조항 {i + 1}",
+                "clause": f"을은 어떠한 경우에도 이의를 제기할 수 없다. ({i + 1})",
+                "reason": "일방적으로 불리한 조항입니다.",
+                "reasonReference": "민법 제103조",
+                "sourceContractTagIdx": i,
+                "warnLevel": random.choice([1, 2, 3]),
+            }
+            for i in range(toxic_count)
+        ],
+    }
+
+
+# ---------------------------------------------------------------------------
+# 가짜 의존성
+# ---------------------------------------------------------------------------
+
+
+class FakeStreamingBody(io.BytesIO):
+    """botocore StreamingBody처럼 read/close를 제공하는 본문."""
+
+
+class FakeS3:
+    class exceptions:
+        class NoSuchKey(Exception):
+            pass
+
+    def __init__(self, latency_ms, image_bytes):
+        self.latency_ms = latency_ms
+        self.image_bytes = image_bytes
+        self.objects = {}
+
+    def get_object(self, Bucket, Key):
+        CALLS["s3.get_object"] += 1
+        sleep_ms(self.latency_ms)
+        if Key in self.objects:
+            body = self.objects[Key]
+        elif Key.endswith((".png", ".jpeg")):
+            body = self.image_bytes
+        else:
+            raise self.exceptions.NoSuchKey(Key)
+        return {
+            "Body": FakeStreamingBody(body),
+            "ContentLength": len(body),
+            "ETag": f'"{hashlib.md5(body).hexdigest()}"',
+        }
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        CALLS["s3.put_object"] += 1
+        sleep_ms(self.latency_ms)
+        self.objects[Key] = Body
+
+
+class FakeBedrockRuntime:
+    def __init__(self, latency_ms, toxics_per_page):
+        self.latency_ms = latency_ms
+        self.toxics_per_page = toxics_per_page
+        # 프롬프트 캐시 흉내: 캐시 체크포인트까지의 앞부분을 기억
+        self.cached_prefixes = set()
+
+    def _usage(self, content):
+        """캐시 체크포인트가 있으면 앞부분을 캐시 읽기/쓰기 토큰으로 나누어 집계합니다."""
+        if isinstance(content, str):
+            return content, {"input_tokens": len(content) // 2}
+        prompt = "".join(block["text"] for block in content)
+        usage = {"input_tokens": len(prompt) // 2}
+        checkpoints = [
+            idx
+            for idx, block in enumerate(content)
+            if "cache_control" in block
+        ]
+        if checkpoints:
+            prefix = "".join(
+                block["text"] for block in content[: checkpoints[-1] + 1]
+            )
+            key = (
+                "cache_read_input_tokens"
+                if prefix in self.cached_prefixes
+                else "cache_creation_input_tokens"
+            )
+            self.cached_prefixes.add(prefix)
+            usage = {
+                "input_tokens": (len(prompt) - len(prefix)) // 2,
+                key: len(prefix) // 2,
+            }
+        return prompt, usage
+
+    def _answer(self, body):
+        prompt, usage = self._usage(json.loads(body)["messages"][0]["content"])
+        if "1차 선별기" in prompt:
+            # 선별 프롬프트: 요소 10개 중 하나를 의심 요소로 응답
+            element_ids = [
+                int(idx)
+                for idx in re.findall(r"^\[(\d+)\]", prompt, re.MULTILINE)
+            ]
+            screen = {
+                "title": "합성 계약서",
+                "summary": "벤치마크용 합성 계약서입니다.",
+                "suspicious": element_ids[::10],
+            }
+            return json.dumps(screen, ensure_ascii=False), usage
+        pages = max(1, prompt.count("Page "))
+        analysis = synthetic_analysis(min(30, pages * self.toxics_per_page))
+        return (
+            "```json\n"
+            + json.dumps(analysis, ensure_ascii=False, indent=2)
+            + "\n```",
+            usage,
+        )
+
+    def invoke_model(self, modelId, body, **kwargs):
+        CALLS["bedrock.invoke_model"] += 1
+        sleep_ms(self.latency_ms)
+        answer, usage = self._answer(body)
+        response_body = {
+            "content": [{"type": "text", "text": answer}],
+            "stop_reason": "end_turn",
+            "usage": {**usage, "output_tokens": len(answer) // 2},
+        }
+        return {
+            "body": io.BytesIO(
+                json.dumps(response_body, ensure_ascii=False).encode("utf-8")
+            )
+        }
+
+    def invoke_model_with_response_stream(self, modelId, body, **kwargs):
+        CALLS["bedrock.invoke_model_with_response_stream"] += 1
+        answer, usage = self._answer(body)
+        chunk_size = 64
+        chunks = [
+            answer[i:i + chunk_size]
+            for i in range(0, len(answer), chunk_size)
+        ]
+
+        def events():
+            yield {
+                "chunk": {
+                    "bytes": json.dumps(
+                        {"type": "message_start", "message": {"usage": usage}}
+                    ).encode()
+                }
+            }
+            for chunk in chunks:
+                sleep_ms(self.latency_ms / max(1, len(chunks)))
+                yield {
+                    "chunk": {
+                        "bytes": json.dumps(
+                            {
+                                "type": "content_block_delta",
+                                "delta": {"type": "text_delta", "text": chunk},
+                            },
+                            ensure_ascii=False,
+                        ).encode("utf-8")
+                    }
+                }
+            yield {
+                "chunk": {
+                    "bytes": json.dumps(
+                        {
+                            "type": "message_delta",
+                            "delta": {"stop_reason": "end_turn"},
+                            "usage": {"output_tokens": len(answer) // 2},
+                        }
+                    ).encode()
+                }
+            }
+
+        return {"body": events()}
+
+
+class FakeBedrockAgentRuntime:
+    def __init__(self, latency_ms, results=5):
+        self.latency_ms = latency_ms
+        self.results = results
+
+    def retrieve(self, knowledgeBaseId, retrievalQuery, **kwargs):
+        CALLS["bedrock.retrieve"] += 1
+        sleep_ms(self.latency_ms)
+        return {
+            "retrievalResults": [
+                {
+                    "content": {
+                        "text": f"근로기준법 제{20 + i}조 위약 예정의 금지 ..."
+                    },
+                    "location": {
+                        "s3Location": {
+                            "uri": f"s3://legal-corpus/labor-{i}.txt"
+                        }
+                    },
+                    "score": round(random.random(), 3),
+                }
+                for i in range(self.results)
+            ]
+        }
+
+
+class FakeSQS:
+    def send_message(self, QueueUrl, MessageBody, **kwargs):
+        CALLS["sqs.send_message"] += 1
+        return {"MessageId": str(uuid.uuid4())}
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+        self._rows = []
+
+    def mogrify(self, template, args):
+        if isinstance(template, bytes):
+            template = template.decode("utf-8")
+        return (template % tuple(repr(arg) for arg in args)).encode("utf-8")
+
+    def execute(self, query, params=None):
+        CALLS["postgres.execute"] += 1
+        sleep_ms(self.connection.latency_ms)
+        if isinstance(query, bytes):
+            query = query.decode("utf-8")
+        statement = query.strip().split()[0].upper()
+        CALLS[f"postgres.{statement.lower()}"] += 1
+        self.rowcount = 1 if statement in ("UPDATE", "INSERT", "DELETE") else 0
+        self._rows = []
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeConnection:
+    """psycopg2 연결의 벤치마크용 대체 객체 (쿼리 수와 지연만 흉내 냄)."""
+
+    encoding = "UTF8"
+
+    def __init__(self, latency_ms):
+        self.latency_ms = latency_ms
+        self.closed = 0
+        self.status = 1
+        self.autocommit = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        CALLS["postgres.commit"] += 1
+        sleep_ms(self.latency_ms)
+
+    def rollback(self):
+        CALLS["postgres.rollback"] += 1
+
+    def close(self):
+        self.closed = 1
+
+
+class UpstageStubHandler(BaseHTTPRequestHandler):
+    """Upstage document-digitization API 스텁."""
+
+    latency_ms = 0
+    received_bytes = 0
+
+    def do_POST(self):
+        CALLS["upstage.post"] += 1
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        UpstageStubHandler.received_bytes += len(body)
+        sleep_ms(self.latency_ms)
+
+        payload = json.dumps(
+            synthetic_ocr_response(synthetic_page_html(0)), ensure_ascii=False
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_upstage_stub(latency_ms):
+    UpstageStubHandler.latency_ms = latency_ms
+    server = ThreadingHTTPServer(("127.0.0.1", 0), UpstageStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ---------------------------------------------------------------------------
+# 핸들러 실행
+# ---------------------------------------------------------------------------
+
+
+def configure_environment(stub_url):
+    """핸들러 import 전에 오프라인 실행용 환경 변수를 설정합니다."""
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+    os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
+    os.environ["S3_BUCKET"] = "ddobak-benchmark"
+    os.environ["UPSTAGE_API_KEY"] = "benchmark"
+    os.environ["UPSTAGE_OCR_URL"] = stub_url
+    os.environ["OCR_CACHE_BACKEND"] = "none"
+    os.environ["KNOWLEDGE_BASE_ID"] = "benchmark-kb"
+    os.environ.pop("RETRIEVAL_CACHE_BUCKET", None)
+    os.environ.pop("ANALYSIS_CACHE_BUCKET", None)
+    os.environ.pop("PARTIAL_RESULTS_QUEUE_URL", None)
+
+
+def run_ocr(handler, pages, iteration):
+    event = {
+        "pages": [
+            {"s3Key": f"contracts/{iteration}/page-{i}.png", "pageIdx": i}
+            for i in range(pages)
+        ]
+    }
+    response = handler.lambda_handler(event, None)
+    if not response["success"]:
+        raise RuntimeError(response["message"])
+
+
+def run_bedrock(handler, pages, iteration, stream=False, routing=False):
+    event = {
+        "contractId": f"contract-{iteration}",
+        "analysisId": f"analysis-{iteration}",
+        # 반복마다 내용을 바꿔 분석/검색 캐시 적중을 피함
+        "contractTexts": [
+            synthetic_page_html(i, seed=f"{iteration}-{random.random()}")
+            for i in range(pages)
+        ],
+        "stream": stream,
+        "modelRouting": routing,
+    }
+    response = handler.lambda_handler(event, None)
+    if not response["success"]:
+        raise RuntimeError(response["message"])
+    return event, response
+
+
+def run_loader(handler, pages, iteration, toxics_per_page):
+    records = []
+    for message_idx in range(10):
+        analysis = synthetic_analysis(min(30, pages * toxics_per_page))
+        records.append(
+            {
+                "messageId": str(uuid.uuid4()),
+                "body": json.dumps(
+                    {
+                        "requestPayload": {
+                            "contractId": str(uuid.uuid4()),
+                            "analysisId": str(uuid.uuid4()),
+                        },
+                        "responsePayload": {
+                            "success": True,
+                            "message": "",
+                            "data": {
+                                "analysisResult": {"analysisResult": analysis}
+                            },
+                        },
+                    },
+                    ensure_ascii=False,
+                ),
+            }
+        )
+    response = handler.lambda_handler({"Records": records}, None)
+    if response.get("batchItemFailures"):
+        raise RuntimeError(response["body"])
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def peak_rss_mb():
+    # 프로세스 전체 기간의 최대값이므로 시나리오마다 새 프로세스에서 측정 (Linux의 ru_maxrss 단위는 KB)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(name, pages, iterations, run):
+    """run(iteration)을 반복 실행하여 지연 시간/메모리/호출 수를 측정합니다."""
+    CALLS.clear()
+    latencies = []
+    for iteration in range(iterations):
+        started = time.perf_counter()
+        run(iteration)
+        latencies.append((time.perf_counter() - started) * 1000)
+    calls = {
+        key: round(value / iterations, 1)
+        for key, value in sorted(CALLS.items())
+    }
+
+    # Python 힙 최대 사용량은 지연 측정에 영향이 없도록 별도 1회 실행으로 측정
+    tracemalloc.start()
+    run(iterations)
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "handler": name,
+        "pages": pages,
+        "iterations": iterations,
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "py_peak_mb": round(py_peak / 1024 / 1024, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "calls_per_run": calls,
+    }
+
+
+def print_report(results):
+    print(
+        f"{'handler':<10} {'pages':>5} {'p50(ms)':>9} {'p95(ms)':>9} "
+        f"{'py_peak(MB)':>12} {'rss(MB)':>8}  calls/run"
+    )
+    for result in results:
+        calls = ", ".join(
+            f"{key}={value}" for key, value in result["calls_per_run"].items()
+        )
+        print(
+            f"{result['handler']:<10} {result['pages']:>5} "
+            f"{result['p50_ms']:>9} {result['p95_ms']:>9} "
+            f"{result['py_peak_mb']:>12} {result['peak_rss_mb']:>8}  {calls}"
+        )
+
+
+def run_scenario(args, handler_name, pages):
+    """핸들러 하나를 페이지 수 하나로 측정합니다 (시나리오 하위 프로세스에서 실행)."""
+    random.seed(args.seed)
+    server = start_upstage_stub(args.ocr_latency_ms)
+    configure_environment(f"http://127.0.0.1:{server.server_address[1]}")
+
+    try:
+        if handler_name == "ocr":
+            from lambdas.ocr_lambda import handler as ocr_handler
+
+            ocr_handler.s3 = FakeS3(
+                args.s3_latency_ms, os.urandom(args.image_kb * 1024)
+            )
+            result = measure(
+                "ocr",
+                pages,
+                args.iterations,
+                lambda i: run_ocr(ocr_handler, pages, i),
+            )
+
+        elif handler_name == "bedrock":
+            from lambdas.bedrock_lambda import handler as bedrock_handler
+
+            bedrock_handler.bedrock_runtime = FakeBedrockRuntime(
+                args.bedrock_latency_ms, args.toxics_per_page
+            )
+            bedrock_handler.bedrock_agent_runtime = FakeBedrockAgentRuntime(
+                args.retrieve_latency_ms
+            )
+            bedrock_handler.sqs = FakeSQS()
+            result = measure(
+                "bedrock",
+                pages,
+                args.iterations,
+                lambda i: run_bedrock(
+                    bedrock_handler, pages, i, args.stream, args.routing
+                ),
+            )
+
+        else:
+            from lambdas.analysis_result_loader import (
+                handler as loader_handler,
+            )
+
+            if args.postgres == "fake":
+                loader_handler.get_db_connection = lambda: FakeConnection(
+                    args.db_latency_ms
+                )
+            result = measure(
+                "loader",
+                pages,
+                args.iterations,
+                lambda i: run_loader(
+                    loader_handler, pages, i, args.toxics_per_page
+                ),
+            )
+    finally:
+        server.shutdown()
+
+    result["upstage_received_bytes"] = UpstageStubHandler.received_bytes
+    return result
+
+
+def spawn_scenario(handler_name, pages):
+    """같은 인자로 이 스크립트를 하위 프로세스로 실행하여 시나리오 하나의 결과를 받습니다."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "result.json")
+        command = [
+            sys.executable,
+            __file__,
+            *sys.argv[1:],
+            "--scenario",
+            f"{handler_name}:{pages}",
+            "--scenario-output",
+            output_path,
+        ]
+        # 핸들러 로그는 그대로 보이도록 출력은 가로채지 않음
+        subprocess.run(command, check=True)
+        with open(output_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="DDOBAK Lambda 오프라인 벤치마크"
+    )
+    parser.add_argument(
+        "--handlers",
+        default="ocr,bedrock,loader",
+        help="실행할 핸들러 (ocr,bedrock,loader)",
+    )
+    parser.add_argument(
+        "--pages", default="1,5,10,25,50", help="합성 계약서 페이지 수 목록"
+    )
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--s3-latency-ms", type=float, default=20)
+    parser.add_argument("--ocr-latency-ms", type=float, default=300)
+    parser.add_argument(
+        "--image-kb", type=int, default=512, help="페이지 이미지 크기 (KB)"
+    )
+    parser.add_argument("--retrieve-latency-ms", type=float, default=150)
+    parser.add_argument("--bedrock-latency-ms", type=float, default=2000)
+    parser.add_argument("--toxics-per-page", type=int, default=2)
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="bedrock_lambda 스트리밍 모드로 실행",
+    )
+    parser.add_argument(
+        "--routing",
+        action="store_true",
+        help="bedrock_lambda 단계별 모델 라우팅(1차 선별) 사용",
+    )
+    parser.add_argument("--db-latency-ms", type=float, default=2)
+    parser.add_argument(
+        "--postgres",
+        choices=["fake", "local"],
+        default="fake",
+        help="local이면 DB_* 환경 변수의 실제 Postgres에 기록",
+    )
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장할 경로")
+    parser.add_argument("--seed", type=int, default=7)
+    # 내부용: 시나리오 하위 프로세스 실행
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--scenario-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        handler_name, pages = args.scenario.split(":")
+        result = run_scenario(args, handler_name, int(pages))
+        with open(args.scenario_output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False)
+        return
+
+    handlers = [
+        name.strip() for name in args.handlers.split(",") if name.strip()
+    ]
+    page_counts = [int(value) for value in args.pages.split(",")]
+
+    results = []
+    for handler_name in ("ocr", "bedrock", "loader"):
+        if handler_name in handlers:
+            results.extend(
+                spawn_scenario(handler_name, pages) for pages in page_counts
+            )
+    received_bytes = sum(
+        result.pop("upstage_received_bytes") for result in results
+    )
+
+    print_report(results)
+    print(f"upstage stub received {received_bytes / 1024 / 1024:.1f} MB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+핸들러 콜드 스타트(import) 시간 리포트
+각 핸들러 모듈을 새 프로세스에서 `python -X importtime`으로 import하여
+전체 import 시간과 가장 무거운 최상위 모듈을 보여줍니다.
+--baseline-ref를 주면 해당 git 커밋의 lambdas/와 나란히 비교합니다.
+
+사용 예:
+    python scripts/coldstart_report.py
+    python scripts/coldstart_report.py --baseline-ref HEAD~1 --runs 5
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+import statistics
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+HANDLERS = [
+    "lambdas.ocr_lambda.handler",
+    "lambdas.bedrock_lambda.handler",
+    "lambdas.analysis_result_loader.handler",
+]
+
+# 모듈 import 시 필요한 최소 환경 변수 (실제 AWS/DB에는 접속하지 않음)
+IMPORT_ENV = {
+    "AWS_DEFAULT_REGION": "ap-northeast-2",
+    "AWS_ACCESS_KEY_ID": "coldstart",
+    "AWS_SECRET_ACCESS_KEY": "coldstart",
+    "S3_BUCKET": "coldstart",
+    "UPSTAGE_API_KEY": "coldstart",
+    "OCR_CACHE_BACKEND": "none",
+    "LAMBDA_EAGER_INIT": "false",
+}
+
+MEASURE_SNIPPET = (
+    "import time; started = time.perf_counter(); "
+    "import {module}; "
+    "print(round((time.perf_counter() - started) * 1000, 1))"
+)
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력에서 최상위 패키지별 누적 import 시간(ms)을 모읍니다.
+
+    패키지는 boto3, requests 등 최상위 이름 기준입니다.
+    """
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        if "." in name or name.startswith("_"):
+            continue
+        # 같은 패키지가 여러 번 나오면(다른 모듈의 하위 import) 가장 큰 누적 시간을 사용
+        packages[name] = max(packages.get(name, 0), int(parts[1]) / 1000)
+    return packages
+
+
+def run_importtime(code, source_root):
+    env = {
+        **os.environ,
+        **IMPORT_ENV,
+        "PYTHONPATH": str(source_root),
+        "PYTHONDONTWRITEBYTECODE": "1",
+    }
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=source_root,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import failed:\n{completed.stderr[-2000:]}")
+    return completed
+
+
+def measure(module, source_root, startup_packages):
+    completed = run_importtime(
+        MEASURE_SNIPPET.format(module=module), source_root
+    )
+    packages = {
+        name: ms
+        for name, ms in parse_importtime(completed.stderr).items()
+        if name not in startup_packages
+    }
+    return float(completed.stdout.strip().splitlines()[-1]), packages
+
+
+def report(module, source_root, runs, top):
+    # 인터프리터 시작 시 항상 import되는 모듈(site, encodings 등)은 제외
+    startup_packages = set(
+        parse_importtime(run_importtime("pass", source_root).stderr)
+    )
+    timings = []
+    packages = {}
+    for _ in range(runs):
+        elapsed, packages = measure(module, source_root, startup_packages)
+        timings.append(elapsed)
+    heaviest = sorted(
+        packages.items(), key=lambda item: item[1], reverse=True
+    )[:top]
+    return {
+        "handler": module,
+        "import_ms_median": round(statistics.median(timings), 1),
+        "import_ms_min": round(min(timings), 1),
+        "heaviest_imports_ms": {name: round(ms, 1) for name, ms in heaviest},
+    }
+
+
+def export_ref(ref, target_dir):
+    """git ref의 lambdas/ 디렉터리를 임시 디렉터리에 풀어 둡니다."""
+    archive = subprocess.run(
+        ["git", "archive", ref, "lambdas"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        check=True,
+    )
+    subprocess.run(
+        ["tar", "-x", "-C", str(target_dir)], input=archive.stdout, check=True
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Lambda 핸들러 import 시간 리포트"
+    )
+    parser.add_argument(
+        "--runs", type=int, default=5, help="핸들러별 측정 횟수 (중앙값 사용)"
+    )
+    parser.add_argument(
+        "--top", type=int, default=8, help="표시할 무거운 최상위 import 수"
+    )
+    parser.add_argument("--baseline-ref", help="비교할 git ref (예: HEAD~1)")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장할 경로")
+    args = parser.parse_args()
+
+    results = {
+        "current": [
+            report(module, PROJECT_ROOT, args.runs, args.top)
+            for module in HANDLERS
+        ]
+    }
+
+    if args.baseline_ref:
+        with tempfile.TemporaryDirectory() as baseline_root:
+            export_ref(args.baseline_ref, baseline_root)
+            results["baseline"] = [
+                report(module, baseline_root, args.runs, args.top)
+                for module in HANDLERS
+            ]
+
+    for label, entries in results.items():
+        print(f"== {label} ==")
+        for entry in entries:
+            print(
+                f"{entry['handler']:<45} "
+                f"median {entry['import_ms_median']:>8} ms  "
+                f"(min {entry['import_ms_min']} ms)"
+            )
+            for name, ms in entry["heaviest_imports_ms"].items():
+                print(f"    {name:<40} {ms:>8} ms")
+
+    if "baseline" in results:
+        print("== gain ==")
+        for current, baseline in zip(results["current"], results["baseline"]):
+            saved = round(
+                baseline["import_ms_median"] - current["import_ms_median"], 1
+            )
+            print(
+                f"{current['handler']:<45} "
+                f"{baseline['import_ms_median']} -> "
+                f"{current['import_ms_median']} ms ({saved:+} ms saved)"
+            )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
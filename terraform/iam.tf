@@ -50,6 +50,18 @@ resource "aws_iam_policy" "lambda_s3_access" {
           "arn:aws:s3:::${var.project_name}-*/*"
         ]
       },
+      {
+        # OCR/검색/분석 결과 캐시 저장 (ocr-cache/, retrieval-cache/, analysis-cache/ prefix)
+        Effect = "Allow"
+        Action = [
+          "s3:PutObject"
+        ]
+        Resource = [
+          "arn:aws:s3:::${var.project_name}-*/ocr-cache/*",
+          "arn:aws:s3:::${var.project_name}-*/retrieval-cache/*",
+          "arn:aws:s3:::${var.project_name}-*/analysis-cache/*"
+        ]
+      },
       {
         Effect = "Allow"
         Action = [
@@ -86,7 +98,7 @@ resource "aws_iam_policy" "lambda_sqs_access" {
           "sqs:GetQueueAttributes",
           "sqs:GetQueueUrl"
         ]
-        Resource = [aws_sqs_queue.analysis_results.arn, aws_sqs_queue.analysis_results_dlq.arn]
+        Resource = [aws_sqs_queue.analysis_results.arn, aws_sqs_queue.analysis_results_dlq.arn, aws_sqs_queue.analysis_partial_results.arn]
       },
       {
         Effect = "Allow"
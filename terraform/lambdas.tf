@@ -23,7 +23,11 @@ module "lambdas" {
   timeout     = try(each.value.timeout, 30)
   
   # 환경 변수
-  environment_variables = try(each.value.environment_variables, {})
+  # bedrock_lambda에는 스트리밍 부분 결과 큐 URL을 주입
+  environment_variables = merge(
+    try(each.value.environment_variables, {}),
+    each.key == "bedrock_lambda" ? { PARTIAL_RESULTS_QUEUE_URL = aws_sqs_queue.analysis_partial_results.id } : {}
+  )
   
   
   # 공통 설정
@@ -24,6 +24,16 @@ resource "aws_sqs_queue" "analysis_results" {
   tags = local.common_tags
 }
 
+# 부분 결과 큐: bedrock_lambda 스트리밍 모드에서 완성된 독소조항을 먼저 전달
+resource "aws_sqs_queue" "analysis_partial_results" {
+  name                       = "${var.project_name}-${var.environment}-analysis-partial-results"
+  visibility_timeout_seconds = 30
+  message_retention_seconds  = 3600
+  sqs_managed_sse_enabled    = true
+
+  tags = local.common_tags
+}
+
 output "sqs_analysis_results_arn" {
   description = "ARN of the analysis results SQS queue"
   value       = aws_sqs_queue.analysis_results.arn
@@ -39,3 +49,8 @@ output "sqs_analysis_results_dlq_arn" {
   value       = aws_sqs_queue.analysis_results_dlq.arn
 }
 
+
+output "sqs_analysis_partial_results_url" {
+  description = "URL of the analysis partial results SQS queue"
+  value       = aws_sqs_queue.analysis_partial_results.id
+}
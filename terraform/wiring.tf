@@ -11,7 +11,9 @@ resource "aws_lambda_function_event_invoke_config" "bedrock_success_to_sqs" {
     }
   }
 
-  maximum_retry_attempts = 0
+  # 스로틀링이 풀리지 않으면 핸들러가 ThrottledError를 다시 던지므로
+  # 비동기 재시도(1분, 2분 뒤)로 다시 분석하고, 그래도 실패하면 DLQ로 보냄
+  maximum_retry_attempts = 2
 }
 
 # SQS → analysis_result_loader 트리거 (이벤트 소스 매핑)
@@ -21,5 +23,8 @@ resource "aws_lambda_event_source_mapping" "sqs_to_analysis_result_loader" {
   batch_size                         = 10
   maximum_batching_window_in_seconds = 5
   enabled                            = true
+
+  # 실패한 메시지만 재전송 (핸들러가 batchItemFailures 반환)
+  function_response_types = ["ReportBatchItemFailures"]
 }
 
@@ -0,0 +1,113 @@
+import os
+import json
+import uuid
+
+import pytest
+
+from tests.helpers import make_analysis
+
+# 실제 Postgres가 필요한 테스트의 접속 문자열
+# (예: "host=localhost port=5432 dbname=postgres user=postgres")
+# 설정되지 않으면 해당 테스트는 건너뜀
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+# 백엔드(Spring Boot)가 관리하는 테이블 중 analysis_result_loader가 기록하는 부분
+SCHEMA_SQL = """
+    CREATE TABLE contracts (
+        id uuid PRIMARY KEY,
+        title varchar(255),
+        updated_at timestamp
+    );
+    CREATE TABLE contract_analyses (
+        id uuid PRIMARY KEY,
+        contract_id uuid REFERENCES contracts (id),
+        summary text,
+        status varchar(50),
+        ddobak_overall_comment text,
+        ddobak_warning_comment text,
+        ddobak_advice text,
+        process_status varchar(50),
+        updated_at timestamp
+    );
+    CREATE TABLE toxic_clauses (
+        id uuid PRIMARY KEY,
+        analysis_id uuid REFERENCES contract_analyses (id),
+        title varchar(255),
+        clause text,
+        reason text,
+        reason_reference text,
+        source_contract_tag_idx integer,
+        source_page_idx integer,
+        warn_level integer
+    );
+"""
+
+
+@pytest.fixture
+def pg_connection():
+    """테스트마다 새 스키마를 만들어 연결을 반환하고, 끝나면 스키마를 삭제합니다."""
+    if not TEST_DATABASE_URL:
+        pytest.skip(
+            "TEST_DATABASE_URL이 설정되지 않아 Postgres 테스트를 건너뜁니다"
+        )
+    psycopg2 = pytest.importorskip("psycopg2")
+
+    schema = f"loader_test_{uuid.uuid4().hex[:12]}"
+    admin = psycopg2.connect(TEST_DATABASE_URL)
+    admin.autocommit = True
+    with admin.cursor() as cursor:
+        cursor.execute(f"CREATE SCHEMA {schema}")
+
+    connection = psycopg2.connect(
+        TEST_DATABASE_URL, options=f"-c search_path={schema}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(SCHEMA_SQL)
+    connection.commit()
+    try:
+        yield connection
+    finally:
+        connection.close()
+        with admin.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+
+@pytest.fixture
+def sqs_record():
+    """Lambda Destinations 메시지를 담은 SQS 레코드를 만드는 함수를 반환합니다."""
+
+    def build(
+        contract_id, analysis_id, analysis=None, success=True, message_id=None
+    ):
+        body = {
+            "requestPayload": {
+                "contractId": contract_id,
+                "analysisId": analysis_id,
+            },
+            "responsePayload": {
+                "success": success,
+                "message": "",
+                "data": {
+                    "analysisResult": {
+                        "analysisResult": analysis or make_analysis()
+                    }
+                },
+            },
+        }
+        return {
+            "messageId": message_id or str(uuid.uuid4()),
+            "body": json.dumps(body, ensure_ascii=False),
+        }
+
+    return build
+
+
+@pytest.fixture
+def loader_db(pg_connection, monkeypatch):
+    """analysis_result_loader가 테스트 Postgres 연결을 warm 컨테이너의 재사용 연결로 쓰도록 합니다."""
+    from lambdas.analysis_result_loader import handler as loader
+
+    monkeypatch.setattr(loader, "_connection", pg_connection)
+    loader.mark_connection_used()
+    return pg_connection
@@ -0,0 +1,118 @@
+import io
+import json
+import uuid
+
+
+def make_analysis(title="근로계약서", toxic_count=2):
+    """bedrock_lambda 분석 결과(analysisResult) 형식의 합성 데이터를 만듭니다."""
+    return {
+        "title": title,
+        "summary": f"{title} 요약",
+        "ddobakCommentary": {
+            "overallComment": "전체 평가",
+            "warningComment": "주의 사항",
+            "advice": "조언",
+        },
+        "toxicCount": toxic_count,
+        "toxics": [
+            {
+                "title": f"독소조항 {idx}",
+                "clause": f"제{idx + 1}조 을은 어떠한 경우에도 이의를 제기할 수 없다.",
+                "reason": "일방적으로 불리합니다.",
+                "reasonReference": "민법 제103조",
+                "sourceContractTagIdx": idx,
+                "warnLevel": 2,
+            }
+            for idx in range(toxic_count)
+        ],
+    }
+
+
+def seed_contracts(connection, count):
+    """계약서/분석 행을 미리 만들고 (contract_id, analysis_id) 목록을 반환합니다."""
+    ids = [(str(uuid.uuid4()), str(uuid.uuid4())) for _ in range(count)]
+    with connection.cursor() as cursor:
+        for contract_id, analysis_id in ids:
+            cursor.execute(
+                "INSERT INTO contracts (id, title) VALUES (%s, %s)",
+                (contract_id, "업로드됨"),
+            )
+            cursor.execute(
+                "INSERT INTO contract_analyses "
+                "(id, contract_id, process_status) "
+                "VALUES (%s, %s, 'IN_PROGRESS')",
+                (analysis_id, contract_id),
+            )
+    connection.commit()
+    return ids
+
+
+class FakeRuntime:
+    """invoke_model에 정해 둔 답변을 돌려주고 요청 본문을 기록하는 가짜 bedrock-runtime."""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.requests = []
+
+    def invoke_model(self, modelId, body):
+        self.requests.append({"modelId": modelId, "body": json.loads(body)})
+        payload = {
+            "content": [{"type": "text", "text": self.answer}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": 100, "output_tokens": 50},
+        }
+        return {
+            "body": io.BytesIO(
+                json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            )
+        }
+
+
+class FakeStreamingRuntime:
+    """응답을 작은 조각의 스트림 이벤트로 나누어 돌려주는 가짜 bedrock-runtime.
+
+    invoke_model_with_response_stream의 이벤트 형식을 따릅니다.
+    """
+
+    def __init__(self, answer, chunk_size):
+        self.answer = answer
+        self.chunk_size = chunk_size
+
+    def invoke_model_with_response_stream(self, modelId, body):
+        def event(payload):
+            return {
+                "chunk": {
+                    "bytes": json.dumps(payload, ensure_ascii=False).encode(
+                        "utf-8"
+                    )
+                }
+            }
+
+        events = [
+            event(
+                {
+                    "type": "message_start",
+                    "message": {"usage": {"input_tokens": 100}},
+                }
+            )
+        ]
+        for start in range(0, len(self.answer), self.chunk_size):
+            text = self.answer[start:start + self.chunk_size]
+            events.append(
+                event(
+                    {
+                        "type": "content_block_delta",
+                        "delta": {"type": "text_delta", "text": text},
+                    }
+                )
+            )
+        events.append(
+            event(
+                {
+                    "type": "message_delta",
+                    "delta": {"stop_reason": "end_turn"},
+                    "usage": {"output_tokens": 50},
+                }
+            )
+        )
+        return {"body": iter(events)}
@@ -0,0 +1,88 @@
+import pytest
+
+from lambdas.common import cache as cache_module
+from lambdas.common.cache import TTLCache
+
+
+class DictStore:
+    """S3JsonStore와 같은 get/put 인터페이스의 메모리 저장소."""
+
+    def __init__(self, fail=False):
+        self.objects = {}
+        self.fail = fail
+
+    def get(self, key):
+        if self.fail:
+            raise RuntimeError("store unavailable")
+        return self.objects.get(key)
+
+    def put(self, key, payload):
+        if self.fail:
+            raise RuntimeError("store unavailable")
+        self.objects[key] = payload
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_evicts_least_recently_used_entry():
+    cache = TTLCache("test", max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache("test", ttl_seconds=60)
+    cache.put("a", 1)
+
+    clock[0] += 59
+    assert cache.get("a") == 1
+    clock[0] += 2
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 1, "persistent_hits": 0, "misses": 1}
+
+
+def test_entries_without_ttl_never_expire(clock):
+    cache = TTLCache("test")
+    cache.put("a", 1)
+
+    clock[0] += 10**9
+    assert cache.get("a") == 1
+
+
+def test_persistent_tier_is_shared_between_instances(clock):
+    store = DictStore()
+    TTLCache("test", ttl_seconds=60, persistent_tier=store).put("a", [1, 2])
+
+    other = TTLCache("test", ttl_seconds=60, persistent_tier=store)
+    assert other.get("a") == [1, 2]
+    assert other.get("a") == [1, 2]
+    assert other.stats() == {"hits": 1, "persistent_hits": 1, "misses": 0}
+
+    clock[0] += 61
+    assert (
+        TTLCache("test", ttl_seconds=60, persistent_tier=store).get("a")
+        is None
+    )
+
+
+def test_persistent_tier_errors_and_unknown_entries_are_misses():
+    cache = TTLCache("test", persistent_tier=DictStore(fail=True))
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    assert (
+        TTLCache("test", persistent_tier=DictStore(fail=True)).get("a") is None
+    )
+
+    store = DictStore()
+    store.objects["old"] = {"expires_at": None, "results": []}
+    assert TTLCache("test", persistent_tier=store).get("old") is None
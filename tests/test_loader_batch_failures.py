@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from lambdas.analysis_result_loader import handler as loader
+from tests.helpers import seed_contracts
+
+
+@pytest.fixture(params=["single_transaction", "per_record"])
+def batch_mode(request, monkeypatch):
+    monkeypatch.setattr(loader, "LOADER_BATCH_MODE", request.param)
+    return request.param
+
+
+def test_malformed_record_is_the_only_batch_item_failure(
+    loader_db, sqs_record, batch_mode
+):
+    ids = seed_contracts(loader_db, 3)
+    records = [
+        sqs_record(contract_id, analysis_id)
+        for contract_id, analysis_id in ids
+    ]
+    records.insert(1, {"messageId": "malformed", "body": "{not json"})
+
+    response = loader.lambda_handler({"Records": records}, None)
+
+    assert response["statusCode"] == 200
+    assert response["batchItemFailures"] == [{"itemIdentifier": "malformed"}]
+    assert json.loads(response["body"])["processed"] == 3
+    with loader_db.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM contract_analyses "
+            "WHERE process_status = 'COMPLETED'"
+        )
+        assert cursor.fetchone()[0] == 3
+
+
+def test_unsupported_payload_is_reported_as_failure(
+    loader_db, sqs_record, batch_mode
+):
+    ids = seed_contracts(loader_db, 1)
+    records = [
+        sqs_record(*ids[0]),
+        {
+            "messageId": "no-response-payload",
+            "body": json.dumps({"contractId": ids[0][0]}),
+        },
+    ]
+
+    response = loader.lambda_handler({"Records": records}, None)
+
+    assert response["batchItemFailures"] == [
+        {"itemIdentifier": "no-response-payload"}
+    ]
+
+
+def test_connection_failure_reports_every_message(sqs_record, monkeypatch):
+    def fail():
+        raise RuntimeError("could not connect to server")
+
+    monkeypatch.setattr(loader, "get_connection", fail)
+    records = [
+        sqs_record("contract", "analysis", message_id=f"message-{idx}")
+        for idx in range(3)
+    ]
+
+    response = loader.lambda_handler({"Records": records}, None)
+
+    assert response["statusCode"] == 500
+    assert response["batchItemFailures"] == [
+        {"itemIdentifier": f"message-{idx}"} for idx in range(3)
+    ]
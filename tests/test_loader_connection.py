@@ -0,0 +1,117 @@
+import time
+
+import psycopg2
+import psycopg2.extensions
+import pytest
+
+from lambdas.analysis_result_loader import handler as loader
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.connection.executed.append(query)
+        if self.connection.broken:
+            self.connection.closed = 2
+            raise psycopg2.OperationalError(
+                "server closed the connection unexpectedly"
+            )
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.status = psycopg2.extensions.STATUS_READY
+        self.broken = False
+        self.executed = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = psycopg2.extensions.STATUS_READY
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """get_db_connection이 새 FakeConnection을 만들 때마다 목록에 기록합니다."""
+    opened = []
+
+    def connect():
+        connection = FakeConnection()
+        opened.append(connection)
+        return connection
+
+    monkeypatch.setattr(loader, "get_db_connection", connect)
+    monkeypatch.setattr(loader, "_connection", None)
+    monkeypatch.setattr(loader, "_connection_last_used", 0.0)
+    return opened
+
+
+def test_reuses_recently_used_connection_without_health_check(connections):
+    first = loader.get_connection()
+    loader.mark_connection_used()
+
+    assert loader.get_connection() is first
+    assert len(connections) == 1
+    assert first.executed == []
+
+
+def test_health_checks_idle_connection_before_reuse(connections, monkeypatch):
+    first = loader.get_connection()
+    monkeypatch.setattr(
+        loader,
+        "_connection_last_used",
+        time.monotonic() - loader.DB_HEALTHCHECK_INTERVAL - 1,
+    )
+
+    assert loader.get_connection() is first
+    assert first.executed == ["SELECT 1"]
+    assert len(connections) == 1
+
+
+def test_reconnects_when_health_check_fails(connections, monkeypatch):
+    first = loader.get_connection()
+    first.broken = True
+    monkeypatch.setattr(
+        loader,
+        "_connection_last_used",
+        time.monotonic() - loader.DB_HEALTHCHECK_INTERVAL - 1,
+    )
+
+    second = loader.get_connection()
+
+    assert second is not first
+    assert first.closed
+    assert len(connections) == 2
+
+
+def test_reconnects_when_connection_was_closed(connections):
+    first = loader.get_connection()
+    loader.mark_connection_used()
+    first.closed = 1
+
+    assert loader.get_connection() is not first
+    assert len(connections) == 2
+
+
+def test_rolls_back_transaction_left_open_by_previous_invocation(connections):
+    first = loader.get_connection()
+    loader.mark_connection_used()
+    first.status = psycopg2.extensions.STATUS_IN_TRANSACTION
+
+    assert loader.get_connection() is first
+    assert first.rollbacks == 1
@@ -0,0 +1,94 @@
+import pytest
+
+from lambdas.analysis_result_loader import handler as loader
+from tests.helpers import make_analysis, seed_contracts
+
+
+@pytest.fixture(params=["single_transaction", "per_record"])
+def batch_mode(request, monkeypatch):
+    monkeypatch.setattr(loader, "LOADER_BATCH_MODE", request.param)
+    return request.param
+
+
+def stored_state(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT id, summary, updated_at FROM contract_analyses ORDER BY id"
+        )
+        analyses = cursor.fetchall()
+        cursor.execute(
+            "SELECT id, title, warn_level FROM toxic_clauses ORDER BY id"
+        )
+        clauses = cursor.fetchall()
+    return analyses, clauses
+
+
+def test_redelivered_message_is_skipped_by_fingerprint(
+    loader_db, sqs_record, batch_mode
+):
+    ids = seed_contracts(loader_db, 2)
+    records = [
+        sqs_record(contract_id, analysis_id)
+        for contract_id, analysis_id in ids
+    ]
+    assert (
+        loader.lambda_handler({"Records": records}, None)["batchItemFailures"]
+        == []
+    )
+    before = stored_state(loader_db)
+
+    # SQS 재전송: 같은 내용의 메시지가 다른 messageId로 다시 도착
+    redelivered = [
+        sqs_record(contract_id, analysis_id)
+        for contract_id, analysis_id in ids
+    ]
+    response = loader.lambda_handler({"Records": redelivered}, None)
+
+    assert response["batchItemFailures"] == []
+    assert response["metadata"]["metrics"]["counters"]["processed"] == 2
+    # updated_at까지 그대로이면 UPDATE/upsert가 실행되지 않은 것
+    assert stored_state(loader_db) == before
+
+
+def test_changed_result_for_same_analysis_is_written(
+    loader_db, sqs_record, batch_mode
+):
+    ids = seed_contracts(loader_db, 1)
+    contract_id, analysis_id = ids[0]
+    loader.lambda_handler(
+        {
+            "Records": [
+                sqs_record(
+                    contract_id, analysis_id, make_analysis(toxic_count=3)
+                )
+            ]
+        },
+        None,
+    )
+
+    updated = make_analysis(toxic_count=1)
+    updated["summary"] = "다시 분석한 요약"
+    loader.lambda_handler(
+        {"Records": [sqs_record(contract_id, analysis_id, updated)]}, None
+    )
+
+    analyses, clauses = stored_state(loader_db)
+    assert analyses[0][1] == "다시 분석한 요약"
+    # 줄어든 독소조항은 삭제되고 남은 조항은 결정적 ID를 유지
+    assert [clause[0] for clause in clauses] == [
+        loader.toxic_clause_id(analysis_id, 0)
+    ]
+
+
+def test_fingerprint_matches_stored_rows(loader_db, sqs_record):
+    ids = seed_contracts(loader_db, 1)
+    contract_id, analysis_id = ids[0]
+    record = sqs_record(contract_id, analysis_id)
+    loader.lambda_handler({"Records": [record]}, None)
+
+    analysis_result, _, _ = loader.process_sqs_message(record["body"])
+    stored = loader.fetch_stored_fingerprints(loader_db, [analysis_id])
+
+    assert stored[analysis_id] == loader.message_fingerprint(
+        analysis_result, analysis_id
+    )
@@ -0,0 +1,151 @@
+import pytest
+
+from lambdas.analysis_result_loader import handler as loader
+from tests.helpers import make_analysis, seed_contracts
+
+
+@pytest.fixture
+def no_per_record_fallback(monkeypatch):
+    """레코드별 기록 경로가 호출되면 실패하도록 하여 집합 기반 문장이 실제로 실행됐는지 확인합니다."""
+
+    def fail(*args, **kwargs):
+        raise AssertionError(
+            "set-based batch write fell back to per-record writes"
+        )
+
+    monkeypatch.setattr(loader, "write_analysis_record", fail)
+
+
+def test_bulk_updates_run_against_uuid_columns(pg_connection):
+    ids = seed_contracts(pg_connection, 3)
+
+    loader.bulk_update_contract_titles(
+        pg_connection,
+        {
+            contract_id: f"계약서 {idx}"
+            for idx, (contract_id, _) in enumerate(ids)
+        },
+    )
+    loader.bulk_update_contract_analyses(
+        pg_connection,
+        {
+            analysis_id: {"success": True, "data": make_analysis()}
+            for _, analysis_id in ids
+        },
+    )
+    loader.replace_toxic_clauses(
+        pg_connection,
+        {analysis_id: make_analysis()["toxics"] for _, analysis_id in ids},
+    )
+    pg_connection.commit()
+
+    with pg_connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM contracts WHERE title LIKE '계약서 %%'"
+        )
+        assert cursor.fetchone()[0] == 3
+        cursor.execute(
+            "SELECT count(*) FROM contract_analyses "
+            "WHERE process_status = 'COMPLETED'"
+        )
+        assert cursor.fetchone()[0] == 3
+        cursor.execute("SELECT count(*) FROM toxic_clauses")
+        assert cursor.fetchone()[0] == 6
+
+
+def test_single_transaction_batch_uses_set_based_path(
+    pg_connection, sqs_record, no_per_record_fallback
+):
+    ids = seed_contracts(pg_connection, 4)
+    records = [
+        sqs_record(contract_id, analysis_id)
+        for contract_id, analysis_id in ids
+    ]
+
+    loader.metrics.reset()
+    processed, failed_ids = loader.process_batch_single_transaction(
+        pg_connection, records
+    )
+
+    assert (processed, failed_ids) == (4, [])
+    assert "batch_write_fallbacks" not in loader.metrics.summary()["counters"]
+    with pg_connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM contract_analyses "
+            "WHERE process_status = 'COMPLETED'"
+        )
+        assert cursor.fetchone()[0] == 4
+        cursor.execute("SELECT count(*) FROM toxic_clauses")
+        assert cursor.fetchone()[0] == 8
+
+
+def test_invalid_id_falls_back_per_record_and_fails_only_that_message(
+    pg_connection, sqs_record
+):
+    ids = seed_contracts(pg_connection, 2)
+    records = [
+        sqs_record(contract_id, analysis_id)
+        for contract_id, analysis_id in ids
+    ]
+    bad_record = sqs_record("unknown", "unknown", message_id="bad-message")
+
+    loader.metrics.reset()
+    processed, failed_ids = loader.process_batch_single_transaction(
+        pg_connection, records + [bad_record]
+    )
+
+    assert (processed, failed_ids) == (2, ["bad-message"])
+    assert loader.metrics.summary()["counters"]["batch_write_fallbacks"] == 1
+    with pg_connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM contract_analyses "
+            "WHERE process_status = 'COMPLETED'"
+        )
+        assert cursor.fetchone()[0] == 2
+
+
+def test_handler_writes_batch_set_based_by_default(
+    loader_db, sqs_record, no_per_record_fallback
+):
+    ids = seed_contracts(loader_db, 10)
+    records = [
+        sqs_record(contract_id, analysis_id)
+        for contract_id, analysis_id in ids
+    ]
+
+    response = loader.lambda_handler({"Records": records}, None)
+
+    assert response["statusCode"] == 200
+    assert response["batchItemFailures"] == []
+    counters = response["metadata"]["metrics"]["counters"]
+    assert counters["processed"] == 10
+    assert "batch_write_fallbacks" not in counters
+    assert (
+        response["metadata"]["metrics"]["timings"]["db_commit"]["count"] == 1
+    )
+
+
+def test_toxic_clause_location_keeps_page_and_defaults_missing_tag(
+    pg_connection,
+):
+    ids = seed_contracts(pg_connection, 1)
+    analysis_id = ids[0][1]
+    toxics = make_analysis(toxic_count=3)["toxics"]
+    # 요소 id는 페이지마다 0부터 시작하므로 페이지와 함께 구분
+    toxics[0].update({"sourceContractTagIdx": 0, "sourcePageIdx": 0})
+    toxics[1].update({"sourceContractTagIdx": 0, "sourcePageIdx": 1})
+    toxics[2].update({"sourceContractTagIdx": None})
+
+    loader.replace_toxic_clauses(pg_connection, {analysis_id: toxics})
+    pg_connection.commit()
+
+    with pg_connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT title, source_page_idx, source_contract_tag_idx "
+            "FROM toxic_clauses ORDER BY title"
+        )
+        assert cursor.fetchall() == [
+            ("독소조항 0", 0, 0),
+            ("독소조항 1", 1, 0),
+            ("독소조항 2", None, 0),
+        ]
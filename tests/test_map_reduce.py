@@ -0,0 +1,93 @@
+from lambdas.bedrock_lambda.map_reduce import merge_toxics, split_into_chunks
+
+
+def test_pages_are_grouped_without_crossing_page_boundaries():
+    pages = [f"{idx}" * 40 for idx in range(5)]
+
+    chunks = split_into_chunks(pages, 100)
+
+    # "Page N:\n" 머리말을 더한 페이지 2개가 한 청크에 들어감
+    assert [chunk["index"] for chunk in chunks] == [0, 1, 2]
+    assert [chunk["text"].count("Page ") for chunk in chunks] == [2, 2, 1]
+    assert chunks[0]["text"] == (
+        f"Page 1:\n{pages[0]}\n---\nPage 2:\n{pages[1]}"
+    )
+    assert chunks[2]["text"] == f"Page 5:\n{pages[4]}"
+
+
+def test_long_page_is_split_on_line_boundaries():
+    lines = [f"제{idx}조 {'가' * 20}\n" for idx in range(1, 11)]
+
+    chunks = split_into_chunks(["".join(lines)], 80)
+
+    assert len(chunks) > 1
+    bodies = []
+    for chunk in chunks:
+        header, body = chunk["text"].split("\n", 1)
+        # 나뉜 조각도 원래 페이지 번호를 유지
+        assert header == "Page 1:"
+        assert len(body) <= 80
+        bodies.append(body)
+    # 줄 중간에서 잘리지 않고 순서대로 모두 포함
+    assert "".join(bodies) == "".join(lines)
+
+
+def test_small_contract_is_a_single_chunk():
+    chunks = split_into_chunks(["첫 페이지", "둘째 페이지"], 15000)
+
+    assert chunks == [
+        {"index": 0, "text": "Page 1:\n첫 페이지\n---\nPage 2:\n둘째 페이지"}
+    ]
+
+
+def chunk(index):
+    return {"index": index, "text": ""}
+
+
+def test_merge_keeps_higher_warn_level_for_same_clause():
+    first = {
+        "title": "해지",
+        "clause": "갑은 언제든지 계약을 해지할 수 있다.",
+        "warnLevel": 2,
+    }
+    # 청크 경계에서 다시 발견된 같은 조항 (공백만 다름)
+    repeated = {
+        "title": "일방적 해지",
+        "clause": "갑은  언제든지\n계약을 해지할 수 있다.",
+        "warnLevel": 3,
+    }
+    other = {"title": "위약금", "clause": "을은 위약금을 낸다.", "warnLevel": 1}
+
+    merged = merge_toxics(
+        [
+            (chunk(0), {"toxics": [first, other]}),
+            (chunk(1), {"toxics": [repeated]}),
+        ]
+    )
+
+    assert merged == [repeated, other]
+
+
+def test_merge_keeps_first_when_warn_level_is_not_higher():
+    first = {"title": "해지", "clause": "갑은 해지한다.", "warnLevel": 3}
+    lower = {"title": "해지 2", "clause": "갑은 해지한다.", "warnLevel": 2}
+
+    merged = merge_toxics(
+        [(chunk(0), {"toxics": [first]}), (chunk(1), {"toxics": [lower]})]
+    )
+
+    assert merged == [first]
+
+
+def test_toxics_without_clause_are_kept_per_chunk():
+    toxic = {"title": "불명확한 조항", "clause": "", "warnLevel": 1}
+
+    merged = merge_toxics(
+        [
+            (chunk(0), {"toxics": [toxic]}),
+            (chunk(1), {"toxics": [dict(toxic)]}),
+            (chunk(2), {"toxics": None}),
+        ]
+    )
+
+    assert len(merged) == 2
@@ -0,0 +1,117 @@
+import time
+
+import pytest
+
+from lambdas.ocr_lambda import handler
+
+
+@pytest.fixture
+def bucket(monkeypatch):
+    monkeypatch.setenv("S3_BUCKET", "contracts")
+    return "contracts"
+
+
+@pytest.fixture
+def fake_pages(monkeypatch):
+    """process_page를 키별로 정해 둔 결과를 돌려주는 가짜로 바꾸고, 호출을 기록합니다.
+
+    앞 페이지일수록 늦게 끝나도록 하여 완료 순서와 응답 순서가 다르게 만듭니다.
+    """
+    failures = {}
+    calls = []
+
+    def process_page(bucket, key, page_num):
+        calls.append((bucket, key, page_num))
+        time.sleep(0.01 * (3 - page_num))
+        if key in failures:
+            return failures[key]
+        return {
+            "success": True,
+            "message": "",
+            "data": {"page_idx": page_num, "html_entire": f"<p>{key}</p>"},
+        }
+
+    monkeypatch.setattr(handler, "process_page", process_page)
+    monkeypatch.setattr(handler, "OCR_MAX_WORKERS", 3)
+    return failures, calls
+
+
+def batch_event(*page_indexes):
+    return {
+        "pages": [
+            {"s3Key": f"contract/page-{idx}.png", "pageIdx": idx}
+            for idx in page_indexes
+        ]
+    }
+
+
+def test_batch_results_are_ordered_by_page_idx(bucket, fake_pages):
+    _, calls = fake_pages
+
+    response = handler.lambda_handler(batch_event(2, 0, 1), None)
+
+    assert sorted(calls) == [
+        (bucket, f"contract/page-{idx}.png", idx) for idx in range(3)
+    ]
+    pages = response["data"]["pages"]
+    assert [page["pageIdx"] for page in pages] == [0, 1, 2]
+    assert [page["data"]["page_idx"] for page in pages] == [0, 1, 2]
+    assert [page["s3Key"] for page in pages] == [
+        f"contract/page-{idx}.png" for idx in range(3)
+    ]
+
+
+def test_batch_response_shape(bucket, fake_pages):
+    response = handler.lambda_handler(batch_event(0, 1), None)
+
+    assert set(response) == {"success", "message", "data", "metadata"}
+    assert (response["success"], response["message"]) == (True, "")
+    assert set(response["data"]) == {"pages"}
+    assert set(response["data"]["pages"][0]) == {
+        "pageIdx",
+        "s3Key",
+        "success",
+        "message",
+        "data",
+    }
+    counters = response["metadata"]["metrics"]["counters"]
+    assert counters["pages"] == 2
+    assert counters["failed_pages"] == 0
+
+
+def test_failed_pages_become_failure_entries(bucket, fake_pages):
+    failures, _ = fake_pages
+    failures["contract/page-1.png"] = {"error": "Unsupported file type: gif"}
+    failures["contract/page-2.png"] = {
+        "success": False,
+        "message": "OCR API request failed with status 500",
+        "data": {},
+    }
+
+    response = handler.lambda_handler(batch_event(0, 1, 2), None)
+
+    assert response["success"] is False
+    assert response["message"] == "OCR failed for 2 of 3 pages"
+    pages = response["data"]["pages"]
+    assert pages[0]["success"] is True
+    # error 형태의 응답도 다른 실패와 같은 형식으로 정규화
+    assert pages[1] == {
+        "pageIdx": 1,
+        "s3Key": "contract/page-1.png",
+        "success": False,
+        "message": "Unsupported file type: gif",
+        "data": {},
+    }
+    assert pages[2]["message"] == "OCR API request failed with status 500"
+    counters = response["metadata"]["metrics"]["counters"]
+    assert counters["failed_pages"] == 2
+
+
+def test_unsupported_file_in_batch_fails_without_s3_access(bucket):
+    response = handler.lambda_handler(
+        {"pages": [{"s3Key": "contract/page-0.gif", "pageIdx": 0}]}, None
+    )
+
+    page = response["data"]["pages"][0]
+    assert (page["pageIdx"], page["success"]) == (0, False)
+    assert page["message"].startswith("Unsupported file type: gif")
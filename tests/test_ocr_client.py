@@ -0,0 +1,200 @@
+import io
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from lambdas.ocr_lambda import ocr_client
+from lambdas.ocr_lambda.ocr_client import UpstageOCRClient
+
+DOCUMENT = b"\x89PNG fake page image" * 100
+
+
+class UpstageStub:
+    """정해 둔 순서대로 응답하는 로컬 Upstage OCR API 스텁."""
+
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-alive 연결 재사용을 확인할 수 있도록 HTTP/1.1 사용
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                stub.requests.append(
+                    {
+                        "headers": dict(self.headers),
+                        "body": body,
+                        "client_port": self.client_address[1],
+                    }
+                )
+                status, headers, payload = (
+                    stub.responses.pop(0)
+                    if stub.responses
+                    else (200, {}, {"ok": True})
+                )
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        port = self.server.server_address[1]
+        self.url = f"http://127.0.0.1:{port}/v1/document-digitization"
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    def respond(self, status, headers=None, payload=None):
+        self.responses.append(
+            (status, headers or {}, payload or {"status": status})
+        )
+
+
+@pytest.fixture
+def stub():
+    server = UpstageStub()
+    server.thread.start()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """재시도 대기 시간을 실제로 기다리지 않고 기록합니다."""
+    recorded = []
+    monkeypatch.setattr(ocr_client.time, "sleep", recorded.append)
+    return recorded
+
+
+def make_client(url, **kwargs):
+    options = {
+        "api_key": "test-key",
+        "max_retries": 2,
+        "backoff_base": 0.5,
+        "backoff_max": 4,
+    }
+    options.update(kwargs)
+    return UpstageOCRClient(url=url, **options)
+
+
+def open_document():
+    return io.BytesIO(DOCUMENT), len(DOCUMENT)
+
+
+def digitize(client):
+    return client.digitize(
+        open_document,
+        "page.png",
+        "image/png",
+        {"model": "document-parse", "ocr": "force"},
+    )
+
+
+def test_success_uploads_multipart_document(stub, sleeps):
+    response = digitize(make_client(stub.url))
+
+    assert response.status_code == 200
+    assert sleeps == []
+    request = stub.requests[0]
+    assert request["headers"]["Authorization"] == "Bearer test-key"
+    assert request["headers"]["Content-Type"].startswith(
+        "multipart/form-data; boundary="
+    )
+    assert int(request["headers"]["Content-Length"]) == len(request["body"])
+    assert DOCUMENT in request["body"]
+    assert b'name="model"\r\n\r\ndocument-parse' in request["body"]
+
+
+def test_retries_429_honoring_retry_after(stub, sleeps):
+    stub.respond(429, {"Retry-After": "1.5"})
+
+    response = digitize(make_client(stub.url))
+
+    assert response.status_code == 200
+    assert sleeps == [1.5]
+    # 재시도마다 문서 스트림을 다시 열어 전체 본문을 보냄
+    assert len(stub.requests) == 2
+    assert all(DOCUMENT in request["body"] for request in stub.requests)
+
+
+def test_retry_after_is_capped_by_backoff_max(stub, sleeps):
+    stub.respond(503, {"Retry-After": "120"})
+
+    digitize(make_client(stub.url, backoff_max=4))
+
+    assert sleeps == [4]
+
+
+def test_invalid_retry_after_falls_back_to_jittered_backoff(stub, sleeps):
+    stub.respond(429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+
+    digitize(make_client(stub.url))
+
+    assert len(sleeps) == 1
+    assert 0 <= sleeps[0] <= 0.5
+
+
+def test_exponential_backoff_then_returns_last_retryable_response(
+    stub, sleeps
+):
+    for _ in range(3):
+        stub.respond(502)
+
+    response = digitize(make_client(stub.url, max_retries=2, backoff_base=0.5))
+
+    assert response.status_code == 502
+    assert len(stub.requests) == 3
+    assert len(sleeps) == 2
+    # full jitter: attempt번째 대기는 0 ~ base * 2^attempt
+    assert 0 <= sleeps[0] <= 0.5
+    assert 0 <= sleeps[1] <= 1.0
+
+
+def test_non_retryable_status_is_returned_immediately(stub, sleeps):
+    stub.respond(400, payload={"message": "invalid document"})
+
+    response = digitize(make_client(stub.url))
+
+    assert response.status_code == 400
+    assert len(stub.requests) == 1
+    assert sleeps == []
+
+
+def test_connection_errors_are_retried_then_raised(sleeps):
+    # 바인딩만 하고 닫은 포트로 연결 거부를 재현
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    client = make_client(
+        f"http://127.0.0.1:{port}/v1/document-digitization", max_retries=2
+    )
+    with pytest.raises(requests.exceptions.ConnectionError):
+        digitize(client)
+
+    assert len(sleeps) == 2
+
+
+def test_session_reuses_keep_alive_connection(stub, sleeps):
+    client = make_client(stub.url)
+
+    digitize(client)
+    digitize(client)
+
+    assert len(stub.requests) == 2
+    assert stub.requests[0]["client_port"] == stub.requests[1]["client_port"]
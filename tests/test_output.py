@@ -0,0 +1,222 @@
+import json
+
+import pytest
+
+from lambdas.bedrock_lambda import handler
+from lambdas.bedrock_lambda.normalize import normalize_contract_pages
+from lambdas.bedrock_lambda.output import (
+    MAX_TOKENS_CEILING,
+    MAX_TOKENS_FLOOR,
+    compute_max_tokens,
+    finalize_toxic,
+    finalize_toxics,
+    restore_source_location,
+)
+from tests.helpers import FakeRuntime, FakeStreamingRuntime
+
+# Upstage 요소 id는 페이지마다 0부터 다시 시작
+PAGES = [
+    "<h1 id='0'>근로계약서</h1><p id='1'>제1조 (목적) 이 계약은 근로 조건을 정한다.</p>",
+    "<p id='0'>제2조 (해지) 갑은 언제든지 사전 통지 없이 계약을 해지할 수 있다.</p>",
+]
+
+
+def model_answer(toxic):
+    return json.dumps(
+        {
+            "title": "근로계약서",
+            "summary": "요약",
+            "ddobakCommentary": {
+                "overallComment": "",
+                "warningComment": "",
+                "advice": "",
+            },
+            "toxicCount": 1,
+            "toxics": [toxic],
+        },
+        ensure_ascii=False,
+    )
+
+
+@pytest.fixture
+def tag_map():
+    return normalize_contract_pages(PAGES)[1]
+
+
+def test_restores_upstage_element_id_and_page(tag_map):
+    toxic = restore_source_location(
+        {"title": "해지", "sourceContractTagIdx": 2}, tag_map
+    )
+
+    assert toxic["sourceContractTagIdx"] == 0
+    assert toxic["sourcePageIdx"] == 1
+
+
+@pytest.mark.parametrize("toxic", [{"sourceContractTagIdx": 99}, {}])
+def test_unknown_ordinal_falls_back_to_first_element(tag_map, toxic):
+    # 정규화 번호(99)가 요소 id로 새지 않고, 저장 경로가 다루는 기본값으로 대체
+    toxic = restore_source_location(toxic, tag_map)
+
+    assert (toxic["sourcePageIdx"], toxic["sourceContractTagIdx"]) == (0, 0)
+
+
+def test_compact_toxic_is_rehydrated_then_restored(tag_map):
+    toxic = finalize_toxic(
+        {
+            "title": "해지",
+            "clauseStart": "갑은 언제든지",
+            "sourceContractTagIdx": 2,
+        },
+        tag_map,
+        True,
+    )
+
+    assert (
+        toxic["clause"]
+        == "제2조 (해지) 갑은 언제든지 사전 통지 없이 계약을 해지할 수 있다."
+    )
+    assert (toxic["sourcePageIdx"], toxic["sourceContractTagIdx"]) == (1, 0)
+
+
+def test_string_tag_index_locates_element(tag_map):
+    toxic = finalize_toxic(
+        {"title": "해지", "clauseStart": "", "sourceContractTagIdx": "2"},
+        tag_map,
+        True,
+    )
+
+    assert (
+        toxic["clause"]
+        == "제2조 (해지) 갑은 언제든지 사전 통지 없이 계약을 해지할 수 있다."
+    )
+    assert toxic["sourceContractTagIdx"] == 0
+
+
+def test_unlocatable_compact_toxic_is_dropped_instead_of_empty_clause(tag_map):
+    analysis = {
+        "toxics": [
+            {
+                "title": "위치 불명",
+                "clauseStart": "",
+                "sourceContractTagIdx": "unknown",
+            },
+            {
+                "title": "해지",
+                "clauseStart": "갑은 언제든지",
+                "sourceContractTagIdx": 2,
+            },
+        ]
+    }
+
+    finalize_toxics(analysis, tag_map, compact=True)
+
+    assert [toxic["title"] for toxic in analysis["toxics"]] == ["해지"]
+    assert analysis["toxicCount"] == 1
+
+
+def test_max_tokens_for_typical_contract_stays_well_below_ceiling():
+    # 정규화 후 약 2만 자(10페이지 안팎)의 계약서
+    contract_text = "가" * 20000
+
+    assert compute_max_tokens(contract_text) <= 2500
+    assert compute_max_tokens(
+        contract_text, compact=True
+    ) < compute_max_tokens(contract_text)
+
+
+def test_max_tokens_bounds():
+    assert compute_max_tokens("짧은 계약서") == MAX_TOKENS_FLOOR
+    assert compute_max_tokens("가" * 200000) == MAX_TOKENS_CEILING
+
+
+@pytest.fixture
+def offline_handler(monkeypatch):
+    monkeypatch.setattr(
+        handler,
+        "retrieve_relevant_context",
+        lambda contract_text, model_id: None,
+    )
+    published = []
+    monkeypatch.setattr(
+        handler,
+        "publish_partial_toxic",
+        lambda contract_id, analysis_id, idx, toxic: published.append(toxic),
+    )
+    return published
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("map_reduce", [False, True])
+def test_handler_returns_original_element_ids(
+    monkeypatch, offline_handler, compact, map_reduce
+):
+    toxic = {
+        "title": "해지",
+        "reason": "",
+        "reasonReference": "",
+        "sourceContractTagIdx": 2,
+        "warnLevel": 3,
+    }
+    toxic.update(
+        {"clauseStart": "갑은 언제든지"}
+        if compact
+        else {"clause": "갑은 언제든지 계약을 해지할 수 있다."}
+    )
+    monkeypatch.setattr(
+        handler, "bedrock_runtime", FakeRuntime(model_answer(toxic))
+    )
+
+    response = handler.lambda_handler(
+        {
+            "contractId": "c1",
+            "analysisId": "a1",
+            "contractTexts": PAGES,
+            "normalizeInput": True,
+            "compactOutput": compact,
+            "mapReduce": map_reduce,
+            "bypassCache": True,
+        },
+        None,
+    )
+
+    toxics = response["data"]["analysisResult"]["analysisResult"]["toxics"]
+    assert [
+        (item["sourcePageIdx"], item["sourceContractTagIdx"])
+        for item in toxics
+    ] == [(1, 0)]
+
+
+def test_streamed_partial_toxics_use_original_element_ids(
+    monkeypatch, offline_handler
+):
+    toxic = {
+        "title": "해지",
+        "clause": "갑은 언제든지",
+        "sourceContractTagIdx": 1,
+        "warnLevel": 3,
+    }
+    monkeypatch.setattr(
+        handler,
+        "bedrock_runtime",
+        FakeStreamingRuntime(model_answer(toxic), 7),
+    )
+
+    response = handler.lambda_handler(
+        {
+            "contractId": "c1",
+            "analysisId": "a1",
+            "contractTexts": PAGES,
+            "normalizeInput": True,
+            "stream": True,
+            "mapReduce": False,
+            "bypassCache": True,
+        },
+        None,
+    )
+
+    final = response["data"]["analysisResult"]["analysisResult"]["toxics"]
+    assert offline_handler == final
+    assert (final[0]["sourcePageIdx"], final[0]["sourceContractTagIdx"]) == (
+        0,
+        1,
+    )
@@ -0,0 +1,58 @@
+import threading
+import time
+
+from lambdas.pipeline.stages import build_pipeline
+
+
+class FakeBackends:
+    """분석 호출이 겹치는지 기록하는 가짜 백엔드."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.analyzing = 0
+        self.max_concurrent_analyses = 0
+        self.persisted = []
+
+    def ocr_pages(self, pages):
+        time.sleep(0.01)
+        return [
+            {
+                "success": True,
+                "pageIdx": page["pageIdx"],
+                "data": {"html_entire": "<p>제1조</p>"},
+            }
+            for page in pages
+        ]
+
+    def analyze(self, request_payload):
+        with self.lock:
+            self.analyzing += 1
+            self.max_concurrent_analyses = max(
+                self.max_concurrent_analyses, self.analyzing
+            )
+        time.sleep(0.02)
+        with self.lock:
+            self.analyzing -= 1
+        return {"success": True, "data": {}}
+
+    def persist(self, request_payload, response_payload):
+        self.persisted.append(request_payload["contractId"])
+
+
+def test_default_pipeline_runs_one_analysis_at_a_time():
+    backends = FakeBackends()
+    contracts = [
+        {
+            "contractId": f"c{idx}",
+            "analysisId": f"a{idx}",
+            "pages": [{"s3Key": "k", "pageIdx": 0}],
+        }
+        for idx in range(4)
+    ]
+
+    results, summary = build_pipeline(backends).run(contracts)
+
+    assert backends.max_concurrent_analyses == 1
+    assert sorted(backends.persisted) == ["c0", "c1", "c2", "c3"]
+    assert summary["contracts"] == 4
+    assert all("error" not in item for item in results)
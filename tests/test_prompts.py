@@ -0,0 +1,28 @@
+import pytest
+
+from lambdas.bedrock_lambda.prompts import get_prompt_template
+
+
+@pytest.mark.parametrize(
+    "language, marker",
+    [
+        ("en", "Respond only in the following exact JSON format"),
+        ("ko", "다음의 정확한 JSON 형식으로만 응답하세요"),
+    ],
+)
+def test_compact_template_keeps_output_format_language(language, marker):
+    full = get_prompt_template(language)
+    compact = get_prompt_template(language, compact=True)
+
+    instructions = compact.render("계약서 본문")
+    assert marker in instructions
+    assert '"clauseStart"' in instructions
+    assert '"clause":' not in instructions
+    assert compact.version != full.version
+
+
+def test_korean_compact_template_has_no_english_output_format():
+    instructions = get_prompt_template("ko", compact=True).render("계약서")
+
+    assert "Respond only in the following" not in instructions
+    assert "COMPACT format" not in instructions
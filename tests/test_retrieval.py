@@ -0,0 +1,44 @@
+from lambdas.bedrock_lambda.map_reduce import format_page
+from lambdas.bedrock_lambda.normalize import normalize_contract_pages
+from lambdas.bedrock_lambda.retrieval import (
+    build_retrieval_queries,
+    contract_to_plain_text,
+)
+
+PAGE_HTML = (
+    "<h1 id='0'>근로계약서</h1>"
+    "<p id='1'>제1조(목적) 이 계약은 갑과 을의 근로 조건을 정함을 목적으로 한다.</p>"
+    "<p id='2'>제2조 (근로시간) 근로시간은 제1조에 따라 정하며 주 40시간으로 한다.</p>"
+    "<p id='3'>제3조 위약금 을은 계약을 위반하면 제2조의 근로시간과 무관하게 위약금을 지급한다.</p>"
+)
+
+
+def normalized_text():
+    pages, _, _ = normalize_contract_pages([PAGE_HTML])
+    return "\n---\n".join(
+        format_page(idx, page) for idx, page in enumerate(pages)
+    )
+
+
+def test_plain_text_strips_element_markers_and_page_headers():
+    plain = contract_to_plain_text(normalized_text())
+
+    assert "[" not in plain
+    assert "Page 1:" not in plain
+    assert plain.splitlines()[0] == "근로계약서"
+
+
+def test_queries_split_only_on_clause_headings_at_line_start():
+    queries = build_retrieval_queries(normalized_text(), max_queries=8)
+
+    assert len(queries) == 3
+    assert queries[1].startswith("제2조 (근로시간)")
+    # 본문 속 "제1조에 따라" 참조에서는 나누지 않음
+    assert "제1조에 따라 정하며 주 40시간" in queries[1]
+    assert all("[" not in query for query in queries)
+
+
+def test_queries_from_raw_ocr_html():
+    queries = build_retrieval_queries(PAGE_HTML, max_queries=8)
+
+    assert [query[:3] for query in queries] == ["제1조", "제2조", "제3조"]
@@ -0,0 +1,148 @@
+import json
+
+import pytest
+
+from lambdas.bedrock_lambda import handler
+from lambdas.bedrock_lambda.normalize import normalize_contract_pages
+from tests.helpers import FakeRuntime
+
+# 페이지 3개 x 요소 4개 (정규화 요소 번호 0-11, "제{번호 + 1}조")
+PAGES = [
+    "".join(
+        f"<p id='{element}'>제{page * 4 + element + 1}조 {'가' * 30}</p>"
+        for element in range(4)
+    )
+    for page in range(3)
+]
+
+ANALYSIS_ANSWER = json.dumps(
+    {
+        "title": "근로계약서",
+        "summary": "요약",
+        "ddobakCommentary": {
+            "overallComment": "",
+            "warningComment": "",
+            "advice": "",
+        },
+        "toxicCount": 0,
+        "toxics": [],
+    },
+    ensure_ascii=False,
+)
+
+
+class RoutingRuntime:
+    """모델 ID별로 정해 둔 답변을 돌려주는 가짜 bedrock-runtime."""
+
+    def __init__(self, screen_answer):
+        self.screen = FakeRuntime(screen_answer)
+        self.analysis = FakeRuntime(ANALYSIS_ANSWER)
+
+    def invoke_model(self, modelId, body):
+        if modelId == handler.SCREEN_MODEL_ID:
+            return self.screen.invoke_model(modelId, body)
+        return self.analysis.invoke_model(modelId, body)
+
+
+@pytest.fixture
+def routing(monkeypatch):
+    """선별 응답을 받아 가짜 런타임을 설치하고 반환하는 함수를 돌려줍니다."""
+    monkeypatch.setattr(handler, "ROUTING_MIN_CHARS", 0)
+    monkeypatch.setattr(handler, "SCREEN_CONTEXT_RADIUS", 1)
+    monkeypatch.setattr(handler, "ROUTING_HEADER_ELEMENTS", 1)
+    monkeypatch.setattr(handler, "ROUTING_MAX_SELECTED_RATIO", 0.7)
+    monkeypatch.setattr(
+        handler,
+        "retrieve_relevant_context",
+        lambda contract_text, model_id: None,
+    )
+
+    def install(screen_answer):
+        if not isinstance(screen_answer, str):
+            screen_answer = json.dumps(screen_answer, ensure_ascii=False)
+        runtime = RoutingRuntime(screen_answer)
+        monkeypatch.setattr(handler, "bedrock_runtime", runtime)
+        return runtime
+
+    return install
+
+
+@pytest.fixture
+def normalized():
+    pages, tag_map, _ = normalize_contract_pages(PAGES)
+    return pages, tag_map
+
+
+def test_selects_suspicious_elements_with_neighbors(routing, normalized):
+    routing({"title": "근로계약서", "summary": "요약", "suspicious": [6, "99"]})
+    pages, tag_map = normalized
+
+    routed, info = handler.route_contract(pages, tag_map)
+
+    assert info["applied"] is True
+    # 문서 앞부분 요소 0 + 의심 요소 6과 앞뒤 요소 (범위 밖 번호 99는 무시)
+    assert info["elements_suspicious"] == 1
+    assert info["elements_selected"] == 4
+    assert routed[0].startswith("[0] 제1조")
+    assert "\n" not in routed[0]
+    assert [line[:3] for line in routed[1].split("\n")] == [
+        "[5]",
+        "[6]",
+        "[7]",
+    ]
+    assert routed[2] == ""
+    assert (info["title"], info["summary"]) == ("근로계약서", "요약")
+
+
+def test_no_suspicious_elements_falls_back_to_full_analysis(
+    routing, normalized
+):
+    routing({"title": "근로계약서", "summary": "요약", "suspicious": []})
+    pages, tag_map = normalized
+
+    routed, info = handler.route_contract(pages, tag_map)
+
+    assert routed == pages
+    assert info["applied"] is False
+    assert info["skipped_reason"] == "no_suspicious_elements"
+
+
+@pytest.mark.parametrize(
+    "answer", ["선별할 수 없습니다.", '{"title": "근로계약서"}']
+)
+def test_unparseable_screen_falls_back_to_full_analysis(
+    routing, normalized, answer
+):
+    routing(answer)
+    pages, tag_map = normalized
+
+    routed, info = handler.route_contract(pages, tag_map)
+
+    assert routed == pages
+    assert info["applied"] is False
+    assert info["skipped_reason"] == "screen_error"
+
+
+def test_analysis_model_receives_only_selected_elements(routing):
+    runtime = routing({"title": "", "summary": "", "suspicious": [6]})
+
+    response = handler.lambda_handler(
+        {
+            "contractId": "c1",
+            "analysisId": "a1",
+            "contractTexts": PAGES,
+            "normalizeInput": True,
+            "modelRouting": True,
+            "mapReduce": False,
+            "bypassCache": True,
+        },
+        None,
+    )
+
+    assert response["success"] is True
+    assert len(runtime.screen.requests) == 1
+    prompt = json.dumps(
+        runtime.analysis.requests[0]["body"]["messages"], ensure_ascii=False
+    )
+    assert all(f"제{n}조" in prompt for n in (1, 6, 7, 8))
+    assert not any(f"제{n}조" in prompt for n in (2, 3, 4, 5, 9, 10, 11, 12))
@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+from lambdas.bedrock_lambda.stream_parser import ToxicsStreamParser
+from tests.helpers import FakeStreamingRuntime
+
+TOXICS = [
+    {
+        "title": "일방적 해지권 조항",
+        "clause": '갑은 "사전 통지 없이" 계약을 {즉시} 해지할 수 있다.',
+        "reason": "중괄호 } 와 따옴표 \" 가 포함된 문자열\\",
+        "reasonReference": "민법 제543조",
+        "sourceContractTagIdx": 3,
+        "warnLevel": 3,
+        "extra": {"nested": {"depth": [1, 2]}},
+    },
+    {
+        "title": "과도한 손해배상 조항",
+        "clause": "을은 모든 손해를 배상한다.",
+        "reason": "줄바꿈\n과 탭\t이 포함됨",
+        "reasonReference": "",
+        "sourceContractTagIdx": 7,
+        "warnLevel": 2,
+    },
+]
+
+RESPONSE = (
+    "```json\n"
+    + json.dumps(
+        {
+            "title": "근로계약서",
+            "summary": "요약 안의 \"toxics\" 언급",
+            "ddobakCommentary": {
+                "overallComment": "{괄호}",
+                "warningComment": "",
+                "advice": "",
+            },
+            "toxicCount": len(TOXICS),
+            "toxics": TOXICS,
+        },
+        ensure_ascii=False,
+        indent=2,
+    )
+    + "\n```"
+)
+
+
+def feed_in_chunks(text, size):
+    parser = ToxicsStreamParser()
+    emitted = []
+    for start in range(0, len(text), size):
+        emitted.extend(parser.feed(text[start:start + size]))
+    return parser, emitted
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16, 64, len(RESPONSE)])
+def test_extracts_toxics_for_any_chunk_size(size):
+    parser, emitted = feed_in_chunks(RESPONSE, size)
+
+    assert emitted == TOXICS
+    assert parser.count == len(TOXICS)
+    assert parser.state == "done"
+
+
+def test_toxics_key_split_across_chunks():
+    split = RESPONSE.index('"toxics"') + 4
+    parser = ToxicsStreamParser()
+
+    assert parser.feed(RESPONSE[:split]) == []
+    assert parser.feed(RESPONSE[split:]) == TOXICS
+
+
+def test_each_toxic_is_emitted_as_soon_as_it_closes():
+    first_end = RESPONSE.index('"extra"')
+    first_end = RESPONSE.index("}\n    },", first_end) + len("}\n    }")
+    parser = ToxicsStreamParser()
+
+    assert parser.feed(RESPONSE[:first_end]) == [TOXICS[0]]
+    assert parser.feed(RESPONSE[first_end:]) == [TOXICS[1]]
+
+
+def test_empty_toxics_array():
+    parser, emitted = feed_in_chunks(
+        '{"title": "t", "toxics": [], "toxicCount": 0}', 5
+    )
+
+    assert emitted == []
+    assert parser.state == "done"
+
+
+def test_malformed_toxic_is_repaired():
+    pytest.importorskip("json_repair")
+    parser, emitted = feed_in_chunks(
+        '{"toxics": [{"title": "조항", "warnLevel": 2,}]}', 4
+    )
+
+    assert emitted == [{"title": "조항", "warnLevel": 2}]
+
+
+def test_streaming_invoke_publishes_toxics_in_order(monkeypatch):
+    from lambdas.bedrock_lambda import handler
+
+    monkeypatch.setattr(
+        handler, "bedrock_runtime", FakeStreamingRuntime(RESPONSE, 5)
+    )
+    received = []
+    handler.metrics.reset()
+
+    result = handler.invoke_with_context_stream(
+        "prompt",
+        None,
+        handler.MODEL_ID,
+        "general_request",
+        on_toxic=lambda idx, toxic: received.append((idx, toxic)),
+    )
+
+    assert received == list(enumerate(TOXICS))
+    assert result["answer"] == RESPONSE
+    assert result["response"] == {
+        "stop_reason": "end_turn",
+        "usage": {"input_tokens": 100, "output_tokens": 50},
+    }
+    assert handler.metrics.summary()["counters"]["output_tokens"] == 50
@@ -0,0 +1,193 @@
+import pytest
+from botocore.exceptions import ClientError, ReadTimeoutError
+
+from lambdas.bedrock_lambda import handler, rate_limit
+from lambdas.bedrock_lambda.rate_limit import RateLimiter, ThrottledError
+from lambdas.common import coldstart
+from lambdas.common.metrics import Metrics
+from tests.helpers import FakeStreamingRuntime
+
+PAGES = [
+    "<p id='0'>제1조 (목적) 이 계약은 근로 조건을 정한다.</p>",
+    "<p id='1'>제2조 (해지) 갑은 언제든지 계약을 해지할 수 있다.</p>",
+]
+
+
+def client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "Invoke")
+
+
+class FailingRuntime:
+    """모든 invoke_model 호출에 정해 둔 오류 코드의 ClientError를 던지는 가짜 bedrock-runtime."""
+
+    def __init__(self, code):
+        self.code = code
+        self.calls = 0
+
+    def invoke_model(self, modelId, body):
+        self.calls += 1
+        raise client_error(self.code)
+
+
+@pytest.fixture
+def failing_runtime(monkeypatch):
+    """오류 코드를 받아 handler.bedrock_runtime을 FailingRuntime으로 바꾸는 함수를 반환합니다."""
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(rate_limit.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(
+        handler,
+        "retrieve_relevant_context",
+        lambda contract_text, model_id: None,
+    )
+
+    def install(code):
+        runtime = FailingRuntime(code)
+        monkeypatch.setattr(handler, "bedrock_runtime", runtime)
+        return runtime
+
+    return install
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, "sleep", lambda seconds: None)
+
+
+def analyze(map_reduce=False):
+    return handler.lambda_handler(
+        {
+            "contractId": "c1",
+            "analysisId": "a1",
+            "contractTexts": PAGES,
+            "mapReduce": map_reduce,
+            "bypassCache": True,
+        },
+        None,
+    )
+
+
+def test_bedrock_clients_disable_botocore_retries(monkeypatch):
+    monkeypatch.setattr(coldstart, "_clients", {})
+
+    client = coldstart.get_client(
+        "bedrock-runtime", "ap-northeast-2", max_attempts=1
+    )
+
+    assert client.meta.config.retries["total_max_attempts"] == 1
+    assert handler.bedrock_runtime.max_attempts == 1
+    assert handler.bedrock_agent_runtime.max_attempts == 1
+
+
+@pytest.mark.parametrize("map_reduce", [False, True])
+def test_throttled_request_raises_for_lambda_retry(
+    failing_runtime, map_reduce
+):
+    runtime = failing_runtime("ThrottlingException")
+    handler.metrics.reset()
+
+    # 오류 응답은 on_success로 전달되어 FAILED로 저장되므로 예외로 끝나야 함
+    with pytest.raises(ThrottledError):
+        analyze(map_reduce)
+
+    assert runtime.calls == 2
+    counters = handler.metrics.summary()["counters"]
+    assert counters["throttled_requests"] == 1
+
+
+def test_other_errors_return_error_response_without_retry(failing_runtime):
+    runtime = failing_runtime("ValidationException")
+
+    response = analyze()
+
+    assert response["success"] is False
+    assert response["data"]["analysisResult"]["title"] == "분석 오류 계약서"
+    assert runtime.calls == 1
+
+
+def test_transient_errors_are_retried_without_reducing_concurrency(no_sleep):
+    metrics = Metrics("test")
+    limiter = RateLimiter(metrics)
+    errors = [
+        client_error("InternalServerException"),
+        ReadTimeoutError(endpoint_url="https://bedrock"),
+    ]
+
+    def call():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    assert limiter.call("model", call) == "ok"
+
+    counters = metrics.summary()["counters"]
+    assert counters["transient_retries"] == 2
+    assert "throttles" not in counters
+    assert (
+        limiter.limiter("model").limit
+        >= rate_limit.RATE_LIMIT_INITIAL_CONCURRENCY
+    )
+
+
+def test_transient_error_is_raised_after_last_attempt(monkeypatch, no_sleep):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_MAX_ATTEMPTS", 3)
+    limiter = RateLimiter(Metrics("test"))
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise client_error("ModelTimeoutException")
+
+    with pytest.raises(ClientError) as excinfo:
+        limiter.call("model", call)
+
+    assert excinfo.value.response["Error"]["Code"] == "ModelTimeoutException"
+    assert len(calls) == 3
+
+
+def test_stream_holds_slot_until_body_is_consumed(monkeypatch):
+    in_flight = []
+
+    class RecordingStreamingRuntime(FakeStreamingRuntime):
+        """본문 이벤트를 읽을 때마다 호출 슬롯 사용 수를 기록하는 가짜."""
+
+        def invoke_model_with_response_stream(self, modelId, body):
+            response = super().invoke_model_with_response_stream(
+                modelId, body
+            )
+            limiter = handler.rate_limiter.limiter(modelId)
+
+            def events():
+                for event in response["body"]:
+                    in_flight.append(limiter.in_flight)
+                    yield event
+
+            return {"body": events()}
+
+    monkeypatch.setattr(
+        handler, "rate_limiter", RateLimiter(Metrics("test"))
+    )
+    monkeypatch.setattr(
+        handler,
+        "bedrock_runtime",
+        RecordingStreamingRuntime('{"toxics": []}', 4),
+    )
+
+    result = handler.invoke_with_context_stream(
+        "계약서", None, "model", "test"
+    )
+
+    assert result["success"] is True
+    assert in_flight and set(in_flight) == {1}
+    assert handler.rate_limiter.limiter("model").in_flight == 0
+
+
+def test_hold_releases_slot_when_block_raises():
+    limiter = RateLimiter(Metrics("test"))
+
+    with pytest.raises(ValueError):
+        with limiter.hold("model", lambda: "stream") as response:
+            assert response == "stream"
+            assert limiter.limiter("model").in_flight == 1
+            raise ValueError("stream broken")
+
+    assert limiter.limiter("model").in_flight == 0